@@ -1,3 +1,4 @@
+import importlib.util
 import os
 import sys
 import zipfile
@@ -9,10 +10,29 @@ EXCLUDE_FOLDERS = ["mock"]  # Folders to exclude, relative to the source directo
 ADDON_NAME = "LSPotato"  # Root folder name inside the zip
 
 
+def write_node_manifest(source_dir: Path):
+    """Regenerate nodes/shader/node_manifest.json so the zip ships a current one.
+
+    Without it NodeLib executes every compiled module on first load. Class
+    identity is read from the sources; nodes/manifest.py is bpy-free, so it is
+    loaded straight from its file."""
+    shader_dir = source_dir / "nodes" / "shader"
+    if not shader_dir.is_dir():
+        return
+    spec = importlib.util.spec_from_file_location("manifest", source_dir / "nodes" / "manifest.py")
+    manifest = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(manifest)
+    entries = manifest.scan_sources(str(shader_dir))
+    path = manifest.write_manifest(str(shader_dir / manifest.MANIFEST_NAME), entries)
+    print(f"[INFO] Node manifest: {len(entries)} class(es) -> {path}")
+
+
 def create_zip(source_dir: str, zip_path: str):
     source_dir = Path(source_dir).absolute()
     zip_path = Path(zip_path).absolute()
 
+    write_node_manifest(source_dir)
+
     # Make sure the destination directory exists
     zip_path.parent.mkdir(parents=True, exist_ok=True)
 
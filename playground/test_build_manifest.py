@@ -0,0 +1,160 @@
+"""
+Standalone verification for the incremental-compile build manifest.
+
+compiler/build_manifest.py imports no `bpy`, so we can exercise the rules the
+NodeCompiler's incremental mode relies on:
+
+  1. A fingerprint is stable across dict ordering and tuple/list spelling.
+  2. Content, route, compiler salt and child fingerprints each move it;
+     bpy image objects only take part through their filenames.
+  3. A child edit propagates up the chain, leaving siblings clean.
+  4. The manifest round-trips, and reads as empty for another compiler digest.
+  5. sweep_orphans() removes stale modules, tree descriptions and emptied
+     folders only.
+
+Run:  python playground/test_build_manifest.py
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_MODULE = os.path.normpath(os.path.join(
+    _HERE, "..", "src", "features", "node_compiler", "compiler", "build_manifest.py"))
+
+
+def _load():
+    spec = importlib.util.spec_from_file_location("build_manifest", _MODULE)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _info(name, value=0.5, nested=()):
+    return {
+        "name": name,
+        "nodes": [{"var_name": "mix", "input_defaults": {0: value, 1: (1.0, 0.0, 0.0, 1.0)}}],
+        "links": [],
+        "nested_groups": list(nested),
+        "_predefined_images": [],
+    }
+
+
+def main():
+    bm = _load()
+    failures = []
+
+    def check(label, cond):
+        print(f"  [{'PASS' if cond else 'FAIL'}] {label}")
+        if not cond:
+            failures.append(label)
+
+    route = ("lscherry", "lscherry.Toon", "ShaderNodeCompiled_Toon", "toon.py")
+
+    print("Fingerprint")
+    base = bm.group_fingerprint(_info("Toon"), route, [], "c1")
+    reordered = dict(reversed(list(_info("Toon").items())))
+    reordered["nodes"][0]["input_defaults"] = {1: [1.0, 0.0, 0.0, 1.0], 0: 0.5}
+    check("stable across ordering / tuple vs list",
+          bm.group_fingerprint(reordered, route, [], "c1") == base)
+    check("content moves it", bm.group_fingerprint(_info("Toon", 0.6), route, [], "c1") != base)
+    check("route moves it",
+          bm.group_fingerprint(_info("Toon"), ("lscherry/core",) + route[1:], [], "c1") != base)
+    check("compiler salt moves it", bm.group_fingerprint(_info("Toon"), route, [], "c2") != base)
+    check("child fingerprint moves it",
+          bm.group_fingerprint(_info("Toon"), route, ["abc"], "c1") != base)
+
+    class Image:   # stands in for bpy.types.Image
+        pass
+
+    a = _info("Toon")
+    a["_predefined_images"] = [("ramp.png", Image())]
+    b = _info("Toon")
+    b["_predefined_images"] = [("ramp.png", Image())]
+    check("images compared by filename",
+          bm.group_fingerprint(a, route, [], "c1") == bm.group_fingerprint(b, route, [], "c1"))
+
+    print("Propagation")
+
+    def chain(leaf_value):
+        infos = {
+            "Leaf":    _info("Leaf", leaf_value),
+            "Sibling": _info("Sibling"),
+            "Mid":     _info("Mid", nested=["Leaf"]),
+            "Top":     _info("Top", nested=["Mid", "Sibling"]),
+        }
+        fps = {}
+        for name in ("Leaf", "Sibling", "Mid", "Top"):   # topological order
+            info = infos[name]
+            fps[name] = bm.group_fingerprint(
+                info, (name,), [fps[c] for c in info["nested_groups"]], "c1")
+        return fps
+
+    before, after = chain(0.5), chain(0.7)
+    check("leaf edit dirties leaf, mid and top",
+          all(before[n] != after[n] for n in ("Leaf", "Mid", "Top")))
+    check("leaf edit leaves sibling clean", before["Sibling"] == after["Sibling"])
+
+    with tempfile.TemporaryDirectory() as root:
+        print("Round trip")
+        path = os.path.join(root, bm.BUILD_MANIFEST_NAME)
+        records = {
+            "lscherry.Toon": bm.BuildRecord(base, "ShaderNodeCompiled_Toon",
+                                            "lscherry.Toon", "lscherry", "toon.py",
+                                            "0" * 40, "f" * 32),
+        }
+        bm.write_build_manifest(path, "c1", records)
+        check("records read back", bm.read_build_manifest(path, "c1") == records)
+        legacy = records["lscherry.Toon"]._asdict()
+        del legacy["tree_sha1"]
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"version": bm.BUILD_MANIFEST_VERSION, "compiler": "c1",
+                       "groups": {"lscherry.Toon": legacy}}, fh)
+        check("record without tree_sha1 still reads",
+              bm.read_build_manifest(path, "c1")["lscherry.Toon"].tree_sha1 == "")
+        check("other compiler reads as empty", bm.read_build_manifest(path, "c2") == {})
+        check("absent manifest reads as empty",
+              bm.read_build_manifest(os.path.join(root, "nope.json"), "c1") == {})
+        check("compiler digest is stable", bm.compiler_digest() == bm.compiler_digest())
+
+        print("Orphan sweep")
+        lscherry = os.path.join(root, "lscherry")
+        files = {
+            "toon.py":            True,
+            "__init__.py":        True,
+            "core/shade.py":      True,
+            "core/old.py":        False,
+            "core/shade.tree.json": True,
+            "core/old.tree.json": False,
+            "core/__init__.py":   True,
+            "gone/a.py":          False,
+            "gone/__init__.py":   False,
+        }
+        for rel in files:
+            full = os.path.join(lscherry, *rel.split("/"))
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, "w", encoding="utf-8") as fh:
+                fh.write("# test\n")
+        os.makedirs(os.path.join(lscherry, "gone", "__pycache__"))
+        keep = {os.path.join(lscherry, "toon.py"), os.path.join(lscherry, "core", "shade.py"),
+                os.path.join(lscherry, "core", "shade.tree.json")}
+        removed = bm.sweep_orphans(lscherry, keep)
+        check("orphan modules and tree descriptions removed",
+              sorted(os.path.basename(p) for p in removed) == ["a.py", "old.py", "old.tree.json"])
+        check("kept modules and live __init__ survive", all(
+            os.path.exists(os.path.join(lscherry, *rel.split("/")))
+            for rel, alive in files.items() if alive))
+        check("emptied folder removed", not os.path.exists(os.path.join(lscherry, "gone")))
+
+    print()
+    if failures:
+        print(f"FAILED ({len(failures)}): " + "; ".join(failures))
+        sys.exit(1)
+    print("All build manifest checks passed.")
+
+
+if __name__ == "__main__":
+    main()
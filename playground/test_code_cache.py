@@ -0,0 +1,97 @@
+"""
+Standalone verification for the generated-module code cache.
+
+nodes/code_cache.py imports no `bpy`, so we can exercise it against a
+throwaway folder:
+
+  1. The first get() compiles and stores; the second is a cache hit.
+  2. A known digest (as the manifest supplies) hits without reading the source.
+  3. Edited source gets a new key and is recompiled.
+  4. A truncated entry is ignored and rewritten, not raised.
+  5. prune() keeps only the requested digests.
+
+Run:  python playground/test_code_cache.py
+"""
+
+import hashlib
+import importlib.util
+import os
+import sys
+import tempfile
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_CODE_CACHE = os.path.normpath(os.path.join(_HERE, "..", "src", "nodes", "code_cache.py"))
+
+
+def _load_code_cache():
+    spec = importlib.util.spec_from_file_location("code_cache", _CODE_CACHE)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _run(code):
+    ns = {}
+    exec(code, ns)
+    return ns["VALUE"]
+
+
+def main():
+    cc = _load_code_cache()
+    failures = []
+
+    def check(label, cond):
+        print(f"  [{'PASS' if cond else 'FAIL'}] {label}")
+        if not cond:
+            failures.append(label)
+
+    with tempfile.TemporaryDirectory() as root:
+        cache_dir = os.path.join(root, "cache")
+        os.makedirs(cache_dir)
+        src = os.path.join(root, "toon.py")
+        with open(src, "w", encoding="utf-8") as fh:
+            fh.write("VALUE = 1\n")
+        digest = hashlib.sha1(b"VALUE = 1\n").hexdigest()
+
+        print("Cold / warm")
+        cache = cc.CodeCache(cache_dir)
+        check("cold get compiles", _run(cache.get(src)) == 1 and cache.misses == 1)
+        check("entry written", len(os.listdir(cache_dir)) == 1)
+        warm = cc.CodeCache(cache_dir)
+        check("warm get hits", _run(warm.get(src)) == 1 and warm.hits == 1 and warm.misses == 0)
+
+        print("Known digest")
+        os.rename(src, src + ".moved")
+        check("hit without the source file", _run(warm.get(src, digest)) == 1)
+        os.rename(src + ".moved", src)
+
+        print("Edited source")
+        with open(src, "w", encoding="utf-8") as fh:
+            fh.write("VALUE = 2\n")
+        check("edited source recompiles", _run(warm.get(src)) == 2 and warm.misses == 1)
+
+        print("Corrupt entry")
+        entry = [n for n in os.listdir(cache_dir) if n.startswith(digest)][0]
+        with open(os.path.join(cache_dir, entry), "wb") as fh:
+            fh.write(b"\xe3")
+        with open(src, "w", encoding="utf-8") as fh:
+            fh.write("VALUE = 1\n")
+        fresh = cc.CodeCache(cache_dir)
+        check("truncated entry is recompiled", _run(fresh.get(src, digest)) == 1 and fresh.misses == 1)
+        check("and rewritten", _run(cc.CodeCache(cache_dir).get(src, digest)) == 1)
+
+        print("Prune")
+        removed = fresh.prune({digest})
+        check("one stale entry removed", removed == 1)
+        check("kept entry survives",
+              [n for n in os.listdir(cache_dir) if n.endswith(".bin")] == [entry])
+
+    print()
+    if failures:
+        print(f"FAILED ({len(failures)}): " + "; ".join(failures))
+        sys.exit(1)
+    print("All code cache checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,10 +10,17 @@ generated source fixes the four reported compilation bugs:
   3. Constant-node OUTPUT defaults are emitted.
   4. Menu Switch enum items are rebuilt, with active_index applied AFTER them.
 
+It also checks the JSON tree format: the tree description carries the same
+socket keys, ramp stops and deferred Menu default as the Python output, and
+the class stub builds through build_node_tree(), and that the batched Python
+format builds the same tree as the straight-line one (both run against small
+fake bpy objects).
+
 Run:  venv/Scripts/python.exe playground/test_codegen.py
 """
 
 import importlib.util
+import json
 import os
 import sys
 
@@ -83,6 +90,77 @@ def link(fv, fsn, fsi, tv, tsn, tsi):
     }
 
 
+class _Sock:
+    def __init__(self, defaults, key, name):
+        self._defaults = defaults
+        self.key = key
+        self.name = name
+
+    @property
+    def default_value(self):
+        return self._defaults.get(self.key)
+
+    @default_value.setter
+    def default_value(self, value):
+        self._defaults[self.key] = value
+
+
+class _Sockets(list):
+    """inputs / outputs: index by position, or by name (first match, like RNA)."""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return next(s for s in self if s.name == key)
+        return list.__getitem__(self, key)
+
+
+class _FakeTree:
+    """Just enough of a node tree for createNodetree(); records what it was given."""
+
+    def __init__(self, socket_names):
+        tree = self
+        self.socket_names = socket_names   # bl_idname → (input names, output names)
+        self.made = []
+        self.linked = []
+        self.defaults = {}
+
+        class _Interface:
+            def new_socket(self, **kw):
+                return type("Item", (), {})()
+
+        class _Nodes:
+            def new(self, idname):
+                node = type("Node", (), {})()
+                i = len(tree.made)
+                ins, outs = tree.socket_names[idname]
+                node.inputs = _Sockets(_Sock(tree.defaults, (i, "in", k), n)
+                                       for k, n in enumerate(ins))
+                node.outputs = _Sockets(_Sock(tree.defaults, (i, "out", k), n)
+                                        for k, n in enumerate(outs))
+                tree.made.append(idname)
+                return node
+
+        class _Links:
+            def new(self, a, b):
+                tree.linked.append((a.key, b.key))
+
+        self.interface, self.nodes, self.links = _Interface(), _Nodes(), _Links()
+
+
+def _build(code, socket_names):
+    """Execute a generated class's createNodetree() against a _FakeTree."""
+    tree = _FakeTree(socket_names)
+    fake_bpy = type("bpy", (), {})()
+    fake_bpy.data = type("data", (), {})()
+    fake_bpy.data.node_groups = type("groups", (), {"new": staticmethod(lambda name, t: tree)})()
+    body = "\n".join(l for l in code.splitlines() if not l.startswith(("import ", "from ")))
+    scope = {"bpy": fake_bpy, "ShaderNode": object}
+    exec(body, scope)
+    cls = next(v for k, v in scope.items() if k.startswith("ShaderNodeCompiled_"))
+    cls().createNodetree("unused")
+    return tree
+
+
 def main():
     cg = _load_code_gen()
     failures = []
@@ -181,10 +259,34 @@ def main():
     check("second slot property from label", "image_sdf_texture: bpy.props.PointerProperty" in code)
     check("slot heading drawn", "layout.label(text='Face_D Texture')" in code)
     check("each node maps to its own property",
-          "'Image Texture': 'image_face_d_texture'" in code
-          and "'Image Texture.001': 'image_sdf_texture'" in code)
-    check("assignment reads per-node property",
-          "node.image = getattr(self, _placeholder_images[node.name])" in code)
+          "'Image_Texture': 'image_face_d_texture'" in code
+          and "'Image_Texture_001': 'image_sdf_texture'" in code)
+    check("valuesUpdate looks the nodes up instead of scanning the tree",
+          "self.applyInstanceValues(context, {" in code
+          and "for node in self.node_tree.nodes" not in code)
+    check("placeholder nodes are named after their var_name",
+          "Image_Texture.name = 'Image_Texture'" in code
+          and "Image_Texture_001.name = 'Image_Texture_001'" in code)
+    data = cg.generate_tree_data(info)
+    check("JSON format names them too",
+          [n.get("name") for n in data["nodes"]] == ["Image_Texture", "Image_Texture_001"])
+    long_var = "Group_Deep__" * 6 + "Image_Texture"
+    nodes = [mk_node(var_name=long_var, name="Image Texture", type="TEX_IMAGE",
+                     bl_idname="ShaderNodeTexImage", label="Base Color"),
+             mk_node(var_name=long_var + "_001", name="Image Texture.001", type="TEX_IMAGE",
+                     bl_idname="ShaderNodeTexImage", label="SDF Texture")]
+    info = mk_info(nodes, [])
+    info["has_image_nodes"] = [long_var, long_var + "_001"]
+    info["placeholder_image_node_names"] = ["Image Texture", "Image Texture.001"]
+    info["placeholder_images"] = [{"node_name": "Image Texture", "label": "Base Color"},
+                                  {"node_name": "Image Texture.001", "label": "SDF Texture"}]
+    names = [n["name"] for n in cg.generate_tree_data(info)["nodes"]]
+    code = cg.generate_class(info, "ShaderNodeCompiled_Test")
+    check("long var names bounded to 63 bytes and distinct",
+          all(len(n.encode()) <= 63 for n in names) and len(set(names)) == 2
+          and all(f"{v}.name = {n!r}" in code for v, n in zip(info["has_image_nodes"], names)))
+    check("valuesUpdate looks up the bounded names",
+          all(f"{n!r}: 'image_" in code for n in names))
 
     # ── Bug 5b: lone placeholder keeps the historical property name ──────────
     print("Bug 5b — single placeholder keeps 'image_texture'")
@@ -233,6 +335,97 @@ def main():
     check("instance default still set in init()",
           "self.inputs['Mode'].default_value = 'Type 2'" in code)
 
+    # ── JSON tree format ─────────────────────────────────────────────────────
+    print("JSON tree format — same tree as data, stub builds through the builder")
+    menu_info = mk_info(nodes, links, interface)
+    data = json.loads(json.dumps(cg.generate_tree_data(menu_info)))
+    check("description is JSON round-trippable", data["format"] == cg.TREE_FORMAT_VERSION)
+    check("menu default deferred to menu_defaults",
+          data["menu_defaults"] == [[0, "Type 2"]] and "default" not in data["interface"][0])
+    check("menu switch items and active_index kept",
+          [it["name"] for it in data["nodes"][1]["enum"]] == ["Type 1", "Type 2"]
+          and data["nodes"][1]["active_index"] == 1)
+    check("link addressed by unique name", data["links"] == [[0, "Mode", 1, "Menu"]])
+
+    dup = mk_info([
+        mk_node(var_name="Math", bl_idname="ShaderNodeMath",
+                output_socket_names=["Value"]),
+        mk_node(var_name="Math_001", bl_idname="ShaderNodeMath",
+                input_socket_names=["Value", "Value", "Value"]),
+        mk_node(var_name="Ramp", bl_idname="ShaderNodeValToRGB",
+                color_ramp={"color_mode": "RGB", "interpolation": "LINEAR",
+                            "hue_interpolation": "NEAR",
+                            "elements": [{"position": 0.0, "color": (0, 0, 0, 1)},
+                                         {"position": 0.5, "color": (1, 1, 1, 1)}]},
+                input_defaults={0: 0.25}),
+    ], [link("Math", "Value", 0, "Math_001", "Value", 1)])
+    data = json.loads(json.dumps(cg.generate_tree_data(dup)))
+    check("duplicate input name addressed by index", data["links"] == [[0, "Value", 1, 1]])
+    check("ramp stops carried as floats",
+          data["nodes"][2]["ramp"]["elements"][1]["color"] == [1.0, 1.0, 1.0, 1.0])
+    check("input defaults as index pairs", data["nodes"][2]["inputs"] == [[0, 0.25]])
+
+    stub = cg.generate_class(menu_info, "ShaderNodeCompiled_Test", "...node",
+                             tree_file="test.tree.json")
+    check("stub imports the builder", "import ShaderNode, build_node_tree" in stub)
+    check("stub createNodetree builds from the description",
+          "build_node_tree(self, _TREE)" in stub and "'test.tree.json'" in stub)
+    check("stub carries no tree statements", "nt.nodes.new" not in stub)
+    check("stub keeps init() defaults",
+          "self.inputs['Mode'].default_value = 'Type 2'" in stub)
+    compile(stub, "stub", "exec")
+
+    # ── Batched Python format ────────────────────────────────────────────────
+    print("Batched Python format — tables build the same tree as straight-line code")
+    sockets = {
+        "NodeGroupInput":       ((), ("A", "B", "")),
+        "ShaderNodeVectorMath": (("Vector", "Vector", "Scale"), ("Vector", "Value")),
+        "ShaderNodeRGB":        ((), ("Color",)),
+        "ShaderNodeMix":        (("Factor", "A", "B"), ("Result",)),
+        "NodeGroupOutput":      (("Result", "Color", ""), ()),
+    }
+    nodes = [
+        mk_node(var_name="Group_Input", type="GROUP_INPUT", bl_idname="NodeGroupInput",
+                output_socket_names=["A", "B", ""]),
+        mk_node(var_name="Vector_Math", bl_idname="ShaderNodeVectorMath",
+                attributes={"operation": "ADD"},
+                input_socket_names=["Vector", "Vector", "Scale"],
+                output_socket_names=["Vector", "Value"],
+                input_defaults={2: 1.5}),
+        mk_node(var_name="RGB", bl_idname="ShaderNodeRGB", output_socket_names=["Color"],
+                output_defaults={0: (0.1, 0.2, 0.3, 1.0)}),
+        mk_node(var_name="Mix", bl_idname="ShaderNodeMix",
+                input_socket_names=["Factor", "A", "B"], output_socket_names=["Result"],
+                input_defaults={0: 0.5, 2: (1.0, 1.0, 1.0, 1.0)}),
+        mk_node(var_name="Group_Output", type="GROUP_OUTPUT", bl_idname="NodeGroupOutput",
+                input_socket_names=["Result", "Color", ""]),
+    ]
+    links = [
+        link("Group_Input", "A", 0, "Vector_Math", "Vector", 0),
+        link("Group_Input", "B", 1, "Vector_Math", "Vector", 1),
+        link("Vector_Math", "Vector", 0, "Mix", "A", 1),
+        link("RGB", "Color", 0, "Group_Output", "Color", 1),
+        link("Mix", "Result", 0, "Group_Output", "Result", 0),
+    ]
+    info = mk_info(nodes, links)
+    straight = cg.generate_class(info, "ShaderNodeCompiled_Test")
+    batched = cg.generate_class(info, "ShaderNodeCompiled_Test", batched=True)
+    check("python format unchanged by default",
+          straight == cg.generate_class(info, "ShaderNodeCompiled_Test", batched=False))
+    check("nodes.new and links.new bound once",
+          "_new = nt.nodes.new" in batched and batched.count("nt.links.new") == 1)
+    check("socket collections cached per node", "_ins = [_n.inputs for _n in _nodes]" in batched)
+    check("no per-socket statements left",
+          "Mix.inputs[" not in batched and "RGB.outputs[" not in batched)
+    check("link table uses positions", "(0, 1, 1, 1)," in batched)
+    a, b = _build(straight, sockets), _build(batched, sockets)
+    check("same nodes created", a.made == b.made)
+    check("same links", sorted(a.linked) == sorted(b.linked) and len(b.linked) == len(links))
+    check("same socket defaults", a.defaults == b.defaults and len(b.defaults) == 4)
+    one = cg.generate_class(mk_info([nodes[2]], []), "ShaderNodeCompiled_Test", batched=True)
+    check("single node table is a tuple", "_nodes = (RGB,)" in one)
+    check("single node tree builds", _build(one, sockets).defaults == {(0, "out", 0): (0.1, 0.2, 0.3, 1.0)})
+
     print()
     if failures:
         print(f"FAILED ({len(failures)}): " + "; ".join(failures))
@@ -0,0 +1,303 @@
+"""
+Standalone verification for the NodeCompiler's constant folder.
+
+const_fold.py imports no `bpy`, so it can be driven with hand-built `info`
+dicts (the same shape analyzer.analyze_node_group produces):
+
+  1. Blender's "safe" math: division by zero, negative powers / logs / roots,
+     COMPARE's epsilon, clamping, float32 results.
+  2. A Value → Math → Math chain feeding a BSDF colour is baked into that
+     input (float → colour conversion) and the chain removed.
+  3. A constant read by the Group Output becomes a single Value / RGB node.
+  4. Mix (Color) blends keep A's alpha and clamp the factor.
+  5. A vector read through a lossy conversion is left linked, its node
+     replaced by a Combine XYZ; a node read through two outputs stays, with
+     its own constant inputs baked.
+  6. Non-constant inputs, unsupported operations and non-finite results are
+     left alone; the input info is never mutated; the result generates code.
+  7. A Math chain deeper than the recursion limit folds; a link cycle does
+     not.
+
+Blender's own evaluation of the same nodes is checked in Blender by
+tools/benchmarks/constant_fold_check.py.
+
+Run:  python playground/test_const_fold.py
+"""
+
+import copy
+import importlib.util
+import math
+import os
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_COMPILER = os.path.normpath(os.path.join(
+    _HERE, "..", "src", "features", "node_compiler", "compiler"
+))
+
+
+def _load(mod_name):
+    path = os.path.join(_COMPILER, mod_name + ".py")
+    spec = importlib.util.spec_from_file_location(mod_name, path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+_SOCKETS = {   # bl_idname → (input names, input types, output names, output types)
+    "ShaderNodeValue": ((), (), ("Value",), ("VALUE",)),
+    "ShaderNodeRGB": ((), (), ("Color",), ("RGBA",)),
+    "ShaderNodeMath": (("Value",) * 3, ("VALUE",) * 3, ("Value",), ("VALUE",)),
+    "ShaderNodeVectorMath": (("Vector", "Vector", "Vector", "Scale"),
+                             ("VECTOR",) * 3 + ("VALUE",),
+                             ("Vector", "Value"), ("VECTOR", "VALUE")),
+    "ShaderNodeMix": (("Factor", "Factor", "A", "B", "A", "B", "A", "B"),
+                      ("VALUE", "VECTOR", "VALUE", "VALUE", "VECTOR", "VECTOR", "RGBA", "RGBA"),
+                      ("Result",) * 3, ("VALUE", "VECTOR", "RGBA")),
+    "ShaderNodeBsdfDiffuse": (("Color", "Roughness", "Normal"), ("RGBA", "VALUE", "VECTOR"),
+                              ("BSDF",), ("SHADER",)),
+    "ShaderNodeAttribute": ((), (), ("Color", "Vector", "Fac"), ("RGBA", "VECTOR", "VALUE")),
+    "NodeGroupOutput": (("Out", "Vec", ""), ("VALUE", "VECTOR", "CUSTOM"), (), ()),
+}
+
+_TYPES = {"NodeGroupOutput": "GROUP_OUTPUT", "ShaderNodeValue": "VALUE", "ShaderNodeRGB": "RGB"}
+
+
+def mk_node(var, bl_idname, attributes=None, inputs=None, outputs=None):
+    ins, in_types, outs, out_types = _SOCKETS[bl_idname]
+    return {
+        "var_name": var,
+        "name": var,
+        "type": _TYPES.get(bl_idname, bl_idname.upper()),
+        "bl_idname": bl_idname,
+        "location": (0.0, 0.0),
+        "width": 140.0,
+        "label": "",
+        "hide": False,
+        "attributes": attributes or {},
+        "input_defaults": dict(inputs or {}),
+        "output_defaults": dict(outputs or {}),
+        "input_socket_names": list(ins),
+        "input_socket_types": list(in_types),
+        "output_socket_names": list(outs),
+        "output_socket_types": list(out_types),
+        "node_tree_name": None,
+        "repeat_items": [],
+        "color_ramp": None,
+        "curve_mapping": None,
+        "enum_items": [],
+        "index_switch_count": None,
+        "active_index": None,
+    }
+
+
+def link(fv, fi, tv, ti):
+    return {
+        "from_var": fv, "from_socket_name": "", "from_socket_index": fi,
+        "to_var": tv, "to_socket_name": "", "to_socket_index": ti,
+    }
+
+
+def mk_info(nodes, links):
+    return {
+        "name": "Test",
+        "type": "SHADER",
+        "bl_label": "lscherry.test.Test",
+        "color_tag": "NONE",
+        "description": "",
+        "interface": [],
+        "nodes": nodes,
+        "links": links,
+        "zone_pairs": [],
+        "has_image_nodes": [],
+        "has_uv_nodes": [],
+        "nested_groups": [],
+        "placeholder_image_node_names": [],
+        "placeholder_images": [],
+        "_predefined_images": [],
+    }
+
+
+def math_node(var, op, a=0.0, b=0.0, c=0.0, **attrs):
+    return mk_node(var, "ShaderNodeMath", dict(operation=op, **attrs), {0: a, 1: b, 2: c})
+
+
+def main():
+    cf = _load("const_fold")
+    cg = _load("code_gen")
+    failures = []
+
+    def check(label, cond):
+        print(f"  [{'PASS' if cond else 'FAIL'}] {label}")
+        if not cond:
+            failures.append(label)
+
+    def value_of(node):
+        values, _order = cf.evaluate_constants(mk_info([node], []))
+        return values.get(node["var_name"])
+
+    def close(a, b):
+        if isinstance(a, tuple):
+            return len(a) == len(b) and all(close(x, y) for x, y in zip(a, b))
+        return math.isclose(a, b, rel_tol=1e-6, abs_tol=1e-6)
+
+    def by_var(info):
+        return {n["var_name"]: n for n in info["nodes"]}
+
+    # ── 1. Safe math ─────────────────────────────────────────────────────────
+    print("1. Blender's safe math")
+    cases = [
+        ("DIVIDE", (1.0, 0.0, 0.0), 0.0),
+        ("POWER", (-2.0, 0.5, 0.0), 0.0),
+        ("POWER", (-2.0, 3.0, 0.0), -8.0),
+        ("LOGARITHM", (-1.0, 2.0, 0.0), 0.0),
+        ("LOGARITHM", (8.0, 2.0, 0.0), 3.0),
+        ("SQRT", (-4.0, 0.0, 0.0), 0.0),
+        ("INVERSE_SQRT", (4.0, 0.0, 0.0), 0.5),
+        ("COMPARE", (1.0, 1.0 + 1e-8, 0.0), 1.0),
+        ("MODULO", (-3.5, 2.0, 0.0), -1.5),
+        ("FLOORED_MODULO", (-3.5, 2.0, 0.0), 0.5),
+        ("WRAP", (5.5, 2.0, 0.0), 1.5),
+        ("SNAP", (7.3, 2.0, 0.0), 6.0),
+        ("PINGPONG", (3.0, 2.0, 0.0), 1.0),
+        ("ROUND", (-2.5, 0.0, 0.0), -2.0),
+        ("SMOOTH_MIN", (1.0, 1.0, 1.0), 1.0 - 1.0 / 6.0),
+        ("MULTIPLY_ADD", (2.0, 3.0, 4.0), 10.0),
+    ]
+    for op, args, expected in cases:
+        got = value_of(math_node("M", op, *args))
+        check(f"{op}{args} = {expected}", got is not None and close(got[0], expected))
+    got = value_of(math_node("M", "ADD", 0.75, 0.5, use_clamp=True))
+    check("use_clamp clamps to 1", got == {0: 1.0})
+    got = value_of(math_node("M", "ADD", 0.1, 0.2))
+    check("result rounded to float32", got[0] != 0.1 + 0.2 and close(got[0], 0.3))
+
+    # ── 2. Chain baked into the reader ──────────────────────────────────────
+    print("2. Value → Math → Math baked into a BSDF colour")
+    nodes = [
+        mk_node("Value", "ShaderNodeValue", outputs={0: 2.0}),
+        math_node("Mul", "MULTIPLY", b=3.0),
+        math_node("Add", "ADD", b=1.0),
+        mk_node("Diffuse", "ShaderNodeBsdfDiffuse", inputs={1: 0.5, 2: (0.0, 0.0, 0.0)}),
+        mk_node("Group_Output", "NodeGroupOutput"),
+    ]
+    links = [link("Value", 0, "Mul", 0), link("Mul", 0, "Add", 0),
+             link("Add", 0, "Diffuse", 0), link("Diffuse", 0, "Group_Output", 0)]
+    info = mk_info(nodes, links)
+    before = copy.deepcopy(info)
+    folded, n = cf.fold_constants(info)
+    check("three nodes folded", n == 3 and set(by_var(folded)) == {"Diffuse", "Group_Output"})
+    check("float baked as colour", by_var(folded)["Diffuse"]["input_defaults"][0] == (7.0, 7.0, 7.0, 1.0))
+    check("only the shader link remains", folded["links"] == [links[3]])
+    check("input info not mutated", info == before)
+
+    # ── 3. Constant read by the Group Output ────────────────────────────────
+    print("3. Group Output reader gets a single constant node")
+    nodes = [
+        mk_node("Value", "ShaderNodeValue", outputs={0: 0.5}),
+        math_node("Half", "MULTIPLY", b=0.5),
+        mk_node("Dot", "ShaderNodeVectorMath", {"operation": "DOT_PRODUCT"},
+                {0: (1.0, 2.0, 3.0), 1: (4.0, 5.0, 6.0), 2: (0.0, 0.0, 0.0), 3: 1.0}),
+        mk_node("Group_Output", "NodeGroupOutput"),
+    ]
+    links = [link("Value", 0, "Half", 0), link("Half", 0, "Group_Output", 0),
+             link("Dot", 1, "Group_Output", 1)]
+    folded, n = cf.fold_constants(mk_info(nodes, links))
+    nb = by_var(folded)
+    check("Math replaced by a Value node",
+          nb["Half"]["bl_idname"] == "ShaderNodeValue" and nb["Half"]["output_defaults"] == {0: 0.25})
+    check("its producer removed", "Value" not in nb)
+    check("dot product (Value output) replaced too",
+          nb["Dot"]["bl_idname"] == "ShaderNodeValue" and nb["Dot"]["output_defaults"] == {0: 32.0})
+    check("links now read output 0",
+          sorted((l["from_var"], l["from_socket_index"]) for l in folded["links"])
+          == [("Dot", 0), ("Half", 0)])
+    check("count covers removed and replaced", n == 3)
+
+    # ── 4. Mix (Color) ──────────────────────────────────────────────────────
+    print("4. Mix (Color)")
+    mix = mk_node("Mix", "ShaderNodeMix",
+                  {"data_type": "RGBA", "blend_type": "MULTIPLY", "clamp_factor": True},
+                  {0: 1.5, 6: (0.5, 0.5, 0.5, 0.25), 7: (0.5, 1.0, 0.0, 1.0)})
+    check("factor clamped, A's alpha kept", value_of(mix) == {2: (0.25, 0.5, 0.0, 0.25)})
+    mix["attributes"]["blend_type"] = "OVERLAY"
+    check("unsupported blend left alone", value_of(mix) is None)
+    mix = mk_node("Mix", "ShaderNodeMix", {"data_type": "VECTOR", "factor_mode": "NON_UNIFORM"},
+                  {1: (0.0, 0.5, 1.0), 4: (0.0, 0.0, 0.0), 5: (2.0, 2.0, 2.0)})
+    check("non-uniform vector factor", value_of(mix) == {1: (0.0, 1.0, 2.0)})
+
+    # ── 5. Lossy conversions and two-output readers ─────────────────────────
+    print("5. Lossy conversions / nodes read through two outputs")
+    nodes = [
+        mk_node("Attribute", "ShaderNodeAttribute"),
+        mk_node("Add", "ShaderNodeVectorMath", {"operation": "ADD"},
+                {0: (1.0, 2.0, 3.0), 1: (1.0, 1.0, 1.0), 2: (0.0, 0.0, 0.0), 3: 1.0}),
+        math_node("Sum", "ADD"),
+        mk_node("Group_Output", "NodeGroupOutput"),
+    ]
+    links = [link("Add", 0, "Sum", 0), link("Attribute", 2, "Sum", 1),
+             link("Sum", 0, "Group_Output", 0)]
+    folded, n = cf.fold_constants(mk_info(nodes, links))
+    nb = by_var(folded)
+    check("vector → float link kept", any(l["from_var"] == "Add" for l in folded["links"]))
+    check("vector node became Combine XYZ",
+          nb["Add"]["bl_idname"] == "ShaderNodeCombineXYZ"
+          and nb["Add"]["input_defaults"] == {0: 2.0, 1: 3.0, 2: 4.0})
+    check("non-constant Math untouched", nb["Sum"] == nodes[2])
+
+    nodes = [
+        mk_node("Value", "ShaderNodeValue", outputs={0: 2.0}),
+        mk_node("Scale", "ShaderNodeVectorMath", {"operation": "SCALE"},
+                {0: (1.0, 2.0, 3.0), 1: (0.0, 0.0, 0.0), 2: (0.0, 0.0, 0.0)}),
+        mk_node("Group_Output", "NodeGroupOutput"),
+    ]
+    links = [link("Value", 0, "Scale", 3), link("Scale", 1, "Group_Output", 0),
+             link("Scale", 0, "Group_Output", 1)]
+    folded, n = cf.fold_constants(mk_info(nodes, links))
+    nb = by_var(folded)
+    check("two-output node kept", nb["Scale"]["bl_idname"] == "ShaderNodeVectorMath")
+    check("its constant input baked", nb["Scale"]["input_defaults"][3] == 2.0 and "Value" not in nb)
+    check("both reader links kept", len(folded["links"]) == 2 and n == 1)
+
+    # ── 6. Left alone ───────────────────────────────────────────────────────
+    print("6. Non-constant / unsupported / non-finite")
+    info = mk_info([
+        mk_node("Attribute", "ShaderNodeAttribute"),
+        math_node("Scaled", "MULTIPLY", b=2.0),
+        mk_node("Reflect", "ShaderNodeVectorMath", {"operation": "REFLECT"},
+                {0: (1.0, 0.0, 0.0), 1: (0.0, 1.0, 0.0), 2: (0.0, 0.0, 0.0), 3: 1.0}),
+        math_node("Huge", "EXPONENT", 1000.0),
+        mk_node("Group_Output", "NodeGroupOutput"),
+    ], [link("Attribute", 2, "Scaled", 0), link("Scaled", 0, "Group_Output", 0),
+        link("Reflect", 0, "Group_Output", 1), link("Huge", 0, "Group_Output", 2)])
+    folded, n = cf.fold_constants(info)
+    check("nothing folded, same object back", folded is info and n == 0)
+
+    code = cg.generate_class(cf.fold_constants(mk_info(nodes, links))[0], "ShaderNodeCompiled_Test")
+    compile(code, "folded", "exec")
+    check("folded info generates compilable code", "inputs[3].default_value = 2.0" in code)
+
+    # ── 7. Deep chains and cycles ───────────────────────────────────────────
+    print("7. Deep chain / link cycle")
+    depth = sys.getrecursionlimit() * 2
+    nodes = [math_node(f"Add{i}", "ADD", b=1.0) for i in range(depth)]
+    links = [link(f"Add{i}", 0, f"Add{i + 1}", 0) for i in range(depth - 1)]
+    nodes.append(mk_node("Group_Output", "NodeGroupOutput"))
+    links.append(link(f"Add{depth - 1}", 0, "Group_Output", 0))
+    values, order = cf.evaluate_constants(mk_info(nodes, links))
+    check(f"{depth}-node chain evaluated producers-first",
+          len(order) == depth and order[0] == "Add0" and values[order[-1]] == {0: float(depth)})
+    info = mk_info([math_node("A", "ADD", b=1.0), math_node("B", "ADD", b=1.0)],
+                   [link("A", 0, "B", 0), link("B", 0, "A", 0)])
+    folded, n = cf.fold_constants(info)
+    check("link cycle left alone", folded is info and n == 0)
+
+    print()
+    if failures:
+        print(f"FAILED ({len(failures)}): " + "; ".join(failures))
+        sys.exit(1)
+    print("All constant folding checks passed.")
+
+
+if __name__ == "__main__":
+    main()
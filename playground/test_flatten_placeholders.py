@@ -9,12 +9,22 @@ assert the reported bug is fixed:
   no texture input. After flattening, B's placeholder must land directly in A's own
   tree so the compiled A class exposes the texture input (via code_gen).
 
+It also checks that the indexed flatten_info() produces exactly the output of
+the original rescan-and-deepcopy implementation (frozen below) on randomly
+generated nested groups: same nodes, links and defaults, in the same order —
+with the memo and templates filled beforehand by prepare_flatten() and then
+handed to the flatten read-only, as the compiler's worker threads get them.
+
 Run:  python playground/test_flatten_placeholders.py
 """
 
+import copy
 import importlib.util
 import os
+import random
 import sys
+import time
+from types import MappingProxyType
 
 _HERE = os.path.dirname(os.path.abspath(__file__))
 _COMPILER = os.path.normpath(os.path.join(
@@ -103,6 +113,258 @@ def mk_info(name, nodes, links, interface):
     }
 
 
+# ---------------------------------------------------------------------------
+# Frozen copy of the original flatten_info(): rescans for the first inline
+# target after every splice and deep-copies the whole node / link lists each
+# time. Kept verbatim as the reference output order.
+# ---------------------------------------------------------------------------
+
+def legacy_flatten_info(info, infos, memo, group_needs_inline):
+    nodes = copy.deepcopy(info["nodes"])
+    links = copy.deepcopy(info["links"])
+    inlined_children: list[str] = []
+
+    while True:
+        target = None
+        for n in nodes:
+            if (n["type"] == "GROUP"
+                    and n.get("node_tree_name") in infos
+                    and group_needs_inline(n["node_tree_name"], infos, memo)):
+                target = n
+                break
+        if target is None:
+            break
+        nodes, links = _legacy_inline_one(target, nodes, links, infos)
+        inlined_children.append(target["node_tree_name"])
+
+    new_info = dict(info)
+    new_info["nodes"] = nodes
+    new_info["links"] = links
+    new_info["has_image_nodes"] = [
+        n["var_name"] for n in nodes
+        if n["type"] == "TEX_IMAGE" and not n.get("image_name")
+    ]
+    new_info["placeholder_image_node_names"] = [
+        n["name"] for n in nodes
+        if n["type"] == "TEX_IMAGE" and not n.get("image_name")
+    ]
+    new_info["placeholder_images"] = [
+        {"node_name": n["name"], "label": n.get("label") or ""}
+        for n in nodes
+        if n["type"] == "TEX_IMAGE" and not n.get("image_name")
+    ]
+    new_info["has_uv_nodes"] = [n["var_name"] for n in nodes if n["type"] == "UVMAP"]
+
+    seen: set[str] = set()
+    nested: list[str] = []
+    for n in nodes:
+        tn = n.get("node_tree_name")
+        if n["type"] == "GROUP" and tn and tn not in seen:
+            seen.add(tn)
+            nested.append(tn)
+    new_info["nested_groups"] = nested
+
+    # Carry forward predefined (packed) textures from every inlined child so the
+    # exporter still writes them; the caller dedupes by filename.
+    predefined = list(info.get("_predefined_images", []))
+    for cname in inlined_children:
+        cinfo = infos.get(cname)
+        if cinfo:
+            predefined.extend(cinfo.get("_predefined_images", []))
+    new_info["_predefined_images"] = predefined
+
+    return new_info
+
+
+def _legacy_inline_one(group_node: dict, nodes: list, links: list, infos: dict):
+    child = infos[group_node["node_tree_name"]]
+    gvar = group_node["var_name"]
+    prefix = gvar + "__"
+
+    gi_vars = {n["var_name"] for n in child["nodes"] if n["type"] == "GROUP_INPUT"}
+    go_vars = {n["var_name"] for n in child["nodes"] if n["type"] == "GROUP_OUTPUT"}
+
+    # child INPUT interface socket name → its index in the group node's inputs
+    name_to_idx: dict[str, int] = {}
+    idx = 0
+    for s in child["interface"]:
+        if s.get("item_kind", "socket") == "socket" and s["in_out"] == "INPUT":
+            name_to_idx[s["name"]] = idx
+            idx += 1
+
+    group_defaults = group_node.get("input_defaults", {})
+
+    # Parent links touching the group node, indexed by boundary socket name.
+    in_source: dict[str, list[tuple]] = {}    # sockName → [(from_var, fsn, fsi), ...]
+    out_consumers: dict[str, list[tuple]] = {}  # sockName → [(to_var, tsn, tsi), ...]
+    for lnk in links:
+        if lnk["to_var"] == gvar:
+            in_source.setdefault(lnk["to_socket_name"], []).append(
+                (lnk["from_var"], lnk["from_socket_name"], lnk["from_socket_index"])
+            )
+        if lnk["from_var"] == gvar:
+            out_consumers.setdefault(lnk["from_socket_name"], []).append(
+                (lnk["to_var"], lnk["to_socket_name"], lnk["to_socket_index"])
+            )
+
+    # Copy the child's interior nodes (drop Group In/Out) with prefixed var names.
+    remap: dict[str, str] = {}
+    new_child_nodes: list[dict] = []
+    for cn in child["nodes"]:
+        if cn["type"] in ("GROUP_INPUT", "GROUP_OUTPUT"):
+            continue
+        nc = copy.deepcopy(cn)
+        nc["var_name"] = prefix + cn["var_name"]
+        remap[cn["var_name"]] = nc["var_name"]
+        new_child_nodes.append(nc)
+
+    nc_by_var = {nc["var_name"]: nc for nc in new_child_nodes}
+    parent_by_var = {n["var_name"]: n for n in nodes}
+
+    def _set_default(node_dict, sock_index, value):
+        node_dict.setdefault("input_defaults", {})[sock_index] = value
+
+    def _parent_default(sock_name):
+        i = name_to_idx.get(sock_name)
+        if i is not None and i in group_defaults:
+            return True, group_defaults[i]
+        return False, None
+
+    new_links: list[dict] = []
+    for lnk in child["links"]:
+        f, t = lnk["from_var"], lnk["to_var"]
+        f_gi, t_go = f in gi_vars, t in go_vars
+
+        if f_gi and t_go:
+            # passthrough: group input → group output
+            sources = in_source.get(lnk["from_socket_name"], [])
+            consumers = out_consumers.get(lnk["to_socket_name"], [])
+            if sources:
+                for fv, fsn, fsi in sources:
+                    for tv, tsn, tsi in consumers:
+                        new_links.append(_legacy_link(fv, fsn, fsi, tv, tsn, tsi))
+            else:
+                has, val = _parent_default(lnk["from_socket_name"])
+                if has:
+                    for tv, tsn, tsi in consumers:
+                        pn = parent_by_var.get(tv)
+                        if pn is not None:
+                            _set_default(pn, tsi, val)
+            continue
+
+        if f_gi:
+            # group input → interior consumer
+            consumer = remap.get(t)
+            if consumer is None:
+                continue
+            sources = in_source.get(lnk["from_socket_name"], [])
+            if sources:
+                for fv, fsn, fsi in sources:
+                    new_links.append(
+                        _legacy_link(fv, fsn, fsi, consumer, lnk["to_socket_name"], lnk["to_socket_index"])
+                    )
+            else:
+                has, val = _parent_default(lnk["from_socket_name"])
+                if has:
+                    _set_default(nc_by_var[consumer], lnk["to_socket_index"], val)
+            continue
+
+        if t_go:
+            # interior producer → group output
+            producer = remap.get(f)
+            if producer is None:
+                continue
+            for tv, tsn, tsi in out_consumers.get(lnk["to_socket_name"], []):
+                new_links.append(
+                    _legacy_link(producer, lnk["from_socket_name"], lnk["from_socket_index"], tv, tsn, tsi)
+                )
+            continue
+
+        # interior → interior
+        fv, tv = remap.get(f), remap.get(t)
+        if fv is None or tv is None:
+            continue
+        nl = dict(lnk)
+        nl["from_var"], nl["to_var"] = fv, tv
+        new_links.append(nl)
+
+    result_nodes = [n for n in nodes if n["var_name"] != gvar] + new_child_nodes
+    result_links = [
+        lnk for lnk in links if lnk["from_var"] != gvar and lnk["to_var"] != gvar
+    ] + new_links
+    return result_nodes, result_links
+
+
+def _legacy_link(fv, fsn, fsi, tv, tsn, tsi):
+    return {
+        "from_var": fv, "from_socket_name": fsn, "from_socket_index": fsi,
+        "to_var": tv, "to_socket_name": tsn, "to_socket_index": tsi,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Random nested groups
+# ---------------------------------------------------------------------------
+
+def random_infos(rng, n_groups=14):
+    """Acyclic groups mixing Attribute / placeholder / plain content and nesting."""
+    infos = {}
+    names = []
+    for g in range(n_groups):
+        name = f"lscherry.g{g}"
+        n_in, n_out = rng.randint(0, 3), rng.randint(1, 3)
+        interface = ([sock(f"In{i}", "INPUT", "NodeSocketFloat") for i in range(n_in)]
+                     + [sock(f"Out{i}", "OUTPUT", "NodeSocketFloat") for i in range(n_out)])
+        nodes = [
+            mk_node(var_name="Group_Input", name="Group Input", type="GROUP_INPUT"),
+            mk_node(var_name="Group_Output", name="Group Output", type="GROUP_OUTPUT"),
+        ]
+        # (var, [input socket names], [output socket names])
+        producers = [("Group_Input", [], [f"In{i}" for i in range(n_in)])]
+        for k in range(rng.randint(1, 6)):
+            var = f"N{k}"
+            kind = rng.choice(["MIX", "MIX", "ATTRIBUTE", "TEX_IMAGE", "TEX_IMAGE_BAKED",
+                               "UVMAP", "GROUP", "GROUP", "GROUP"])
+            if kind == "GROUP" and names:
+                child = infos[rng.choice(names)]
+                c_in = [s["name"] for s in child["interface"] if s["in_out"] == "INPUT"]
+                c_out = [s["name"] for s in child["interface"] if s["in_out"] == "OUTPUT"]
+                defaults = {i: rng.random() for i in range(len(c_in)) if rng.random() < 0.6}
+                nodes.append(mk_node(var_name=var, name=f"Group.{k}", type="GROUP",
+                                     node_tree_name=child["name"], input_defaults=defaults))
+                producers.append((var, c_in, c_out))
+                continue
+            if kind == "TEX_IMAGE_BAKED":
+                nodes.append(mk_node(var_name=var, name=f"Image.{k}", type="TEX_IMAGE",
+                                     image_name=f"baked_{g}_{k}.png"))
+            elif kind == "GROUP":
+                nodes.append(mk_node(var_name=var, name=f"Mix.{k}", type="MIX"))
+            else:
+                nodes.append(mk_node(var_name=var, name=f"{kind}.{k}", type=kind,
+                                     label=f"Slot {k}" if kind == "TEX_IMAGE" else "",
+                                     input_defaults={0: rng.random()}))
+            producers.append((var, ["A", "B"], ["Result"]))
+        links = []
+        # Feed inputs from earlier producers (keeps every group acyclic).
+        for pos, (var, ins, _outs) in enumerate(producers[1:], start=1):
+            for i, in_name in enumerate(ins):
+                if rng.random() < 0.7:
+                    src_var, _s_ins, s_outs = producers[rng.randrange(pos)]
+                    if s_outs:
+                        o = rng.randrange(len(s_outs))
+                        links.append(link(src_var, s_outs[o], o, var, in_name, i))
+        for o in range(n_out):
+            src_var, _s_ins, s_outs = rng.choice(producers)
+            if s_outs and rng.random() < 0.9:
+                i = rng.randrange(len(s_outs))
+                links.append(link(src_var, s_outs[i], i, "Group_Output", f"Out{o}", o))
+        info = mk_info(f"g{g}", nodes, links, interface)
+        info["name"] = name
+        infos[name] = info
+        names.append(name)
+    return infos
+
+
 def main():
     flat = _load("flattener")
     cg = _load("code_gen")
@@ -168,7 +430,7 @@ def main():
     check("draw_buttons exposes the texture slot",
           'template_ID(self,' in code)
     check("valuesUpdate assigns the placeholder image",
-          "node.image = getattr(self, _placeholder_images[node.name])" in code)
+          "self.applyInstanceValues(context, {" in code and "'image_texture'}" in code)
 
     # ── Negative: an attribute-free, placeholder-free child stays referenced ─
     print("Negative — plain nested group is NOT flattened")
@@ -187,6 +449,45 @@ def main():
     check("needs_flatten(A->plain) is False",
           flat.needs_flatten(a2, plain_infos, {}) is False)
 
+    # ── Equivalence with the original algorithm ──────────────────────────────
+    print("Equivalence — indexed flatten matches the original output")
+    n_flattened = 0
+    mismatched = []
+    untouched = True
+    read_only = True
+    t_legacy = t_new = 0.0
+    for seed in range(40):
+        rng_infos = random_infos(random.Random(seed))
+        before = copy.deepcopy(rng_infos)
+        memo, templates = {}, {}
+        for name, info in rng_infos.items():
+            if not flat.needs_flatten(info, rng_infos, memo):
+                continue
+            t0 = time.perf_counter()
+            expected = legacy_flatten_info(info, rng_infos, {}, flat.group_needs_inline)
+            t1 = time.perf_counter()
+            flat.prepare_flatten(info, rng_infos, memo, templates)
+            try:
+                got = flat.flatten_info(info, rng_infos, MappingProxyType(memo),
+                                        MappingProxyType(templates))
+            except TypeError:
+                read_only = False
+                got = None
+            t2 = time.perf_counter()
+            t_legacy += t1 - t0
+            t_new += t2 - t1
+            n_flattened += 1
+            if got != expected:
+                mismatched.append(f"seed {seed} {name}")
+        untouched = untouched and rng_infos == before
+    check(f"{n_flattened} flattened groups identical to the original",
+          n_flattened > 0 and not mismatched)
+    if mismatched:
+        print("    mismatches: " + ", ".join(mismatched[:5]))
+    check("analyzed infos left untouched", untouched)
+    check("a prepared flatten only reads the memo and templates", read_only)
+    print(f"    original {t_legacy * 1000:.1f} ms, indexed {t_new * 1000:.1f} ms")
+
     print()
     if failures:
         print(f"FAILED ({len(failures)}): " + "; ".join(failures))
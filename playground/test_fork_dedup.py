@@ -0,0 +1,137 @@
+"""
+Standalone verification for the save-time fork grouping.
+
+nodes/fork_dedup.py imports no `bpy`, so plain fakes stand in for the node
+groups of one stable key. Checks:
+
+  1. Forks holding the same images and UV maps with the same tree hash merge
+     onto the canonical datablock; forks with other images stay.
+  2. The tree hash is only taken inside a bucket of colliding images / UV
+     maps — a key whose forks all differ is never hashed.
+  3. Equal images but a different tree hash keep both; without the canonical
+     in the group the first fork by name survives.
+  4. Fake-user datablocks are never merged away; unreadable ones are reported.
+
+Run:  python playground/test_fork_dedup.py
+"""
+
+import importlib.util
+import os
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_FORK_DEDUP = os.path.normpath(os.path.join(_HERE, "..", "src", "nodes", "fork_dedup.py"))
+
+
+def _load():
+    spec = importlib.util.spec_from_file_location("fork_dedup", _FORK_DEDUP)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+class FakeImage:
+    def __init__(self, name):
+        self.name_full = name
+
+
+class FakeNode:
+    def __init__(self, name, type, **props):
+        self.name = name
+        self.type = type
+        for k, v in props.items():
+            setattr(self, k, v)
+
+
+class FakeBlock:
+    """A node group: a name, nodes and the tree hash the fake hasher reports."""
+
+    def __init__(self, name, image=None, uv_map="", digest="base", use_fake_user=False):
+        self.name = name
+        self.digest = digest
+        self.use_fake_user = use_fake_user
+        self.nodes = [
+            FakeNode("Image_Texture", "TEX_IMAGE", image=FakeImage(image) if image else None),
+            FakeNode("UV_Map", "UVMAP", uv_map=uv_map),
+            FakeNode("Math", "MATH"),
+        ]
+
+
+class BrokenBlock:
+    """A datablock whose nodes can't be read."""
+    use_fake_user = False
+
+    def __init__(self, name):
+        self.name = name
+
+    @property
+    def nodes(self):
+        raise RuntimeError("freed")
+
+
+KEY = ".lscherry.core.Toon"
+
+
+def main():
+    fd = _load()
+    failures = []
+
+    def check(label, cond):
+        print(f"  [{'PASS' if cond else 'FAIL'}] {label}")
+        if not cond:
+            failures.append(label)
+
+    hashed = []
+
+    def hash_tree(block):
+        hashed.append(block.name)
+        return block.digest
+
+    def names(merges):
+        return [(b.name, k.name) for b, k in merges]
+
+    print("1. Identical forks merge onto the canonical datablock")
+    blocks = [
+        FakeBlock(KEY + ".002", image="skin.png"),
+        FakeBlock(KEY + ".001"),
+        FakeBlock(KEY),
+        FakeBlock(KEY + ".003", image="skin.png"),
+        FakeBlock(KEY + ".004", image="hair.png"),
+    ]
+    merges, failed = fd.plan_fork_merges(KEY, blocks, hash_tree)
+    check("cleared fork rejoins the canonical, equal forks merge onto the first by name",
+          names(merges) == [(KEY + ".001", KEY), (KEY + ".003", KEY + ".002")] and not failed)
+    check("the lone hair.png fork is not hashed", KEY + ".004" not in hashed)
+
+    print("2. Distinct images: nothing hashed")
+    hashed.clear()
+    blocks = [FakeBlock(KEY), FakeBlock(KEY + ".001", image="a.png"),
+              FakeBlock(KEY + ".002", uv_map="UVMap.001")]
+    merges, failed = fd.plan_fork_merges(KEY, blocks, hash_tree)
+    check("no merges, no hashes", merges == [] and hashed == [])
+
+    print("3. Same images, different content")
+    blocks = [FakeBlock(KEY + ".002", image="a.png", digest="edited"),
+              FakeBlock(KEY + ".001", image="a.png")]
+    merges, _failed = fd.plan_fork_merges(KEY, blocks, hash_tree)
+    check("different tree hashes both stay", merges == [])
+    blocks.append(FakeBlock(KEY + ".003", image="a.png"))
+    merges, _failed = fd.plan_fork_merges(KEY, blocks, hash_tree)
+    check("survivor is the first fork by name", names(merges) == [(KEY + ".003", KEY + ".001")])
+
+    print("4. Fake users and unreadable datablocks")
+    blocks = [FakeBlock(KEY), FakeBlock(KEY + ".001", use_fake_user=True),
+              BrokenBlock(KEY + ".002")]
+    merges, failed = fd.plan_fork_merges(KEY, blocks, hash_tree)
+    check("fake-user fork kept", merges == [])
+    check("unreadable datablock reported", [b.name for b in failed] == [KEY + ".002"])
+
+    print()
+    if failures:
+        print(f"FAILED ({len(failures)}): " + "; ".join(failures))
+        sys.exit(1)
+    print("All fork dedup checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""
+Standalone verification for the flattener's hoist split.
+
+flattener.py imports no `bpy`, so the split can be driven with hand-built
+`info` dicts, bottom-up as the NodeCompiler does it:
+
+  Leaf  — an Attribute node and a placeholder TEX_IMAGE (fed by a Mapping node)
+          mixed through a chain of ordinary nodes; one output reads the
+          Attribute directly, one passes a group input through.
+  Mid   — one Leaf group node plus a node of its own.
+  Twice — two Leaf group nodes.
+  Top   — one Mid group node.
+
+Checks:
+  1. Leaf splits: Attribute, TEX_IMAGE and Mapping are hoisted; the core keeps
+     the chain and reads the hoisted values through extra inputs in a trailing
+     panel, leaving the original socket indices alone.
+  2. Every parent computes the same Group Output values as with plain inlining
+     (symbolic evaluation through the group / core references).
+  3. The hoisted nodes bubble all the way up to Top, and the split output is
+     smaller than plain inlining.
+  4. A child made only of forcing nodes, or with an untyped hoisted output,
+     is inlined whole instead.
+  5. The core and Top generate compilable code.
+
+Run:  python playground/test_hoist_split.py
+"""
+
+import importlib.util
+import os
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_COMPILER = os.path.normpath(os.path.join(
+    _HERE, "..", "src", "features", "node_compiler", "compiler"
+))
+
+
+def _load(mod_name):
+    path = os.path.join(_COMPILER, mod_name + ".py")
+    spec = importlib.util.spec_from_file_location(mod_name, path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def mk_node(var, type_, ins=(), outs=(), types=None, **over):
+    node = {
+        "var_name": var,
+        "name": var.replace("_", " "),
+        "type": type_,
+        "bl_idname": "ShaderNode" + type_.title().replace("_", ""),
+        "location": (0.0, 0.0),
+        "width": 140.0,
+        "label": "",
+        "hide": False,
+        "attributes": {},
+        "input_defaults": {},
+        "output_defaults": {},
+        "input_socket_names": list(ins),
+        "output_socket_names": list(outs),
+        "output_socket_types": list(types or ["VALUE"] * len(outs)),
+        "node_tree_name": None,
+        "repeat_items": [],
+        "color_ramp": None,
+        "curve_mapping": None,
+        "enum_items": [],
+        "index_switch_count": None,
+        "active_index": None,
+    }
+    node.update(over)
+    return node
+
+
+def gi(*names):
+    return mk_node("Group_Input", "GROUP_INPUT", outs=list(names) + [""],
+                   bl_idname="NodeGroupInput")
+
+
+def go(*names):
+    return mk_node("Group_Output", "GROUP_OUTPUT", ins=list(names) + [""],
+                   bl_idname="NodeGroupOutput")
+
+
+def group(var, tree, ins, outs, **over):
+    return mk_node(var, "GROUP", ins, outs, bl_idname="ShaderNodeGroup",
+                   node_tree_name=tree, **over)
+
+
+def sock(name, in_out, socket_type="NodeSocketFloat"):
+    return {
+        "item_kind": "socket", "name": name, "in_out": in_out,
+        "socket_type": socket_type, "description": "", "default_value": None,
+        "min_value": None, "max_value": None, "subtype": "NONE",
+        "hide_value": False, "hide_in_modifier": False, "dimensions": None,
+        "identifier": name, "parent_id": None,
+    }
+
+
+def link(fv, fsn, fsi, tv, tsn, tsi):
+    return {
+        "from_var": fv, "from_socket_name": fsn, "from_socket_index": fsi,
+        "to_var": tv, "to_socket_name": tsn, "to_socket_index": tsi,
+    }
+
+
+def mk_info(name, nodes, links, interface):
+    return {
+        "name": name, "type": "SHADER", "bl_label": "lscherry." + name,
+        "color_tag": "NONE", "description": "", "interface": interface,
+        "nodes": nodes, "links": links, "zone_pairs": [],
+        "has_image_nodes": [], "has_uv_nodes": [], "nested_groups": [],
+        "placeholder_image_node_names": [], "placeholder_images": [],
+        "_predefined_images": [],
+    }
+
+
+def build_infos():
+    leaf_nodes = [
+        gi("Fac", "Vector", "Tint"),
+        mk_node("Attribute", "ATTRIBUTE", outs=["Color", "Vector", "Fac", "Alpha"],
+                types=["RGBA", "VECTOR", "VALUE", "VALUE"],
+                attributes={"attribute_name": "col"}),
+        mk_node("Mapping", "MAPPING", ins=["Vector", "Location"], outs=["Vector"],
+                types=["VECTOR"], input_defaults={1: (0.0, 0.0, 0.0)}),
+        mk_node("Image_Texture", "TEX_IMAGE", ins=["Vector"], outs=["Color", "Alpha"],
+                types=["RGBA", "VALUE"], label="Base"),
+        mk_node("Mix", "MIX", ins=["Factor", "A", "B"], outs=["Result"], types=["RGBA"]),
+    ]
+    leaf_links = [
+        link("Group_Input", "Vector", 1, "Mapping", "Vector", 0),
+        link("Mapping", "Vector", 0, "Image_Texture", "Vector", 0),
+        link("Group_Input", "Fac", 0, "Mix", "Factor", 0),
+        link("Attribute", "Color", 0, "Mix", "A", 1),
+        link("Image_Texture", "Color", 0, "Mix", "B", 2),
+    ]
+    prev = "Mix"
+    for i in range(6):          # the shareable bulk of the child
+        var = f"Heavy_{i}"
+        leaf_nodes.append(mk_node(var, "MATH", ins=["Value", "Value"], outs=["Value"],
+                                  attributes={"operation": "MULTIPLY"},
+                                  input_defaults={1: 1.0 + i}))
+        leaf_links.append(link(prev, "Value" if i else "Result", 0, var, "Value", 0))
+        prev = var
+    leaf_nodes.append(go("Color", "Mask", "Tint"))
+    leaf_links += [
+        link(prev, "Value", 0, "Group_Output", "Color", 0),
+        link("Attribute", "Fac", 2, "Group_Output", "Mask", 1),
+        link("Group_Input", "Tint", 2, "Group_Output", "Tint", 2),
+    ]
+    leaf = mk_info("Leaf", leaf_nodes, leaf_links, [
+        sock("Fac", "INPUT"), sock("Vector", "INPUT", "NodeSocketVector"),
+        sock("Tint", "INPUT", "NodeSocketColor"),
+        sock("Color", "OUTPUT", "NodeSocketColor"), sock("Mask", "OUTPUT"),
+        sock("Tint", "OUTPUT", "NodeSocketColor"),
+    ])
+
+    def leaf_ref(var, defaults=None):
+        return group(var, "Leaf", ["Fac", "Vector", "Tint"], ["Color", "Mask", "Tint"],
+                     input_defaults=defaults or {0: 0.5, 2: (1.0, 0.5, 0.0, 1.0)})
+
+    mid = mk_info("Mid", [
+        gi("Vector"),
+        leaf_ref("Group"),
+        mk_node("Combine", "MATH", ins=["Value", "Value"], outs=["Value"],
+                attributes={"operation": "ADD"}),
+        go("Color", "Value", "Tint"),
+    ], [
+        link("Group_Input", "Vector", 0, "Group", "Vector", 1),
+        link("Group", "Mask", 1, "Combine", "Value", 0),
+        link("Group", "Color", 0, "Combine", "Value", 1),
+        link("Group", "Color", 0, "Group_Output", "Color", 0),
+        link("Combine", "Value", 0, "Group_Output", "Value", 1),
+        link("Group", "Tint", 2, "Group_Output", "Tint", 2),
+    ], [sock("Vector", "INPUT", "NodeSocketVector"), sock("Color", "OUTPUT", "NodeSocketColor"),
+        sock("Value", "OUTPUT"), sock("Tint", "OUTPUT", "NodeSocketColor")])
+
+    twice = mk_info("Twice", [
+        leaf_ref("Group", {0: 0.25, 1: (0.0, 0.0, 1.0), 2: (0.0, 0.0, 0.0, 1.0)}),
+        leaf_ref("Group_001", {0: 0.75, 1: (1.0, 0.0, 0.0), 2: (1.0, 1.0, 1.0, 1.0)}),
+        mk_node("Add", "MATH", ins=["Value", "Value"], outs=["Value"]),
+        go("Value"),
+    ], [
+        link("Group", "Mask", 1, "Add", "Value", 0),
+        link("Group_001", "Color", 0, "Add", "Value", 1),
+        link("Add", "Value", 0, "Group_Output", "Value", 0),
+    ], [sock("Value", "OUTPUT")])
+
+    top = mk_info("Top", [
+        group("Group", "Mid", ["Vector"], ["Color", "Value", "Tint"],
+              input_defaults={0: (0.5, 0.5, 0.0)}),
+        go("Surface", "Value"),
+    ], [
+        link("Group", "Color", 0, "Group_Output", "Surface", 0),
+        link("Group", "Value", 1, "Group_Output", "Value", 1),
+    ], [sock("Surface", "OUTPUT", "NodeSocketColor"), sock("Value", "OUTPUT")])
+
+    return {"Leaf": leaf, "Mid": mid, "Twice": twice, "Top": top}
+
+
+def evaluate(info, registry, bound=None):
+    """Symbolic value of every Group Output input of *info*."""
+    nodes = {n["var_name"]: n for n in info["nodes"]}
+    incoming = {(lnk["to_var"], lnk["to_socket_index"]): lnk for lnk in info["links"]}
+    cache = {}
+
+    def inp(var, idx):
+        lnk = incoming.get((var, idx))
+        if lnk is not None:
+            return out(lnk["from_var"], lnk["from_socket_index"])
+        return ("default", repr(nodes[var].get("input_defaults", {}).get(idx)))
+
+    def out(var, idx):
+        key = (var, idx)
+        if key not in cache:
+            n = nodes[var]
+            args = tuple(inp(var, i) for i in range(len(n["input_socket_names"])))
+            if n["type"] == "GROUP_INPUT":
+                cache[key] = bound[idx] if bound is not None else ("input", idx)
+            elif n["type"] == "GROUP":
+                cache[key] = evaluate(registry[n["node_tree_name"]], registry, args)[idx]
+            else:
+                cache[key] = (n["type"], repr(sorted(n["attributes"].items())), idx, args)
+        return cache[key]
+
+    gout = next(n for n in info["nodes"] if n["type"] == "GROUP_OUTPUT")
+    return [inp(gout["var_name"], i) for i in range(len(gout["input_socket_names"]) - 1)]
+
+
+def main():
+    flat = _load("flattener")
+    cg = _load("code_gen")
+    failures = []
+
+    def check(label, cond):
+        print(f"  [{'PASS' if cond else 'FAIL'}] {label}")
+        if not cond:
+            failures.append(label)
+
+    infos = build_infos()
+    order = ["Leaf", "Mid", "Twice", "Top"]
+    memo = {}
+
+    # Bottom-up, as the NodeCompiler's phase A does it.
+    plans, registry, split = {}, dict(infos), {}
+    for name in order:
+        info = infos[name]
+        if flat.needs_flatten(info, infos, memo) or flat.group_needs_inline(name, infos, memo):
+            info = flat.hoist_flatten_info(info, infos, memo, plans)
+        split[name] = info
+        if flat.group_needs_inline(name, infos, memo):
+            plan = flat.plan_split(info, name + "__core")
+            if plan is not None:
+                plans[name] = plan
+                registry[plan.core_ref] = plan.core
+
+    print("Split plan")
+    leaf_plan = plans.get("Leaf")
+    check("Leaf is split", leaf_plan is not None)
+    check("Attribute, TEX_IMAGE and its Mapping are hoisted",
+          leaf_plan.hoisted_vars == {"Attribute", "Image_Texture", "Mapping"})
+    core = leaf_plan.core
+    check("core holds no forcing node",
+          not any(n["type"] in ("ATTRIBUTE", "TEX_IMAGE") for n in core["nodes"]))
+    check("core keeps the shared chain",
+          sum(n["var_name"].startswith("Heavy_") for n in core["nodes"]) == 6)
+    check("core carries no placeholder", core["placeholder_images"] == [])
+    items = core["interface"]
+    check("extras sit in a trailing Hoisted panel",
+          [i.get("item_kind", "socket") for i in items[-3:]] == ["panel", "socket", "socket"]
+          and all(i["parent_id"] == items[-3]["identifier"] for i in items[-2:]))
+    check("extras typed from the hoisted outputs",
+          [i["socket_type"] for i in items[-2:]] == ["NodeSocketColor", "NodeSocketColor"])
+    check("original interface unchanged", items[:6] == infos["Leaf"]["interface"])
+    check("group node roster gains the extras after the originals",
+          leaf_plan.input_names[:3] == ["Fac", "Vector", "Tint"] and len(leaf_plan.input_names) == 5)
+    check("Mid is split in turn", "Mid" in plans)
+
+    print("Equivalence — same Group Output values as plain inlining")
+    for name in ("Mid", "Twice", "Top"):
+        inlined = flat.flatten_info(infos[name], infos, {})
+        check(f"{name}: outputs match",
+              evaluate(split[name], registry) == evaluate(inlined, infos))
+    check("Leaf core + hoisted match Leaf",
+          evaluate(split["Leaf"], registry) == evaluate(infos["Leaf"], infos))
+
+    print("Hoisting reaches the top")
+    top = split["Top"]
+    check("Top holds the Attribute and placeholder itself",
+          {n["type"] for n in top["nodes"]} >= {"ATTRIBUTE", "TEX_IMAGE"})
+    check("Top references Mid's core", top["nested_groups"] == ["Mid__core"])
+    check("Top exposes the placeholder", [p["label"] for p in top["placeholder_images"]] == ["Base"])
+    check("Twice hoists one copy per group node",
+          sum(n["type"] == "ATTRIBUTE" for n in split["Twice"]["nodes"]) == 2)
+
+    print("Size")
+    n_inlined = sum(len(flat.flatten_info(infos[n], infos, {})["nodes"]) for n in order)
+    n_split = (sum(len(split[n]["nodes"]) for n in order)
+               + sum(len(p.core["nodes"]) for p in plans.values()))
+    print(f"    nodes written: inlined {n_inlined}, split {n_split} (cores included)")
+    check("split writes fewer nodes", n_split < n_inlined)
+
+    print("Not worth splitting")
+    bare = mk_info("Bare", [
+        mk_node("Attribute", "ATTRIBUTE", outs=["Color"], types=["RGBA"]),
+        go("Color"),
+    ], [link("Attribute", "Color", 0, "Group_Output", "Color", 0)],
+        [sock("Color", "OUTPUT", "NodeSocketColor")])
+    check("a child of forcing nodes only is inlined whole",
+          flat.plan_split(bare, "Bare__core") is None)
+    untyped = build_infos()["Leaf"]
+    for n in untyped["nodes"]:
+        n.pop("output_socket_types", None)
+    check("an untyped hoisted output falls back to inlining",
+          flat.plan_split(untyped, "Leaf__core") is None)
+
+    print("Codegen")
+    compiled = {
+        "Leaf__core": ("ShaderNodeCompiled_Leaf__core", ".lscherry.Leaf__core"),
+        "Mid__core": ("ShaderNodeCompiled_Mid__core", ".lscherry.Mid__core"),
+    }
+    for label, info, cls in (
+        ("Leaf core", dict(core, bl_label="lscherry.Leaf__core"), "ShaderNodeCompiled_Leaf__core"),
+        ("Top", top, "ShaderNodeCompiled_Top"),
+    ):
+        code = cg.generate_class(info, cls, "...node", compiled)
+        try:
+            compile(code, label, "exec")
+            ok = True
+        except SyntaxError:
+            ok = False
+        check(f"{label} compiles", ok)
+    check("Top builds Mid's core by its key",
+          "lscherry.Mid__core" in cg.generate_class(top, "ShaderNodeCompiled_Top", "...node", compiled))
+
+    print()
+    if failures:
+        print(f"FAILED ({len(failures)}): " + "; ".join(failures))
+        sys.exit(1)
+    print("All hoist split checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Standalone verification for the NodeCompiler's PNG optimizer.
+
+image_optimizer.py imports no `bpy`, so it can be driven with PNGs written
+here by hand (zlib + struct, default compression and a text chunk like the
+metadata Blender writes):
+
+  1. A noisy RGBA image keeps every pixel, loses its text chunk and does not
+     grow; the palette / colour-space chunks survive.
+  2. A horizontal ramp (all rows equal) becomes one row, a vertical ramp (all
+     columns equal) one column — with the same pixels along the other axis.
+  3. 16-bit and sub-byte palette images round-trip; interlaced ones are only
+     recompressed.
+  4. An optimized file is marked and skipped the next time.
+  5. optimize_png_file() rewrites in place and reports the sizes; a non-PNG
+     is left alone.
+  6. The smallest textures shipped in src/nodes/shader/images/ round-trip
+     losslessly and shrink (reported with the bytes saved).
+
+Run:  python playground/test_image_optimizer.py
+"""
+
+import importlib.util
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import zlib
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_COMPILER = os.path.normpath(os.path.join(
+    _HERE, "..", "src", "features", "node_compiler", "compiler"
+))
+_IMAGES = os.path.normpath(os.path.join(_HERE, "..", "src", "nodes", "shader", "images"))
+
+
+def _load(mod_name):
+    path = os.path.join(_COMPILER, mod_name + ".py")
+    spec = importlib.util.spec_from_file_location(mod_name, path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def chunk(kind, body):
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(
+        ">I", zlib.crc32(kind + body) & 0xFFFFFFFF)
+
+
+def make_png(width, height, rows, depth=8, ctype=6, extra=()):
+    """A PNG of *rows* (raw bytes per row), every row under the Sub filter."""
+    bits = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[ctype] * depth
+    bpp = max(1, bits // 8)
+    raw = bytearray()
+    for row in rows:
+        raw.append(1)
+        raw += row[:bpp]
+        raw += bytes((a - b) & 0xFF for a, b in zip(row[bpp:], row))
+    ihdr = struct.pack(">IIBBBBB", width, height, depth, ctype, 0, 0, 0)
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n", chunk(b"IHDR", ihdr), *extra,
+        chunk(b"tEXt", b"Software\x00Blender"),
+        chunk(b"IDAT", zlib.compress(bytes(raw), 6)), chunk(b"IEND", b""),
+    ])
+
+
+def main():
+    opt = _load("image_optimizer")
+    failures = []
+
+    def check(label, cond):
+        print(f"  [{'PASS' if cond else 'FAIL'}] {label}")
+        if not cond:
+            failures.append(label)
+
+    def kinds(data):
+        return [k for k, _b in opt._chunks(data)]
+
+    rng = random.Random(7)
+
+    print("1. Lossless re-encode")
+    w, h = 32, 24
+    rows = [bytes(rng.randrange(256) if i % 4 else (x * 8) & 0xFF
+                  for x in range(w) for i in range(4)) for _y in range(h)]
+    srgb = chunk(b"sRGB", b"\x00")
+    src = make_png(w, h, rows, extra=[srgb])
+    out, note = opt.optimize_png(src)
+    header, got = opt.read_png(out)
+    check("pixels unchanged", got == rows and (header["width"], header["height"]) == (w, h))
+    check("text chunk dropped, sRGB kept",
+          b"tEXt" not in kinds(out) and b"sRGB" in kinds(out))
+    check("not larger", len(out) <= len(src))
+    check("note says recompressed", note == "recompressed")
+
+    print("2. Ramps")
+    line = bytes(v for x in range(256) for v in (x, 255 - x, x // 2, 255))
+    src = make_png(256, 16, [line] * 16)
+    out, note = opt.optimize_png(src)
+    header, got = opt.read_png(out)
+    check("horizontal ramp cut to one row", header["height"] == 1 and got == [line])
+    check("note names the cut", note.startswith("rows 16 -> 1"))
+    col = [bytes((y * 9, y * 3, 200, 255)) * 64 for y in range(20)]
+    out, note = opt.optimize_png(make_png(64, 20, col))
+    header, got = opt.read_png(out)
+    check("vertical ramp cut to one column",
+          header["width"] == 1 and got == [r[:4] for r in col])
+    out, note = opt.optimize_png(make_png(8, 8, [bytes((1, 2, 3, 4)) * 8] * 8))
+    check("a flat image becomes 1x1", opt.read_png(out)[0]["width"] == 1
+          and opt.read_png(out)[0]["height"] == 1)
+
+    print("3. Other layouts")
+    rows16 = [bytes(rng.randrange(256) for _ in range(16 * 6)) for _y in range(10)]
+    out, _n = opt.optimize_png(make_png(16, 10, rows16, depth=16, ctype=2))
+    check("16-bit RGB round-trips", opt.read_png(out)[1] == rows16)
+    pal = chunk(b"PLTE", bytes(range(48)))
+    rows4 = [bytes(rng.randrange(256) for _ in range(5)) for _y in range(6)]
+    out, _n = opt.optimize_png(make_png(10, 6, rows4, depth=4, ctype=3, extra=[pal]))
+    check("4-bit palette round-trips with its palette",
+          opt.read_png(out)[1] == rows4 and b"PLTE" in kinds(out))
+    laced = make_png(16, 16, [line[:64]] * 16).replace(
+        chunk(b"IHDR", struct.pack(">IIBBBBB", 16, 16, 8, 6, 0, 0, 0)),
+        chunk(b"IHDR", struct.pack(">IIBBBBB", 16, 16, 8, 6, 0, 0, 1)))
+    out, note = opt.optimize_png(laced)
+    check("interlaced image only recompressed",
+          note == "recompressed" and opt._chunks(out)[0] == opt._chunks(laced)[0])
+
+    print("4. Marker")
+    once, _n = opt.optimize_png(src)
+    again, note = opt.optimize_png(once)
+    check("optimized file is marked and skipped", again is once and note == "already optimized")
+
+    print("5. Files")
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, "ramp.png")
+        with open(path, "wb") as fh:
+            fh.write(make_png(256, 16, [line] * 16))
+        rep = opt.optimize_png_file(path)
+        check("report carries the sizes",
+              rep.filename == "ramp.png" and rep.after == os.path.getsize(path) < rep.before)
+        jpg = os.path.join(tmp, "photo.jpg")
+        with open(jpg, "wb") as fh:
+            fh.write(b"\xff\xd8\xff\xe0 not a png")
+        rep = opt.optimize_png_file(jpg)
+        check("non-PNG left alone", rep.before == rep.after and rep.note == "not a PNG")
+
+        print("6. Shipped textures")
+        before = after = 0
+        ok = True
+        shipped = sorted((n for n in os.listdir(_IMAGES) if n.lower().endswith(".png")),
+                         key=lambda n: os.path.getsize(os.path.join(_IMAGES, n)))
+        for name in shipped[:6]:
+            dest = os.path.join(tmp, name)
+            shutil.copyfile(os.path.join(_IMAGES, name), dest)
+            with open(dest, "rb") as fh:
+                data = fh.read()
+            rep = opt.optimize_png_file(dest)
+            with open(dest, "rb") as fh:
+                new = fh.read()
+            if rep.note != "already optimized":
+                _h0, r0 = opt.read_png(data)
+                _h1, r1 = opt.read_png(new)
+                if "rows" in rep.note:
+                    r0 = r0[:1]
+                if "columns" in rep.note:
+                    r0 = [r[:len(r1[0])] for r in r0]
+                ok = ok and r0 == r1
+            before += rep.before
+            after += rep.after
+        print(f"    {before} -> {after} bytes ({before - after} saved)")
+        check("every shipped PNG round-trips", ok)
+        check("shipped PNGs shrink", after < before)
+    finally:
+        shutil.rmtree(tmp)
+
+    print()
+    if failures:
+        print(f"FAILED ({len(failures)}): " + "; ".join(failures))
+        sys.exit(1)
+    print("All image optimizer checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Standalone verification for the flattener's instance wrapper.
+
+flattener.py imports no `bpy`, so the wrapper can be built from a hand-built
+`info` dict, as the NodeCompiler does it with Instance Wrappers on:
+
+  Resolver — a UV Map node feeding a Mapping node and a placeholder
+             TEX_IMAGE, mixed with a group input through a chain of ordinary
+             nodes; a second UV Map node feeds the chain itself, and the
+             texture's Alpha goes straight to the Group Output.
+
+Checks:
+  1. With hoist_uv both UV Map nodes are hoisted with the placeholder and
+     its Mapping node; without it the one feeding the chain stays in the core.
+  2. The wrapper is Group Input / Output, the hoisted nodes and one group
+     node pointing at the core; it keeps the image and UV Map bookkeeping,
+     the core has none.
+  3. Wrapper + core compute the same Group Output values as the group itself.
+  4. A group made only of hoisted nodes gets no wrapper.
+  5. The wrapper and the core generate compilable code, and the wrapper —
+     the part valuesUpdate copies per instance — is a fraction of the size.
+
+Run:  python playground/test_instance_wrapper.py
+"""
+
+import importlib.util
+import os
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_COMPILER = os.path.normpath(os.path.join(
+    _HERE, "..", "src", "features", "node_compiler", "compiler"
+))
+
+
+def _load(mod_name):
+    path = os.path.join(_COMPILER, mod_name + ".py")
+    spec = importlib.util.spec_from_file_location(mod_name, path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def mk_node(var, type_, ins=(), outs=(), types=None, **over):
+    node = {
+        "var_name": var,
+        "name": var.replace("_", " "),
+        "type": type_,
+        "bl_idname": "ShaderNode" + type_.title().replace("_", ""),
+        "location": (0.0, 0.0),
+        "width": 140.0,
+        "label": "",
+        "hide": False,
+        "attributes": {},
+        "input_defaults": {},
+        "output_defaults": {},
+        "input_socket_names": list(ins),
+        "output_socket_names": list(outs),
+        "output_socket_types": list(types or ["VALUE"] * len(outs)),
+        "node_tree_name": None,
+        "repeat_items": [],
+        "color_ramp": None,
+        "curve_mapping": None,
+        "enum_items": [],
+        "index_switch_count": None,
+        "active_index": None,
+    }
+    node.update(over)
+    return node
+
+
+def sock(name, in_out, socket_type="NodeSocketFloat"):
+    return {
+        "item_kind": "socket", "name": name, "in_out": in_out,
+        "socket_type": socket_type, "description": "", "default_value": None,
+        "min_value": None, "max_value": None, "subtype": "NONE",
+        "hide_value": False, "hide_in_modifier": False, "dimensions": None,
+        "identifier": name, "parent_id": None,
+    }
+
+
+def link(fv, fsn, fsi, tv, tsn, tsi):
+    return {
+        "from_var": fv, "from_socket_name": fsn, "from_socket_index": fsi,
+        "to_var": tv, "to_socket_name": tsn, "to_socket_index": tsi,
+    }
+
+
+def mk_info(name, nodes, links, interface, **over):
+    info = {
+        "name": name, "type": "SHADER", "bl_label": "lscherry." + name,
+        "color_tag": "NONE", "description": "", "interface": interface,
+        "nodes": nodes, "links": links, "zone_pairs": [],
+        "has_image_nodes": [], "has_uv_nodes": [], "nested_groups": [],
+        "placeholder_image_node_names": [], "placeholder_images": [],
+        "_predefined_images": [],
+    }
+    info.update(over)
+    return info
+
+
+def build_resolver():
+    nodes = [
+        mk_node("Group_Input", "GROUP_INPUT", outs=["Fac", "Tint", ""],
+                bl_idname="NodeGroupInput", location=(-900.0, 0.0)),
+        mk_node("UV_Map", "UVMAP", outs=["UV"], types=["VECTOR"]),
+        mk_node("UV_Map_001", "UVMAP", outs=["UV"], types=["VECTOR"]),
+        mk_node("Mapping", "MAPPING", ins=["Vector", "Location"], outs=["Vector"],
+                types=["VECTOR"], input_defaults={1: (0.0, 0.0, 0.0)}),
+        mk_node("Image_Texture", "TEX_IMAGE", ins=["Vector"], outs=["Color", "Alpha"],
+                types=["RGBA", "VALUE"], label="Base"),
+        mk_node("Mix", "MIX", ins=["Factor", "A", "B"], outs=["Result"], types=["RGBA"]),
+    ]
+    links = [
+        link("UV_Map", "UV", 0, "Mapping", "Vector", 0),
+        link("Mapping", "Vector", 0, "Image_Texture", "Vector", 0),
+        link("Group_Input", "Fac", 0, "Mix", "Factor", 0),
+        link("Group_Input", "Tint", 1, "Mix", "A", 1),
+        link("Image_Texture", "Color", 0, "Mix", "B", 2),
+    ]
+    prev = "Mix"
+    for i in range(8):          # the body every instance can share
+        var = f"Heavy_{i}"
+        nodes.append(mk_node(var, "MATH", ins=["Value", "Value"], outs=["Value"],
+                             attributes={"operation": "MULTIPLY"},
+                             input_defaults={1: 1.0 + i}))
+        links.append(link(prev, "Value" if i else "Result", 0, var, "Value", 0))
+        prev = var
+    links.append(link("UV_Map_001", "UV", 0, "Heavy_3", "Value", 1))
+    nodes.append(mk_node("Group_Output", "GROUP_OUTPUT", ins=["Color", "Alpha", ""],
+                         bl_idname="NodeGroupOutput", location=(900.0, 0.0)))
+    links += [
+        link(prev, "Value", 0, "Group_Output", "Color", 0),
+        link("Image_Texture", "Alpha", 1, "Group_Output", "Alpha", 1),
+    ]
+    return mk_info(
+        "Resolver", nodes, links,
+        [sock("Fac", "INPUT"), sock("Tint", "INPUT", "NodeSocketColor"),
+         sock("Color", "OUTPUT", "NodeSocketColor"), sock("Alpha", "OUTPUT")],
+        has_image_nodes=["Image_Texture"], has_uv_nodes=["UV_Map", "UV_Map_001"],
+        placeholder_image_node_names=["Image Texture"],
+        placeholder_images=[{"node_name": "Image Texture", "label": "Base"}],
+    )
+
+
+def evaluate(info, registry, bound=None):
+    """Symbolic value of every Group Output input of *info*."""
+    nodes = {n["var_name"]: n for n in info["nodes"]}
+    incoming = {(lnk["to_var"], lnk["to_socket_index"]): lnk for lnk in info["links"]}
+    cache = {}
+
+    def inp(var, idx):
+        lnk = incoming.get((var, idx))
+        if lnk is not None:
+            return out(lnk["from_var"], lnk["from_socket_index"])
+        return ("default", repr(nodes[var].get("input_defaults", {}).get(idx)))
+
+    def out(var, idx):
+        key = (var, idx)
+        if key not in cache:
+            n = nodes[var]
+            args = tuple(inp(var, i) for i in range(len(n["input_socket_names"])))
+            if n["type"] == "GROUP_INPUT":
+                cache[key] = bound[idx] if bound is not None else ("input", idx)
+            elif n["type"] == "GROUP":
+                cache[key] = evaluate(registry[n["node_tree_name"]], registry, args)[idx]
+            else:
+                cache[key] = (n["type"], repr(sorted(n["attributes"].items())), idx, args)
+        return cache[key]
+
+    gout = next(n for n in info["nodes"] if n["type"] == "GROUP_OUTPUT")
+    return [inp(gout["var_name"], i) for i in range(len(gout["input_socket_names"]) - 1)]
+
+
+def main():
+    flat = _load("flattener")
+    cg = _load("code_gen")
+    failures = []
+
+    def check(label, cond):
+        print(f"  [{'PASS' if cond else 'FAIL'}] {label}")
+        if not cond:
+            failures.append(label)
+
+    resolver = build_resolver()
+
+    print("1. Split plan")
+    plan = flat.plan_split(resolver, "Resolver__core", hoist_uv=True)
+    check("Resolver is split", plan is not None)
+    check("both UV Maps, Mapping and the placeholder are hoisted",
+          plan.hoisted_vars == {"UV_Map", "UV_Map_001", "Mapping", "Image_Texture"})
+    check("the core reads the chain's UV Map through an extra input",
+          [i["socket_type"] for i in plan.core["interface"][-1:]] == ["NodeSocketVector"])
+    plain = flat.plan_split(resolver, "Resolver__core")
+    check("without hoist_uv the chain's UV Map stays in the core",
+          "UV_Map_001" not in plain.hoisted_vars
+          and [n["var_name"] for n in plain.core["nodes"] if n["type"] == "UVMAP"]
+          == ["UV_Map_001"])
+
+    print("2. Wrapper")
+    wrapper = flat.wrap_split(resolver, plan)
+    kinds = sorted(n["type"] for n in wrapper["nodes"])
+    check("wrapper holds the ends, the hoisted nodes and one group node",
+          kinds == sorted(["GROUP_INPUT", "GROUP_OUTPUT", "GROUP",
+                           "UVMAP", "UVMAP", "MAPPING", "TEX_IMAGE"]))
+    check("its group node points at the core", wrapper["nested_groups"] == ["Resolver__core"])
+    check("interface unchanged", wrapper["interface"] == resolver["interface"])
+    check("placeholder exposed by the wrapper",
+          [p["label"] for p in wrapper["placeholder_images"]] == ["Base"]
+          and wrapper["placeholder_image_node_names"] == ["Image Texture"])
+    check("UV Map field kept on the wrapper", len(wrapper["has_uv_nodes"]) == 2)
+    check("core has no image or UV node",
+          plan.core["has_image_nodes"] == [] and plan.core["has_uv_nodes"] == [])
+    check("input info not mutated", len(resolver["nodes"]) == 15)
+
+    print("3. Equivalence")
+    registry = {"Resolver__core": plan.core}
+    check("wrapper + core match the group",
+          evaluate(wrapper, registry) == evaluate(resolver, {}))
+
+    print("4. Nothing to share")
+    bare = mk_info("Bare", [
+        mk_node("UV_Map", "UVMAP", outs=["UV"], types=["VECTOR"]),
+        mk_node("Group_Output", "GROUP_OUTPUT", ins=["UV", ""], bl_idname="NodeGroupOutput"),
+    ], [link("UV_Map", "UV", 0, "Group_Output", "UV", 0)],
+        [sock("UV", "OUTPUT", "NodeSocketVector")], has_uv_nodes=["UV_Map"])
+    check("a group of hoisted nodes only is left as it is",
+          flat.plan_split(bare, "Bare__core", hoist_uv=True) is None)
+
+    print("5. Codegen")
+    compiled = {"Resolver__core": ("ShaderNodeCompiled_Resolver__core",
+                                   ".lscherry.Resolver__core")}
+    sizes = {}
+    for label, info, cls in (
+        ("core", dict(plan.core, bl_label="lscherry.Resolver__core"),
+         "ShaderNodeCompiled_Resolver__core"),
+        ("wrapper", wrapper, "ShaderNodeCompiled_Resolver"),
+        ("whole", resolver, "ShaderNodeCompiled_Resolver"),
+    ):
+        code = cg.generate_class(info, cls, "...node", compiled)
+        sizes[label] = code.count(".nodes.new(")
+        try:
+            compile(code, label, "exec")
+            ok = True
+        except SyntaxError:
+            ok = False
+        check(f"{label} compiles", ok)
+    wrapper_code = cg.generate_class(wrapper, "ShaderNodeCompiled_Resolver", "...node", compiled)
+    check("wrapper builds the core by its key", "lscherry.Resolver__core" in wrapper_code)
+    check("wrapper still sets images and UV maps per instance",
+          "self.applyInstanceValues(context, {'Body__Image_Texture': 'image_texture'}, "
+          "('Body__UV_Map', 'Body__UV_Map_001'))" in wrapper_code)
+    print(f"    nodes per instance copy: whole {sizes['whole']}, wrapper {sizes['wrapper']}")
+    check("an instance copy is less than half the tree", sizes["wrapper"] * 2 < sizes["whole"])
+
+    print()
+    if failures:
+        print(f"FAILED ({len(failures)}): " + "; ".join(failures))
+        sys.exit(1)
+    print("All instance wrapper checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Standalone verification for node-tree hashing.
+
+nodes/geometry/hashing.py imports no `bpy`, so plain fakes stand in for node
+trees. Checks:
+
+  1. Digests are frozen: the values below were produced by the original
+     (un-memoized) hash_node_tree, so geometry/hashes.json stays valid.
+  2. hash_node_tree == md5(json.dumps(serialize_node_tree(nt), sort_keys=True)).
+  3. With a shared memo, a child nested under several parents is serialised
+     once; the plain recursive serialize_node_tree walks it once per parent.
+  4. Cycles hash the same with and without a memo and are never memoized.
+  5. Nodes exposing bl_rna are read through a per-bl_idname property plan
+     that selects exactly what the dir()-based walk used to.
+
+Run:  python playground/test_node_hashing.py
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_HASHING = os.path.normpath(os.path.join(_HERE, "..", "src", "nodes", "geometry", "hashing.py"))
+
+
+def _load_hashing():
+    spec = importlib.util.spec_from_file_location("hashing", _HASHING)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+# ---------------------------------------------------------------------------
+# Fakes
+# ---------------------------------------------------------------------------
+
+class FakeSocket:
+    def __init__(self, name, default_value=None):
+        self.name = name
+        self.default_value = default_value
+
+
+class FakeNode:
+    def __init__(self, name, bl_idname, inputs=(), node_tree=None, **props):
+        self.name = name
+        self.bl_idname = bl_idname
+        self.location = (10.0 * len(name), -3.14159)
+        self.select = True
+        self.inputs = [FakeSocket(n, v) for n, v in inputs]
+        self.node_tree = node_tree
+        for k, v in props.items():
+            setattr(self, k, v)
+
+
+class FakeLink:
+    def __init__(self, from_node, from_socket, to_node, to_socket):
+        self.from_node = from_node
+        self.from_socket = FakeSocket(from_socket)
+        self.to_node = to_node
+        self.to_socket = FakeSocket(to_socket)
+
+
+class FakeTree:
+    def __init__(self, nodes, links=()):
+        self.nodes = nodes
+        self.links = list(links)
+
+
+class FakeProp:
+    def __init__(self, identifier, type, is_array=False, is_enum_flag=False):
+        self.identifier = identifier
+        self.type = type
+        self.is_array = is_array
+        self.is_enum_flag = is_enum_flag
+
+
+class FakeRNA:
+    def __init__(self, props):
+        self.properties = props
+
+
+class FakeRNANode:
+    """Shaped like a bpy node: RNA-declared props plus plain class attributes."""
+    bl_idname = "ShaderNodeFakeRNA"
+    bl_icon = "NONE"
+    _PREFIX = "."
+    bl_rna = FakeRNA([
+        FakeProp("name", "STRING"),
+        FakeProp("bl_idname", "STRING"),
+        FakeProp("bl_icon", "ENUM"),
+        FakeProp("data_type", "ENUM"),
+        FakeProp("flags", "ENUM", is_enum_flag=True),
+        FakeProp("clamp", "BOOLEAN"),
+        FakeProp("steps", "INT"),
+        FakeProp("select", "BOOLEAN"),
+        FakeProp("location", "FLOAT", is_array=True),
+        FakeProp("color", "FLOAT", is_array=True),
+        FakeProp("inputs", "COLLECTION"),
+        FakeProp("node_tree", "POINTER"),
+        FakeProp("broken", "INT"),
+    ])
+
+    def __init__(self, name, steps):
+        self.name = name
+        self.data_type = "FLOAT"
+        self.flags = {"A"}
+        self.clamp = True
+        self.steps = steps
+        self.select = False
+        self.location = (0.0, 0.0)
+        self.color = (1.0, 1.0, 1.0)
+        self.inputs = []
+        self.node_tree = None
+
+    @property
+    def broken(self):
+        raise RuntimeError("unreadable")
+
+    def draw_label(self):
+        return "Fake"
+
+
+def _legacy_scalar_props(node):
+    """The dir()-based walk _scalar_props used for every node before plans."""
+    props = {}
+    for attr in dir(node):
+        if attr.startswith("_") or attr in ("select", "dimensions", "width", "height",
+                                            "width_hidden", "location", "location_absolute"):
+            continue
+        try:
+            val = getattr(node, attr)
+        except Exception:
+            continue
+        if isinstance(val, (int, float, str, bool)):
+            props[attr] = val
+    return props
+
+
+def _ramp():
+    a = FakeNode("Map Range", "ShaderNodeMapRange", [("Value", 0.5), ("From Min", 0.0)],
+                 data_type="FLOAT", clamp=True)
+    b = FakeNode("Color Ramp", "ShaderNodeValToRGB", [("Fac", 0.25)])
+    return FakeTree([b, a], [FakeLink(a, "Result", b, "Fac")])
+
+
+def _starter(ramp, tint):
+    g = FakeNode("Group", "ShaderNodeGroup", node_tree=ramp)
+    m = FakeNode("Mix", "ShaderNodeMix", [("Factor", tint), ("A", (1.0, 0.5, 0.25, 1.0))],
+                 blend_type="MULTIPLY")
+    return FakeTree([m, g], [FakeLink(g, "Color", m, "A")])
+
+
+# Produced by the pre-memoization hash_node_tree on the trees built below.
+_FROZEN = {
+    "ramp":     "ab7cef5338865535826a49447aed1636",
+    "starter":  "61536254663ec4a174696c0088373254",
+    "wrapper":  "8bc1a7c46fca9ab35e69746e06020a98",
+    "cycle":    "5df4eb4007e13e9acb29a3573f7d4dde",
+}
+
+
+def _trees():
+    ramp = _ramp()
+    starters = [_starter(ramp, 0.1 * i) for i in range(5)]
+    wrapper = FakeTree([FakeNode(f"S{i}", "ShaderNodeGroup", node_tree=t)
+                        for i, t in enumerate(starters)])
+    loop_a = FakeTree([])
+    loop_b = FakeTree([FakeNode("Back", "ShaderNodeGroup", node_tree=loop_a)])
+    loop_a.nodes.append(FakeNode("Into", "ShaderNodeGroup", node_tree=loop_b))
+    return ramp, starters, wrapper, loop_a
+
+
+def main():
+    h = _load_hashing()
+    failures = []
+
+    # Count node serialisations by wrapping the per-node serialiser.
+    serialised = [0]
+    node_entry = h._node_entry
+
+    def counting_entry(node):
+        serialised[0] += 1
+        return node_entry(node)
+
+    h._node_entry = counting_entry
+
+    def check(label, cond):
+        print(f"  [{'PASS' if cond else 'FAIL'}] {label}")
+        if not cond:
+            failures.append(label)
+
+    ramp, starters, wrapper, loop = _trees()
+
+    print("Frozen digests")
+    check("ramp", h.hash_node_tree(ramp) == _FROZEN["ramp"])
+    check("starter", h.hash_node_tree(starters[1]) == _FROZEN["starter"])
+    check("wrapper", h.hash_node_tree(wrapper) == _FROZEN["wrapper"])
+    check("cycle", h.hash_node_tree(loop) == _FROZEN["cycle"])
+
+    print("Serialisation equivalence")
+    for label, tree in (("ramp", ramp), ("wrapper", wrapper), ("cycle", loop)):
+        ref = hashlib.md5(json.dumps(h.serialize_node_tree(tree), sort_keys=True)
+                          .encode("utf-8")).hexdigest()
+        check(f"{label} matches serialize_node_tree", h.hash_node_tree(tree) == ref)
+
+    print("Memo")
+    serialised[0] = 0
+    h.serialize_node_tree(wrapper)
+    unmemoized = serialised[0]
+    serialised[0] = 0
+    memo = {}
+    digests = [h.hash_node_tree(t, memo) for t in starters]
+    h.hash_node_tree(wrapper, memo)
+    check("shared child serialised once", serialised[0] == 2 + 3 * len(starters))
+    check("memo cheaper than re-serialising", serialised[0] < unmemoized)
+    check("memoized digests unchanged",
+          digests == [h.hash_node_tree(t) for t in starters]
+          and h.hash_node_tree(wrapper, memo) == _FROZEN["wrapper"])
+    h.drop_from_memo(memo, ramp)
+    serialised[0] = 0
+    h.hash_node_tree(ramp, memo)
+    check("dropped tree is re-serialised", serialised[0] == 2)
+
+    print("Cycles")
+    memo = {}
+    check("cycle hash stable with a memo", h.hash_node_tree(loop, memo) == _FROZEN["cycle"])
+    check("cyclic trees not memoized", memo == {})
+
+    print("Property plan")
+    a, b = FakeRNANode("A", 3), FakeRNANode("B", 7)
+    check("plan props match the dir() walk", h._scalar_props(a) == _legacy_scalar_props(a))
+    check("values are per node", h._scalar_props(b)["steps"] == 7)
+    check("plan computed once per bl_idname", h._prop_plan(a) is h._prop_plan(b))
+    plan = h._prop_plan(a)
+    check("plan holds no arrays, pointers, flags or volatile names",
+          not {"location", "color", "inputs", "node_tree", "flags", "select"} & set(plan))
+    check("fakes without bl_rna use the dir() walk", h._prop_plan(ramp.nodes[0]) is None)
+    FakeRNANode.grafted = 2.5       # a lazy stub gaining its real class's attributes
+    check("a grafted attribute is missed by the cached plan", "grafted" not in h._prop_plan(a))
+    h.drop_prop_plan(a.bl_idname)
+    check("dropping the plan picks it up", "grafted" in h._prop_plan(a))
+    del FakeRNANode.grafted
+    h.drop_prop_plan(a.bl_idname)
+
+    print()
+    if failures:
+        print(f"FAILED ({len(failures)}): " + "; ".join(failures))
+        sys.exit(1)
+    print("All node hashing checks passed.")
+
+
+if __name__ == "__main__":
+    main()
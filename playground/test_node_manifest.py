@@ -0,0 +1,172 @@
+"""
+Standalone verification for the compiled node-class manifest.
+
+nodes/manifest.py imports no `bpy`, so we can round-trip a manifest against a
+throwaway folder of fake compiled modules and assert the staleness rules
+NodeLib relies on:
+
+  1. A written manifest reads back entry-for-entry, tree hash included.
+  2. A file whose mtime moved but whose content is unchanged is still current.
+  3. A file whose content changed is stale.
+  4. A manifest of another version is treated as absent.
+  5. file_stamps() records a moved mtime; with those stamps is_current()
+     accepts the file without hashing it, and they round-trip through the
+     side file.
+  6. scan_sources() reads class identity and declared properties from the
+     sources, skips non-node files and keeps tree hashes of unchanged modules.
+
+Run:  python playground/test_node_manifest.py
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_MANIFEST = os.path.normpath(os.path.join(_HERE, "..", "src", "nodes", "manifest.py"))
+
+
+def _load_manifest():
+    spec = importlib.util.spec_from_file_location("manifest", _MANIFEST)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def main():
+    mf = _load_manifest()
+    failures = []
+
+    def check(label, cond):
+        print(f"  [{'PASS' if cond else 'FAIL'}] {label}")
+        if not cond:
+            failures.append(label)
+
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, "lscherry", "core"))
+        rel = "lscherry/core/toon.py"
+        path = os.path.join(root, "lscherry", "core", "toon.py")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("class ShaderNodeCompiled_Toon: pass\n")
+
+        entry = mf.make_entry(root, rel, "ShaderNodeCompiled_Toon",
+                              "lscherry.core.Toon", "ShaderNodeCompiled_Toon")
+        manifest_path = os.path.join(root, mf.MANIFEST_NAME)
+        mf.write_manifest(manifest_path, [entry])
+
+        print("Round trip")
+        back = mf.read_manifest(manifest_path)
+        check("one entry read back", back is not None and len(back) == 1)
+        check("entry identical", back is not None and back[0] == entry)
+        check("tree hash defaults to empty", entry.tree_hash == "")
+
+        hashed = mf.make_entry(root, rel, "ShaderNodeCompiled_Toon",
+                               "lscherry.core.Toon", "ShaderNodeCompiled_Toon",
+                               "0123456789abcdef0123456789abcdef")
+        mf.write_manifest(manifest_path, [hashed])
+        back = mf.read_manifest(manifest_path)
+        check("tree hash read back",
+              back is not None and back[0].tree_hash == hashed.tree_hash)
+
+        print("Staleness")
+        check("untouched file is current", mf.is_current(entry, path))
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        check("touched but identical file is current", mf.is_current(entry, path))
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("class ShaderNodeCompiled_Too: pass\n")  # same size, new content
+        check("edited file is stale", not mf.is_current(entry, path))
+        check("missing file is stale",
+              not mf.is_current(entry, os.path.join(root, "nope.py")))
+
+        print("Version gate")
+        with open(manifest_path, "w", encoding="utf-8") as fh:
+            json.dump({"version": mf.MANIFEST_VERSION + 1, "classes": []}, fh)
+        check("other version reads as absent", mf.read_manifest(manifest_path) is None)
+        check("absent manifest reads as None",
+              mf.read_manifest(os.path.join(root, "missing.json")) is None)
+
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, "lscherry", "core"))
+        rel = "lscherry/core/toon.py"
+        path = os.path.join(root, "lscherry", "core", "toon.py")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(
+                "from ...node import ShaderNode\n\n\n"
+                "class ShaderNodeCompiled_Toon(ShaderNode):\n"
+                "    bl_idname = 'ShaderNodeCompiled_Toon'\n"
+                "    bl_label = 'lscherry.core.Toon'\n\n"
+                "    image_texture: bpy.props.PointerProperty(\n"
+                "        name='Base Texture',\n"
+                "        type=bpy.types.Image,\n"
+                "        update=lambda self, ctx: self.valuesUpdate(ctx),\n"
+                "    )  # type: ignore\n\n"
+                "    def init(self, context):\n"
+                "        pass\n"
+            )
+        with open(os.path.join(root, "lscherry", "__init__.py"), "w") as fh:
+            fh.write("")
+
+        print("Install stamps")
+        entry = mf.make_entry(root, rel, "ShaderNodeCompiled_Toon",
+                              "lscherry.core.Toon", "ShaderNodeCompiled_Toon")
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        stamps = mf.file_stamps([entry], root)
+        check("moved mtime recorded with size and sha1",
+              stamps == {rel: [st.st_size, os.stat(path).st_mtime_ns, entry.sha1]})
+        hashed = []
+        real_digest = mf.file_digest
+        mf.file_digest = lambda p: hashed.append(p) or real_digest(p)
+        try:
+            check("stamped file accepted without hashing",
+                  mf.is_current(entry, path, stamps) and not hashed)
+        finally:
+            mf.file_digest = real_digest
+        stamps_path = os.path.join(root, mf.STAMPS_NAME)
+        mf.write_stamps(stamps_path, stamps)
+        check("stamps round-trip", mf.read_stamps(stamps_path) == stamps)
+        check("missing stamps read as empty",
+              mf.read_stamps(os.path.join(root, "nope.json")) == {})
+
+        print("Source scan")
+        scanned = mf.scan_sources(root)
+        check("one class read from source, __init__ skipped",
+              [(e.module, e.bl_idname, e.bl_label, e.class_name) for e in scanned]
+              == [(rel, "ShaderNodeCompiled_Toon", "lscherry.core.Toon", "ShaderNodeCompiled_Toon")])
+        check("file state stamped", scanned[0].sha1 == mf.file_digest(path))
+        check("declared properties recorded",
+              scanned[0].props == ({"attr": "image_texture", "prop": "PointerProperty",
+                                    "type": "Image", "update": True,
+                                    "options": {"name": "Base Texture"}},))
+        mf.write_manifest(os.path.join(root, mf.MANIFEST_NAME), scanned)
+        check("properties read back",
+              mf.read_manifest(os.path.join(root, mf.MANIFEST_NAME)) == scanned)
+        mf.write_manifest(os.path.join(root, mf.MANIFEST_NAME),
+                          [scanned[0]._replace(tree_hash="feed")])
+        check("tree hash of an unchanged module kept",
+              mf.scan_sources(root)[0].tree_hash == "feed")
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write("# edited\n")
+        check("tree hash of an edited module dropped",
+              mf.scan_sources(root)[0].tree_hash == "")
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write("\n\nclass ShaderNodeCompiled_Odd(ShaderNode):\n"
+                     "    bl_idname = 'ShaderNodeCompiled_Odd'\n"
+                     "    bl_label = 'lscherry.core.Odd'\n"
+                     "    scale: bpy.props.FloatProperty(default=SCALE)  # type: ignore\n")
+        odd = [e for e in mf.scan_sources(root) if e.class_name == "ShaderNodeCompiled_Odd"]
+        check("a property the manifest cannot restate leaves props unknown",
+              len(odd) == 1 and odd[0].props is None)
+
+    print()
+    if failures:
+        print(f"FAILED ({len(failures)}): " + "; ".join(failures))
+        sys.exit(1)
+    print("All node manifest checks passed.")
+
+
+if __name__ == "__main__":
+    main()
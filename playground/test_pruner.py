@@ -0,0 +1,195 @@
+"""
+Standalone verification for the NodeCompiler's dead-node pruner.
+
+pruner.py imports no `bpy`, so it can be driven with hand-built `info` dicts
+(the same shape analyzer.analyze_node_group produces):
+
+  1. Nodes with no path to the Group Output are removed, with their links;
+     the live chain is untouched.
+  2. Placeholder TEX_IMAGE and UV Map nodes (and what feeds them) are kept
+     even when nothing reads them.
+  3. A live zone keeps both halves; a dead zone goes as a whole.
+  4. Packaged textures only a removed node used are dropped.
+  5. A group with nothing dead comes back as the same object, and the input
+     info is never mutated.
+  6. The pruned info still generates compilable code.
+
+Run:  python playground/test_pruner.py
+"""
+
+import copy
+import importlib.util
+import os
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_COMPILER = os.path.normpath(os.path.join(
+    _HERE, "..", "src", "features", "node_compiler", "compiler"
+))
+
+
+def _load(mod_name):
+    path = os.path.join(_COMPILER, mod_name + ".py")
+    spec = importlib.util.spec_from_file_location(mod_name, path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def mk_node(var, type_="MATH", ins=("Value",), outs=("Value",), **over):
+    node = {
+        "var_name": var,
+        "name": var,
+        "type": type_,
+        "bl_idname": "ShaderNodeMath",
+        "location": (0.0, 0.0),
+        "width": 140.0,
+        "label": "",
+        "hide": False,
+        "attributes": {},
+        "input_defaults": {},
+        "output_defaults": {},
+        "input_socket_names": list(ins),
+        "output_socket_names": list(outs),
+        "node_tree_name": None,
+        "repeat_items": [],
+        "color_ramp": None,
+        "curve_mapping": None,
+        "enum_items": [],
+        "index_switch_count": None,
+        "active_index": None,
+    }
+    node.update(over)
+    return node
+
+
+def link(fv, tv, fi=0, ti=0):
+    return {
+        "from_var": fv, "from_socket_name": "Value", "from_socket_index": fi,
+        "to_var": tv, "to_socket_name": "Value", "to_socket_index": ti,
+    }
+
+
+def mk_info(nodes, links, **over):
+    info = {
+        "name": "Test",
+        "type": "SHADER",
+        "bl_label": "lscherry.test.Test",
+        "color_tag": "NONE",
+        "description": "",
+        "interface": [],
+        "nodes": nodes,
+        "links": links,
+        "zone_pairs": [],
+        "has_image_nodes": [],
+        "has_uv_nodes": [],
+        "nested_groups": [],
+        "placeholder_image_node_names": [],
+        "placeholder_images": [],
+        "_predefined_images": [],
+    }
+    info.update(over)
+    return info
+
+
+def main():
+    pruner = _load("pruner")
+    cg = _load("code_gen")
+    failures = []
+
+    def check(label, cond):
+        print(f"  [{'PASS' if cond else 'FAIL'}] {label}")
+        if not cond:
+            failures.append(label)
+
+    def vars_of(info):
+        return [n["var_name"] for n in info["nodes"]]
+
+    # Group Input → Live → Group Output, plus a dead Debug chain hanging off
+    # Live, a floating Value node, a dead textured node and the exposed nodes.
+    nodes = [
+        mk_node("Group_Input", "GROUP_INPUT", ins=(), outs=("In", "")),
+        mk_node("Live"),
+        mk_node("Debug"),
+        mk_node("Debug_001"),
+        mk_node("Value", "VALUE", ins=()),
+        mk_node("Mapping", "MAPPING", outs=("Vector",)),
+        mk_node("Image_Texture", "TEX_IMAGE", outs=("Color", "Alpha")),
+        mk_node("UV_Map", "UVMAP", ins=(), outs=("UV",)),
+        mk_node("Baked", "TEX_IMAGE", outs=("Color", "Alpha"), image_name="baked.png"),
+        mk_node("Repeat_Input", "REPEAT_INPUT"),
+        mk_node("Repeat_Output", "REPEAT_OUTPUT"),
+        mk_node("Dead_Input", "REPEAT_INPUT"),
+        mk_node("Dead_Output", "REPEAT_OUTPUT"),
+        mk_node("Group_Output", "GROUP_OUTPUT", ins=("Out", "Zone", ""), outs=()),
+    ]
+    links = [
+        link("Group_Input", "Live"),
+        link("Live", "Group_Output"),
+        link("Live", "Debug"),
+        link("Debug", "Debug_001"),
+        link("Mapping", "Image_Texture"),
+        link("Repeat_Output", "Group_Output", ti=1),
+        link("Dead_Input", "Dead_Output"),
+        link("Live", "Dead_Input"),
+    ]
+    info = mk_info(
+        nodes, links,
+        zone_pairs=[("Repeat_Input", "Repeat_Output"), ("Dead_Input", "Dead_Output")],
+        has_image_nodes=["Image_Texture"],
+        has_uv_nodes=["UV_Map"],
+        placeholder_image_node_names=["Image_Texture"],
+        placeholder_images=[{"node_name": "Image_Texture", "label": "Base"}],
+        _predefined_images=[("baked.png", object())],
+    )
+    before = copy.deepcopy({k: v for k, v in info.items() if k != "_predefined_images"})
+
+    pruned, removed = pruner.prune_dead_nodes(info)
+    kept = vars_of(pruned)
+
+    print("1. Unreachable nodes and their links are removed")
+    check("debug chain removed", "Debug" not in kept and "Debug_001" not in kept)
+    check("floating Value removed", "Value" not in kept)
+    check("live chain kept", {"Group_Input", "Live", "Group_Output"} <= set(kept))
+    check("removed count reported", removed == 6)
+    check("node order preserved", kept == [v for v in vars_of(info) if v in kept])
+    check("no link touches a removed node",
+          all(l["from_var"] in kept and l["to_var"] in kept for l in pruned["links"]))
+    check("dead links dropped, live ones kept", len(pruned["links"]) == 4)
+
+    print("2. UI-exposed nodes are roots")
+    check("placeholder TEX_IMAGE kept", "Image_Texture" in kept)
+    check("its Mapping input kept", "Mapping" in kept)
+    check("UV Map kept", "UV_Map" in kept)
+    check("placeholder bookkeeping untouched",
+          pruned["has_image_nodes"] == ["Image_Texture"] and pruned["has_uv_nodes"] == ["UV_Map"])
+
+    print("3. Zones")
+    check("live zone keeps its unlinked input half", "Repeat_Input" in kept)
+    check("dead zone removed whole", "Dead_Input" not in kept and "Dead_Output" not in kept)
+    check("zone pairs follow", pruned["zone_pairs"] == [("Repeat_Input", "Repeat_Output")])
+
+    print("4. Packaged textures")
+    check("unused baked texture removed", "Baked" not in kept)
+    check("its image is not exported", pruned["_predefined_images"] == [])
+
+    print("5. Nothing to prune / no mutation")
+    check("input info not mutated",
+          {k: v for k, v in info.items() if k != "_predefined_images"} == before
+          and len(info["_predefined_images"]) == 1)
+    again, n = pruner.prune_dead_nodes(pruned)
+    check("already-pruned info returned as is", again is pruned and n == 0)
+
+    print("6. Pruned info still generates code")
+    compile(cg.generate_class(pruned, "ShaderNodeCompiled_Test"), "pruned", "exec")
+    check("generated class compiles", True)
+
+    print()
+    if failures:
+        print(f"FAILED ({len(failures)}): " + "; ".join(failures))
+        sys.exit(1)
+    print("All pruner checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,9 +37,9 @@ from .features.node_compiler.properties import NodeCompilerProperties
 from .features.node_compiler.operators import LSPOTATO_OT_compile_node_groups
 
 # Import Node Library
-from .nodes.node_info import ng_register, ng_unregister, register_restore_handler, unregister_restore_handler
+from .nodes.node_info import ng_register, ng_unregister
 from .nodes.node_impl import NodeLib
-from .nodes.node import register_node_class, clear_node_registry
+from .nodes.node import register_node_class, clear_node_registry, iter_registered_node_classes
 from .nodes.geometry.loader import register_geometry_handler, unregister_geometry_handler
 from .nodes.refresh import register_reconcile_handler, unregister_reconcile_handler
 
@@ -91,9 +91,15 @@ def _register_node_library():
     """Register the enabled compiled node classes and the Add Shader menu.
 
     Starter-pack nodes are gated by the addon preferences — only packs the user
-    enabled are registered and surfaced in the menu.
+    enabled are registered and surfaced in the menu. The filter runs before any
+    module is loaded, so disabled packs are never executed when the node
+    manifest is current. With Lazy Node Loading on, the registered classes are
+    stubs whose module only runs on first use.
     """
-    enabled_classes = filter_enabled_node_classes(NodeLib.get_node_classes())
+    NodeLib.refresh()
+    enabled_classes = NodeLib.get_node_classes(
+        select=filter_enabled_node_classes, lazy=_is_lazy_mode()
+    )
     for cls in enabled_classes:
         # Record every class by stable key so nested groups resolve even if the
         # Blender registration below fails for this class.
@@ -110,12 +116,13 @@ def _register_node_library():
 def _unregister_node_library():
     """Tear down the Add Shader menu and every compiled node class.
 
-    Iterates the *full* class set (not the enabled subset) so classes registered
-    under a previous preference selection are always cleaned up.
+    Iterates the class registry, which holds exactly the classes the last
+    _register_node_library() recorded (whatever the preference selection was
+    then), so nothing has to be rescanned or re-executed just to tear down.
     """
     ng_unregister()
 
-    for cls in reversed(NodeLib.get_node_classes()):
+    for _key, cls in reversed(iter_registered_node_classes()):
         try:
             bpy.utils.unregister_class(cls)
         except Exception:
@@ -145,6 +152,15 @@ def _is_dev_mode():
         return False
 
 
+def _is_lazy_mode():
+    """True when the addon-preferences Lazy Node Loading toggle is on."""
+    try:
+        addon = bpy.context.preferences.addons.get(__package__)
+        return bool(addon and addon.preferences.lazy_node_loading)
+    except Exception:
+        return False
+
+
 def register():
     for cls in rgt_classes:
         bpy.utils.register_class(cls)
@@ -279,12 +295,9 @@ def register():
             "Dev Mode enabled — skipping shader node init and geometry verify handlers."
         )
     else:
-        # Handler that restores NodeUndefined entries when loading a file
-        register_restore_handler()
-
-        # Handler that refreshes stale shader node trees (saved by an older addon
-        # version) to the current definition whenever a file is opened. Runs after
-        # the restore handler so freshly-restored nodes are reconciled too.
+        # Single load handler for shader nodes: restores NodeUndefined entries,
+        # then refreshes stale node trees (saved by an older addon version) to
+        # the current definition, over one shared index of the file's trees.
         register_reconcile_handler()
 
         # Handler that appends the geometry node library whenever a file is opened
@@ -329,7 +342,6 @@ def unregister():
     # Unregister nodes
     unregister_geometry_handler()
     unregister_reconcile_handler()
-    unregister_restore_handler()
     _unregister_node_library()
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import bpy  # type: ignore
+import functools
 import logging
 import os
 
@@ -44,11 +45,13 @@ def get_addon_prefs(context=None):
 _STARTER_LABEL_PREFIX = "lscherry.starters."
 
 
+@functools.lru_cache(maxsize=None)
 def _starter_pack_id(bl_label):
     """Return the starter-pack id encoded in a node's bl_label, or None.
 
     e.g. 'lscherry.starters.strinova.Face' -> 'strinova'.
-    Non-starter labels return None (they are never gated).
+    Non-starter labels return None (they are never gated). Memoized: the label
+    set is fixed for the session and every starter toggle re-filters all of it.
     """
     if not bl_label:
         return None
@@ -87,6 +90,11 @@ def _on_starter_toggle(self, context):
         )
 
 
+def _on_lazy_toggle(self, context):
+    """Re-register the node library as real classes or lazy stubs."""
+    _on_starter_toggle(self, context)
+
+
 def _update_debug_mode(self, context):
     from ..utils.logger import LSPotatoLogger
     level = logging.DEBUG if self.debug_mode else logging.INFO
@@ -113,6 +121,17 @@ class LSPotatoAddonPreferences(bpy.types.AddonPreferences):
         update=_update_debug_mode,
     )  # type: ignore
 
+    lazy_node_loading: bpy.props.BoolProperty(
+        name="Lazy Node Loading",
+        description=(
+            "Register lightweight node stubs from the node manifest and load each "
+            "compiled node's code only the first time it is added or built. "
+            "Speeds up add-on startup; needs a compiled node manifest"
+        ),
+        default=False,
+        update=_on_lazy_toggle,
+    )  # type: ignore
+
     starter_packs_expanded: bpy.props.BoolProperty(
         name="Starter Packs",
         description="Expand or collapse the Starter Packs section",
@@ -139,6 +158,7 @@ class LSPotatoAddonPreferences(bpy.types.AddonPreferences):
         row = layout.row()
         row.prop(self, "dev_mode")
         row.prop(self, "debug_mode")
+        layout.prop(self, "lazy_node_loading")
 
         layout.separator()
 
@@ -9,7 +9,7 @@ Inlines: Reroute nodes (NodeReroute) — links are resolved through them
 
 import os
 import bpy  # type: ignore
-from .reroute_resolver import resolve_from_socket, get_socket_index
+from .reroute_resolver import LinkIndex
 from .node_attrs import get_serialisable_attrs
 
 # Map Blender image file_format → file extension for saved/predefined textures.
@@ -40,10 +40,14 @@ _ZONE_OUTPUT_TYPES = {'GeometryNodeRepeatOutput', 'GeometryNodeSimulationOutput'
 # Public API
 # ---------------------------------------------------------------------------
 
-def analyze_node_group(ng: bpy.types.NodeTree) -> dict:
+def analyze_node_group(ng: bpy.types.NodeTree, nested_groups: list[str] | None = None) -> dict:
     """
     Return a NodeGroupInfo dict for *ng*.
 
+    *nested_groups* is the group's distinct GROUP node_tree names in node order
+    when the caller already has them (sorter.scan_nested_groups()); otherwise
+    they are collected while walking the nodes.
+
     Keys
     ----
     name, type, color_tag, description,
@@ -66,7 +70,7 @@ def analyze_node_group(ng: bpy.types.NodeTree) -> dict:
         "zone_pairs":      [],
         "has_image_nodes": [],          # placeholder TEX_IMAGE var_names (user input)
         "has_uv_nodes":    [],
-        "nested_groups":   [],
+        "nested_groups":   list(nested_groups) if nested_groups is not None else [],
         "placeholder_image_node_names": [],  # node.name of empty TEX_IMAGE nodes
         # One entry per empty TEX_IMAGE node: {node_name, label}. The node label
         # (distinct per slot in the source group) becomes a dedicated image input
@@ -111,7 +115,7 @@ def analyze_node_group(ng: bpy.types.NodeTree) -> dict:
                 })
         if node.type == 'UVMAP':
             info["has_uv_nodes"].append(var_name)
-        if node.type == 'GROUP' and node.node_tree:
+        if nested_groups is None and node.type == 'GROUP' and node.node_tree:
             if node.node_tree.name not in info["nested_groups"]:
                 info["nested_groups"].append(node.node_tree.name)
 
@@ -123,6 +127,8 @@ def analyze_node_group(ng: bpy.types.NodeTree) -> dict:
                 info["zone_pairs"].append((var_map[node.name], var_map[paired_out.name]))
 
     # --- links (skip Frame, inline Reroute) ---
+    # One pass over ng.links / the sockets instead of socket.links per input.
+    link_index = LinkIndex(ng)
     for node in ng.nodes:
         if node.type in _SKIP_TYPES or node.type == _REROUTE_TYPE:
             continue
@@ -132,7 +138,7 @@ def analyze_node_group(ng: bpy.types.NodeTree) -> dict:
             continue
 
         for inp in node.inputs:
-            from_node, from_socket = resolve_from_socket(inp)
+            from_node, from_socket = link_index.resolve(inp)
             if from_node is None or from_node.type in _SKIP_TYPES:
                 continue
 
@@ -143,10 +149,10 @@ def analyze_node_group(ng: bpy.types.NodeTree) -> dict:
             info["links"].append({
                 "from_var":          from_var,
                 "from_socket_name":  from_socket.name,
-                "from_socket_index": get_socket_index(from_node.outputs, from_socket),
+                "from_socket_index": link_index.socket_index(from_socket),
                 "to_var":            to_var,
                 "to_socket_name":    inp.name,
-                "to_socket_index":   get_socket_index(node.inputs, inp),
+                "to_socket_index":   link_index.socket_index(inp),
             })
 
     return info
@@ -249,6 +255,10 @@ def _analyze_node(node, var_name: str) -> dict:
         # (a name that repeats on one side cannot disambiguate the socket).
         "input_socket_names":  [s.name for s in node.inputs],
         "output_socket_names": [s.name for s in node.outputs],
+        # Socket types, for the interface sockets a hoist split adds and for
+        # the socket conversions the constant folder bakes defaults through
+        "input_socket_types":  [s.type for s in node.inputs],
+        "output_socket_types": [s.type for s in node.outputs],
         "node_tree_name":      node.node_tree.name if node.type == 'GROUP' and node.node_tree else None,
         # Zone-specific
         "repeat_items":        _get_repeat_items(node),
@@ -0,0 +1,179 @@
+"""
+Build manifest (incremental compile).
+
+A full NodeCompiler run re-flattens, re-generates and rewrites every shader
+group. In incremental mode the operator records what it produced in
+``<out_dir>/build_manifest.json`` and, on the next run, only regenerates groups
+whose fingerprint moved:
+
+    fingerprint = sha1( compiler sources digest
+                      + route (subpath, bl_label, class name, filename)
+                      + the group's analyzed info
+                      + the fingerprints of its direct nested groups )
+
+Child fingerprints are folded in, so an edit deep inside a nested group dirties
+every group above it (flattening inlines child content, and GROUP references
+use the child's route) while untouched siblings stay clean. The analyzed info
+is the same data code_gen reads, so a matching fingerprint means the generated
+module would be byte-identical. Editing the compiler itself changes the sources
+digest and dirties everything; so does editing the runtime it emits against
+(nodes/node.py, which builds JSON-format trees, and nodes/manifest.py).
+
+Like nodes/manifest.py this module is intentionally bpy-free, so it can be
+exercised under system Python.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import shutil
+from typing import NamedTuple
+
+BUILD_MANIFEST_NAME = "build_manifest.json"
+
+# Bump whenever the on-disk layout changes; a reader seeing any other version
+# treats the manifest as absent (→ full rebuild).
+BUILD_MANIFEST_VERSION = 1
+
+# Suffix of the tree descriptions the JSON tree format writes next to each
+# module (``<module stem>.tree.json``); swept together with the modules.
+TREE_FILE_SUFFIX = ".tree.json"
+
+
+class BuildRecord(NamedTuple):
+    """What one source node group compiled to on the last run."""
+    fingerprint: str
+    class_name: str
+    bl_label: str
+    subpath: str
+    filename: str
+    sha1: str             # sha1 of the written module
+    tree_hash: str = ""   # canonical tree hash recorded for the class, "" if none
+    tree_sha1: str = ""   # sha1 of the module's tree description (JSON format), "" if none
+
+
+# Runtime modules the generated code depends on, relative to src/nodes.
+_RUNTIME_SOURCES = ("node.py", "manifest.py")
+
+
+def compiler_digest() -> str:
+    """
+    sha1 over the compiler's own sources and the node runtime they emit
+    against; any edit invalidates every fingerprint.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    nodes_dir = os.path.normpath(os.path.join(here, "..", "..", "..", "nodes"))
+    paths = [os.path.join(here, name) for name in sorted(os.listdir(here))
+             if name.endswith(".py")]
+    paths += [os.path.join(nodes_dir, name) for name in _RUNTIME_SOURCES]
+    h = hashlib.sha1()
+    for path in paths:
+        h.update(os.path.relpath(path, nodes_dir).replace(os.sep, "/").encode("utf-8") + b"\0")
+        try:
+            with open(path, "rb") as fh:
+                h.update(fh.read())
+        except OSError:
+            h.update(b"\0missing")
+    return h.hexdigest()
+
+
+def _canonical(value):
+    """JSON-safe, order-stable copy of an analyzed info value."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def group_fingerprint(info: dict, route: tuple, child_fingerprints: list[str],
+                      salt: str = "") -> str:
+    """
+    Fingerprint of one analyzed group (see module docstring).
+
+    ``_predefined_images`` holds bpy.types.Image objects; only their target
+    filenames (already in each node's ``image_name``) take part.
+    """
+    payload = {k: v for k, v in info.items() if k != "_predefined_images"}
+    payload["_predefined_images"] = [fn for fn, _img in info.get("_predefined_images", [])]
+    blob = json.dumps(
+        [salt, list(route), _canonical(payload), list(child_fingerprints)],
+        sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def read_build_manifest(path: str, compiler: str) -> dict[str, BuildRecord]:
+    """
+    Load the records at *path* keyed by source group name.
+
+    Returns an empty dict when the manifest is absent, unreadable, another
+    version, or was written by a different compiler (*compiler* digest).
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if (not isinstance(data, dict)
+            or data.get("version") != BUILD_MANIFEST_VERSION
+            or data.get("compiler") != compiler):
+        return {}
+    try:
+        return {name: BuildRecord(**rec) for name, rec in data.get("groups", {}).items()}
+    except (TypeError, AttributeError):
+        return {}
+
+
+def write_build_manifest(path: str, compiler: str, records: dict[str, BuildRecord]) -> str:
+    """Write *records* (group name → BuildRecord) to *path*. Returns the path."""
+    payload = {
+        "version":  BUILD_MANIFEST_VERSION,
+        "compiler": compiler,
+        "groups":   {name: records[name]._asdict() for name in sorted(records)},
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, indent=2)
+    return path
+
+
+def sweep_orphans(root: str, keep: set[str]) -> list[str]:
+    """
+    Delete every module (and tree description) under *root* that is not in
+    *keep* (absolute paths).
+
+    ``__init__.py`` files are left to write_all_inits(), except in folders left
+    without any kept module, which are removed entirely (bottom-up, together
+    with their __pycache__). Returns the deleted module paths.
+    """
+    root = os.path.normpath(root)
+    keep = {os.path.normpath(p) for p in keep}
+    live_dirs = set()
+    for p in keep:
+        d = os.path.dirname(p)
+        while d.startswith(root) and d not in live_dirs:
+            live_dirs.add(d)
+            d = os.path.dirname(d)
+
+    removed: list[str] = []
+    if not os.path.isdir(root):
+        return removed
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        dirpath = os.path.normpath(dirpath)
+        if os.path.basename(dirpath) == "__pycache__":
+            continue
+        for name in filenames:
+            if not name.endswith((".py", TREE_FILE_SUFFIX)) or name == "__init__.py":
+                continue
+            path = os.path.join(dirpath, name)
+            if path not in keep:
+                os.remove(path)
+                removed.append(path)
+        if dirpath not in live_dirs and dirpath != root:
+            leftovers = set(os.listdir(dirpath)) - {"__init__.py", "__pycache__"}
+            if not leftovers:
+                shutil.rmtree(dirpath)
+    return removed
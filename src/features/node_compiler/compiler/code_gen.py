@@ -3,9 +3,20 @@ Code Generator
 Assembles a complete Python class string from a NodeGroupInfo dict.
 The import path for the base class (ShaderNode / GeometryNode) is
 computed dynamically based on the compiled subfolder depth.
+
+In the JSON tree format the tree itself is not written out as Python:
+generate_tree_data() turns it into a compact description that the shared
+nodes/node.py build_node_tree() applies, and generate_class(tree_file=...)
+writes a stub whose createNodetree() just points the builder at it.
+
+The batched Python format (generate_class(batched=True)) keeps the tree as
+Python but cuts the per-statement RNA lookups: nodes.new / links.new are bound
+once, each node's inputs / outputs collections are fetched once, and socket
+defaults and links are applied from positional tables in two loops.
 """
 
 from __future__ import annotations
+import hashlib
 
 _I1 = "    "    # 4 spaces — class body
 _I2 = "        "  # 8 spaces — method body
@@ -22,6 +33,13 @@ _NG_TYPE_TO_BASE = {
     "COMPOSITING": "CompositorNode",
 }
 
+# Tree description layout written by generate_tree_data(); must match
+# TREE_FORMAT_VERSION in nodes/node.py, which refuses any other version.
+TREE_FORMAT_VERSION = 1
+
+# Blender keeps at most this many UTF-8 bytes of a node name.
+_MAX_NODE_NAME = 63
+
 
 # ---------------------------------------------------------------------------
 # Public
@@ -32,6 +50,8 @@ def generate_class(
     class_name: str,
     import_prefix: str = "...node",
     compiled_nodes: "dict[str, tuple[str, str]]" = {},
+    tree_file: str | None = None,
+    batched: bool = False,
 ) -> str:
     """
     Return the full Python source for one compiled node class.
@@ -45,6 +65,11 @@ def generate_class(
                      used so GROUP-node references inside createNodetree call
                      create_node_group() on the nested compiled class instead of
                      looking up the original blend-file node group by name.
+    tree_file      : JSON tree format — file name of the generate_tree_data()
+                     output next to the module; createNodetree() then builds
+                     from it instead of carrying the tree as Python.
+    batched        : Python format only — emit the batched createNodetree()
+                     (socket defaults and links as tables, see module docstring).
     """
     ng_type = info["type"]
     base    = _NG_TYPE_TO_BASE.get(ng_type, "ShaderNode")
@@ -56,16 +81,19 @@ def generate_class(
 
     # ensure_node_group is only needed when this group embeds a compiled child;
     # load_packaged_image only when a node carries a predefined texture.
-    uses_ensure = any(
+    # The JSON stub only needs the builder, which resolves both itself.
+    uses_ensure = tree_file is None and any(
         n["type"] == "GROUP" and n["node_tree_name"] in compiled_nodes
         for n in info["nodes"]
     )
-    uses_image = any(n.get("image_name") for n in info["nodes"])
+    uses_image = tree_file is None and any(n.get("image_name") for n in info["nodes"])
     _extra = []
     if uses_ensure:
         _extra.append("ensure_node_group")
     if uses_image:
         _extra.append("load_packaged_image")
+    if tree_file is not None:
+        _extra.append("build_node_tree")
     base_import = (
         f"from {import_prefix} import {base}, " + ", ".join(_extra)
         if _extra else
@@ -75,11 +103,23 @@ def generate_class(
     lines: list[str] = []
 
     # ── header ──────────────────────────────────────────────────────────────
+    if tree_file is None:
+        lines += [
+            "import bpy  # type: ignore",
+            "from mathutils import Color, Euler, Matrix, Quaternion, Vector  # type: ignore",
+            base_import,
+            "",
+        ]
+    else:
+        lines += [
+            "import os",
+            "import bpy  # type: ignore",
+            base_import,
+            "",
+            f"_TREE = os.path.join(os.path.dirname(__file__), {_repr(tree_file)})",
+            "",
+        ]
     lines += [
-        "import bpy  # type: ignore",
-        "from mathutils import Color, Euler, Matrix, Quaternion, Vector  # type: ignore",
-        base_import,
-        "",
         "",
         f"class {class_name}({base}):",
         f"{_I1}bl_idname = {_repr(class_name)}",
@@ -113,7 +153,13 @@ def generate_class(
         lines.append("")
 
     # ── createNodetree() ────────────────────────────────────────────────────
-    lines += _gen_create_nodetree(info, tree_t, compiled_nodes)
+    if tree_file is None:
+        lines += _gen_create_nodetree(info, tree_t, compiled_nodes, batched)
+    else:
+        lines += [
+            f"{_I1}def createNodetree(self, name):",
+            f"{_I2}build_node_tree(self, _TREE)",
+        ]
     lines.append("")
 
     # ── valuesUpdate() ──────────────────────────────────────────────────────
@@ -195,7 +241,8 @@ def _gen_draw_buttons(info: dict) -> list[str]:
     return lines
 
 
-def _gen_create_nodetree(info: dict, tree_type: str, compiled_nodes: dict) -> list[str]:
+def _gen_create_nodetree(info: dict, tree_type: str, compiled_nodes: dict,
+                         batched: bool = False) -> list[str]:
     lines = [
         f"{_I1}def createNodetree(self, name):",
         f"{_I2}# Use bl_label as a stable, class-level key so all instances share",
@@ -212,10 +259,18 @@ def _gen_create_nodetree(info: dict, tree_type: str, compiled_nodes: dict) -> li
     iface_lines, deferred_menu_defaults = _gen_interface(info["interface"])
     lines += iface_lines
     lines.append("")
-    lines += _gen_nodes(info["nodes"], compiled_nodes)
-    lines += _gen_zone_pairs(info)
-    lines.append("")
-    lines += _gen_links(info["links"], info["nodes"])
+    if batched:
+        lines += _gen_nodes(info["nodes"], compiled_nodes, batched=True,
+                            named=_instance_vars(info))
+        lines += _gen_socket_tables(info["nodes"])
+        lines += _gen_zone_pairs(info)
+        lines.append("")
+        lines += _gen_link_table(info["links"], info["nodes"])
+    else:
+        lines += _gen_nodes(info["nodes"], compiled_nodes, named=_instance_vars(info))
+        lines += _gen_zone_pairs(info)
+        lines.append("")
+        lines += _gen_links(info["links"], info["nodes"])
 
     # Menu socket defaults are applied here, after the links above: a Menu
     # socket's enum is only defined once the Group Input is linked to its Menu
@@ -293,12 +348,24 @@ def _gen_interface(items: list[dict]) -> tuple[list[str], list[tuple[str, object
     return lines, deferred_menu_defaults
 
 
-def _gen_nodes(nodes: list[dict], compiled_nodes: dict = {}) -> list[str]:
+def _gen_nodes(nodes: list[dict], compiled_nodes: dict = {}, batched: bool = False,
+               named=frozenset()) -> list[str]:
+    """
+    One block per node. In the batched format nodes.new is bound once and the
+    socket defaults are left to _gen_socket_tables(). Nodes in *named* are
+    named after their var_name, for valuesUpdate to find them.
+    """
     lines: list[str] = []
+    new = "nt.nodes.new"
+    if batched and nodes:
+        new = "_new"
+        lines.append(f"{_I2}_new = nt.nodes.new")
     for node in nodes:
         v = node["var_name"]
-        lines.append(f"{_I2}{v} = nt.nodes.new({_repr(node['bl_idname'])})")
+        lines.append(f"{_I2}{v} = {new}({_repr(node['bl_idname'])})")
         lines.append(f"{_I2}{v}.location = {node['location']}")
+        if v in named:
+            lines.append(f"{_I2}{v}.name = {_repr(_node_name(v))}")
         if node["width"] and node["width"] != 140.0:
             lines.append(f"{_I2}{v}.width = {node['width']}")
         if node["label"]:
@@ -334,6 +401,9 @@ def _gen_nodes(nodes: list[dict], compiled_nodes: dict = {}) -> list[str]:
             lines += _gen_curve_mapping(v, node["curve_mapping"])
         if node.get("enum_items") or node.get("index_switch_count") is not None:
             lines += _gen_dynamic_items(v, node)
+        if batched:
+            lines.append("")
+            continue
         for idx, val in node.get("output_defaults", {}).items():
             lines.append(f"{_I2}{v}.outputs[{idx}].default_value = {_repr_val(val)}")
         for idx, val in node["input_defaults"].items():
@@ -437,19 +507,25 @@ def _gen_zone_pairs(info: dict) -> list[str]:
     return lines
 
 
+def _socket_key(node: dict | None, names_key: str, sock_name: str, sock_idx: int):
+    """
+    The key a link endpoint is addressed by: the readable socket NAME only when
+    it is unambiguous on this side. A name that repeats (Math 'Value', Vector
+    Math 'Vector', duplicated group/interface sockets) silently resolves to
+    index 0 via inputs[name], so fall back to the positional index the
+    analyzer captured.
+    """
+    names = node.get(names_key) if node else None
+    unique = bool(sock_name) and names is not None and names.count(sock_name) == 1
+    return sock_name if unique else sock_idx
+
+
 def _gen_links(links: list[dict], nodes: list[dict]) -> list[str]:
     node_by_var = {n["var_name"]: n for n in nodes}
 
     def _ref(var, accessor, names_key, sock_name, sock_idx):
-        # Use the readable socket NAME only when it is unambiguous on this side.
-        # A name that repeats (Math 'Value', Vector Math 'Vector', duplicated
-        # group/interface sockets) silently resolves to index 0 via inputs[name],
-        # so fall back to the positional index the analyzer captured.
-        node  = node_by_var.get(var)
-        names = node.get(names_key) if node else None
-        unique = bool(sock_name) and names is not None and names.count(sock_name) == 1
-        key = _repr(sock_name) if unique else sock_idx
-        return f"{var}.{accessor}[{key}]"
+        key = _socket_key(node_by_var.get(var), names_key, sock_name, sock_idx)
+        return f"{var}.{accessor}[{_repr(key)}]"
 
     lines: list[str] = []
     for lnk in links:
@@ -461,32 +537,249 @@ def _gen_links(links: list[dict], nodes: list[dict]) -> list[str]:
     return lines
 
 
-def _gen_values_update(info: dict) -> list[str]:
+def _gen_table_loop(head: str, rows: list[str], body: str) -> list[str]:
+    """``for <head> in (<rows>): <body>`` — one row per line; nothing if empty."""
+    if not rows:
+        return []
+    return (
+        [f"{_I2}for {head} in ("]
+        + [f"{_I2}{_I1}{row}," for row in rows]
+        + [f"{_I2}):", f"{_I2}{_I1}{body}"]
+    )
+
+
+def _gen_socket_tables(nodes: list[dict]) -> list[str]:
+    """
+    Batched format: cache every node's inputs / outputs collections in two
+    lists (by node position) and set all socket defaults from (node, index,
+    value) tables. Runs after every node's dynamic items exist, as the
+    per-node defaults of the Python format do.
+    """
+    if not nodes:
+        return []
+    names = ", ".join(n["var_name"] for n in nodes)
+    if len(nodes) == 1:
+        names += ","
+    out_rows = [
+        f"({i}, {idx}, {_repr_val(val)})"
+        for i, n in enumerate(nodes)
+        for idx, val in n.get("output_defaults", {}).items()
+    ]
+    in_rows = [
+        f"({i}, {idx}, {_repr_val(val)})"
+        for i, n in enumerate(nodes)
+        for idx, val in n["input_defaults"].items()
+    ]
     lines = [
-        f"{_I1}def valuesUpdate(self, context):",
-        f"{_I2}if context is not None and self.node_tree.users > 1:",
-        f"{_I2}{_I1}self.node_tree = self.node_tree.copy()",
+        f"{_I2}_nodes = ({names})",
+        f"{_I2}_ins = [_n.inputs for _n in _nodes]",
+        f"{_I2}_outs = [_n.outputs for _n in _nodes]",
     ]
-    props = _placeholder_props(info)
-    if props:
-        # Map each placeholder node.name → its shared image property. Multiple
-        # nodes with the same label all point to the same property.
-        mapping = {nn: pp["prop_name"] for pp in props for nn in pp["node_names"]}
-        lines.append(f"{_I2}_placeholder_images = {mapping!r}")
-    lines.append(f"{_I2}for node in self.node_tree.nodes:")
-    if props:
-        lines += [
-            f'{_I2}{_I1}if node.type == "TEX_IMAGE" and node.name in _placeholder_images:',
-            f"{_I2}{_I1}{_I1}node.image = getattr(self, _placeholder_images[node.name])",
-        ]
-    if info["has_uv_nodes"]:
-        lines += [
-            f'{_I2}{_I1}if hasattr(node, "uv_map") and self.uv_map:',
-            f"{_I2}{_I1}{_I1}node.uv_map = self.uv_map",
-        ]
+    lines += _gen_table_loop("_n, _i, _v", out_rows, "_outs[_n][_i].default_value = _v")
+    lines += _gen_table_loop("_n, _i, _v", in_rows, "_ins[_n][_i].default_value = _v")
+    lines.append("")
     return lines
 
 
+def _gen_link_table(links: list[dict], nodes: list[dict]) -> list[str]:
+    """
+    Batched format: every link from one (from_node, out_idx, to_node, in_idx)
+    table over the _ins / _outs lists, with links.new bound once. Sockets are
+    addressed by the positions the analyzer captured — the same positions
+    socket defaults already use — instead of resolving names.
+    """
+    if not links:
+        return []
+    pos = {n["var_name"]: i for i, n in enumerate(nodes)}
+    rows = [
+        f"({pos[lnk['from_var']]}, {lnk['from_socket_index']}, "
+        f"{pos[lnk['to_var']]}, {lnk['to_socket_index']})"
+        for lnk in links
+    ]
+    return [f"{_I2}_link = nt.links.new"] + _gen_table_loop(
+        "_a, _o, _b, _i", rows, "_link(_outs[_a][_o], _ins[_b][_i])"
+    )
+
+
+def _gen_values_update(info: dict) -> list[str]:
+    # Node.applyInstanceValues() finds the nodes by name (see _instance_vars)
+    # and forks a shared tree only when a value actually changes. The copy
+    # duplicates this node's own tree only; nested groups stay shared, which
+    # instance wrappers (flattener.wrap_split) rely on.
+    images, uv_vars = _values_tables(info)
+    args = repr(images) + (f", {tuple(uv_vars)!r}" if uv_vars else "")
+    return [
+        f"{_I1}def valuesUpdate(self, context):",
+        f"{_I2}self.applyInstanceValues(context, {args})",
+    ]
+
+
+def _values_tables(info: dict) -> tuple[dict, list]:
+    """valuesUpdate's tables: placeholder var → image property, and the UV Map vars."""
+    placeholders = info.get("placeholder_images")
+    names = ([ph["node_name"] for ph in placeholders] if placeholders is not None
+             else info.get("placeholder_image_node_names", []))
+    # Map each placeholder node → its shared image property. Multiple nodes
+    # with the same label all point to the same property.
+    prop_of = {nn: pp["prop_name"] for pp in _placeholder_props(info) for nn in pp["node_names"]}
+    images = {_node_name(var): prop_of[name]
+              for var, name in zip(info["has_image_nodes"], names)}
+    return images, [_node_name(var) for var in info["has_uv_nodes"]]
+
+
+def _instance_vars(info: dict) -> frozenset:
+    """Nodes valuesUpdate writes to; they are named after their var_name."""
+    if not info["has_image_nodes"] and not info["has_uv_nodes"]:
+        return frozenset()
+    return frozenset(info["has_image_nodes"]) | frozenset(info["has_uv_nodes"])
+
+
+def _node_name(var: str) -> str:
+    """
+    The node name for *var*. Blender would silently cut a longer name (deep
+    inlining prefixes add up), and the cut name could then match another
+    node's, so a long var keeps its head and ends in a hash of the whole.
+    """
+    raw = var.encode("utf-8")
+    if len(raw) <= _MAX_NODE_NAME:
+        return var
+    digest = hashlib.sha1(raw).hexdigest()[:10]
+    head = raw[:_MAX_NODE_NAME - len(digest) - 1].decode("utf-8", "ignore")
+    return f"{head}_{digest}"
+
+
+# ---------------------------------------------------------------------------
+# JSON tree format
+# ---------------------------------------------------------------------------
+#
+# The same steps _gen_create_nodetree() writes out line by line, as data:
+# nodes and interface items are addressed by position, defaults left at
+# Blender's value are omitted, and link endpoints use _socket_key(). Every
+# value is JSON-safe (tuples become lists).
+
+def generate_tree_data(info: dict, compiled_nodes: "dict[str, tuple[str, str]]" = {}) -> dict:
+    """Return the tree description nodes/node.py build_node_tree() applies."""
+    data: dict = {
+        "format":    TREE_FORMAT_VERSION,
+        "tree_type": _NG_TYPE_TO_TREE.get(info["type"], "ShaderNodeTree"),
+        "color_tag": info["color_tag"],
+    }
+    if info["description"]:
+        data["description"] = info["description"]
+
+    interface: list[dict] = []
+    menu_defaults: list[list] = []
+    panel_index: dict[str, int] = {}
+    for s in info["interface"]:
+        parent = panel_index.get(s.get("parent_id"))
+        if s.get("item_kind") == "panel":
+            if s.get("identifier") is not None:
+                panel_index[s["identifier"]] = len(interface)
+            item = {"panel": s["name"]}
+            if s.get("description"):
+                item["description"] = s["description"]
+            if s.get("default_closed"):
+                item["closed"] = True
+        else:
+            item = {"socket": s["name"], "in_out": s["in_out"], "type": s["socket_type"]}
+            if s["default_value"] is not None:
+                if s["socket_type"] == "NodeSocketMenu":
+                    # Deferred until after the links, as in _gen_interface().
+                    menu_defaults.append([len(interface), _json_val(s["default_value"])])
+                else:
+                    item["default"] = _json_val(s["default_value"])
+            if s["min_value"] is not None:
+                item["min"] = _json_val(s["min_value"])
+            if s["max_value"] is not None:
+                item["max"] = _json_val(s["max_value"])
+            if s["subtype"] and s["subtype"] != "NONE":
+                item["subtype"] = s["subtype"]
+            if s["hide_value"]:
+                item["hide_value"] = True
+            if s["hide_in_modifier"]:
+                item["hide_in_modifier"] = True
+            if s.get("dimensions") is not None:
+                item["dimensions"] = s["dimensions"]
+        if parent is not None:
+            item["parent"] = parent
+        interface.append(item)
+    data["interface"] = interface
+
+    index = {n["var_name"]: i for i, n in enumerate(info["nodes"])}
+    named = _instance_vars(info)
+    nodes: list[dict] = []
+    for node in info["nodes"]:
+        item = {"idname": node["bl_idname"], "loc": list(node["location"])}
+        if node["var_name"] in named:
+            item["name"] = _node_name(node["var_name"])
+        if node["width"] and node["width"] != 140.0:
+            item["width"] = node["width"]
+        if node["label"]:
+            item["label"] = node["label"]
+        if node["hide"]:
+            item["hide"] = True
+        if node["type"] == "GROUP" and node["node_tree_name"]:
+            entry = compiled_nodes.get(node["node_tree_name"])
+            if entry:
+                item["group"] = entry[1]
+            else:
+                item["blend_group"] = node["node_tree_name"]
+        if node.get("image_name"):
+            item["image"] = node["image_name"]
+        if node["attributes"]:
+            item["attrs"] = dict(node["attributes"])
+        if node.get("color_ramp"):
+            item["ramp"] = _json_val(node["color_ramp"])
+        if node.get("curve_mapping"):
+            item["curve"] = _json_val(node["curve_mapping"])
+        if node.get("enum_items"):
+            item["enum"] = [
+                {"name": it["name"], "description": it.get("description") or ""}
+                for it in node["enum_items"]
+            ]
+        elif node.get("index_switch_count") is not None:
+            item["index_switch"] = max(int(node["index_switch_count"]), 0)
+        if node.get("active_index") is not None and ("enum" in item or "index_switch" in item):
+            item["active_index"] = node["active_index"]
+        if node.get("output_defaults"):
+            item["outputs"] = [[int(i), _json_val(v)] for i, v in node["output_defaults"].items()]
+        if node["input_defaults"]:
+            item["inputs"] = [[int(i), _json_val(v)] for i, v in node["input_defaults"].items()]
+        if node.get("repeat_items"):
+            item["repeat_items"] = [[it["socket_type"], it["name"]] for it in node["repeat_items"]]
+        nodes.append(item)
+    data["nodes"] = nodes
+
+    if info["zone_pairs"]:
+        data["zones"] = [[index[i], index[o]] for i, o in info["zone_pairs"]]
+    node_by_var = {n["var_name"]: n for n in info["nodes"]}
+    data["links"] = [
+        [index[lnk["from_var"]],
+         _socket_key(node_by_var[lnk["from_var"]], "output_socket_names",
+                     lnk["from_socket_name"], lnk["from_socket_index"]),
+         index[lnk["to_var"]],
+         _socket_key(node_by_var[lnk["to_var"]], "input_socket_names",
+                     lnk["to_socket_name"], lnk["to_socket_index"])]
+        for lnk in info["links"]
+    ]
+    if menu_defaults:
+        data["menu_defaults"] = menu_defaults
+    if info["has_image_nodes"] or info["has_uv_nodes"]:
+        data["values_update"] = True
+    return data
+
+
+def _json_val(v):
+    """JSON-safe copy of an analyzed value; tuples → lists of floats, as _repr_val."""
+    if isinstance(v, dict):
+        return {k: _json_val(x) for k, x in v.items()}
+    if isinstance(v, list):
+        return [_json_val(x) for x in v]
+    if isinstance(v, tuple):
+        return [_json_val(x) if isinstance(x, (tuple, list)) else float(x) for x in v]
+    return v
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -0,0 +1,482 @@
+"""
+Constant folder.
+
+LSCherry groups are full of Value / Math / Vector Math / Mix chains whose
+inputs are all unlinked defaults: tuning constants, unit conversions, a colour
+mixed once at a fixed factor. Every one of them is generated, built at runtime
+and compiled into the material's GPU shader, only to produce the same number
+each time.
+
+fold_constants() evaluates those chains here, in Python, with the formulas
+(and the "safe" division / log / power / sqrt rules) Blender's own nodes use:
+
+* a result is baked into the input default of the node that reads it, when the
+  implicit socket conversion is one Blender performs losslessly (float →
+  vector / colour, vector ↔ colour, same type);
+* a result the reader can't take as a default (a Group Output socket, a lossy
+  conversion) replaces its node with a single Value / RGB / Combine XYZ node;
+* folded nodes nothing reads anymore are removed, with their links.
+
+Only the operations listed in the tables below are folded; anything else (or a
+result that isn't finite) is left in the tree untouched. Like the flattener it
+works on plain dicts and never mutates its input.
+"""
+
+from __future__ import annotations
+import math
+import struct
+
+_FLT_EPSILON = 1.1920928955078125e-07
+
+# Socket types (bpy socket.type) of each foldable node's outputs, by index.
+_OUT_TYPES = {
+    "ShaderNodeValue":      ("VALUE",),
+    "ShaderNodeRGB":        ("RGBA",),
+    "ShaderNodeMath":       ("VALUE",),
+    "ShaderNodeVectorMath": ("VECTOR", "VALUE"),
+    "ShaderNodeMix":        ("VALUE", "VECTOR", "RGBA"),
+}
+
+
+class _NotConstant(Exception):
+    """An input the fold needs is linked to something that isn't constant."""
+
+
+# ---------------------------------------------------------------------------
+# Blender's math (BLI_math_base_safe.h / node_math.h)
+# ---------------------------------------------------------------------------
+
+def _safe_divide(a, b):
+    return a / b if b != 0.0 else 0.0
+
+
+def _safe_pow(a, b):
+    if a < 0.0 and b != int(b):
+        return 0.0
+    return math.pow(a, b)
+
+
+def _safe_log(a, b):
+    if a <= 0.0 or b <= 0.0:
+        return 0.0
+    return _safe_divide(math.log(a), math.log(b))
+
+
+def _safe_mod(a, b):
+    return math.fmod(a, b) if b != 0.0 else 0.0
+
+
+def _floored_mod(a, b):
+    return a - math.floor(a / b) * b if b != 0.0 else 0.0
+
+
+def _wrap(value, hi, lo):
+    span = hi - lo
+    return value - span * math.floor((value - lo) / span) if span != 0.0 else lo
+
+
+def _pingpong(value, scale):
+    if scale == 0.0:
+        return 0.0
+    t = (value - scale) / (scale * 2.0)
+    return abs((t - math.floor(t)) * scale * 2.0 - scale)
+
+
+def _smooth_min(a, b, c):
+    if c == 0.0:
+        return min(a, b)
+    h = max(c - abs(a - b), 0.0) / c
+    return min(a, b) - h * h * h * c * (1.0 / 6.0)
+
+
+def _sign(a):
+    return 1.0 if a > 0.0 else -1.0 if a < 0.0 else 0.0
+
+
+def _clamp01(a):
+    return min(max(a, 0.0), 1.0)
+
+
+# operation → (number of inputs read, f(a, b, c))
+_MATH_OPS = {
+    "ADD":            (2, lambda a, b, c: a + b),
+    "SUBTRACT":       (2, lambda a, b, c: a - b),
+    "MULTIPLY":       (2, lambda a, b, c: a * b),
+    "DIVIDE":         (2, lambda a, b, c: _safe_divide(a, b)),
+    "MULTIPLY_ADD":   (3, lambda a, b, c: a * b + c),
+    "POWER":          (2, lambda a, b, c: _safe_pow(a, b)),
+    "LOGARITHM":      (2, lambda a, b, c: _safe_log(a, b)),
+    "SQRT":           (1, lambda a, b, c: math.sqrt(a) if a > 0.0 else 0.0),
+    "INVERSE_SQRT":   (1, lambda a, b, c: 1.0 / math.sqrt(a) if a > 0.0 else 0.0),
+    "ABSOLUTE":       (1, lambda a, b, c: abs(a)),
+    "EXPONENT":       (1, lambda a, b, c: math.exp(a)),
+    "MINIMUM":        (2, lambda a, b, c: min(a, b)),
+    "MAXIMUM":        (2, lambda a, b, c: max(a, b)),
+    "LESS_THAN":      (2, lambda a, b, c: 1.0 if a < b else 0.0),
+    "GREATER_THAN":   (2, lambda a, b, c: 1.0 if a > b else 0.0),
+    "SIGN":           (1, lambda a, b, c: _sign(a)),
+    "COMPARE":        (3, lambda a, b, c: 1.0 if abs(a - b) <= max(c, _FLT_EPSILON) else 0.0),
+    "SMOOTH_MIN":     (3, lambda a, b, c: _smooth_min(a, b, c)),
+    "SMOOTH_MAX":     (3, lambda a, b, c: -_smooth_min(-a, -b, c)),
+    "ROUND":          (1, lambda a, b, c: math.floor(a + 0.5)),
+    "FLOOR":          (1, lambda a, b, c: math.floor(a)),
+    "CEIL":           (1, lambda a, b, c: math.ceil(a)),
+    "TRUNC":          (1, lambda a, b, c: float(math.trunc(a))),
+    "FRACT":          (1, lambda a, b, c: a - math.floor(a)),
+    "MODULO":         (2, lambda a, b, c: _safe_mod(a, b)),
+    "FLOORED_MODULO": (2, lambda a, b, c: _floored_mod(a, b)),
+    "WRAP":           (3, lambda a, b, c: _wrap(a, b, c)),
+    "SNAP":           (2, lambda a, b, c: math.floor(_safe_divide(a, b)) * b),
+    "PINGPONG":       (2, lambda a, b, c: _pingpong(a, b)),
+    "SINE":           (1, lambda a, b, c: math.sin(a)),
+    "COSINE":         (1, lambda a, b, c: math.cos(a)),
+    "TANGENT":        (1, lambda a, b, c: math.tan(a)),
+    "ARCSINE":        (1, lambda a, b, c: math.asin(min(max(a, -1.0), 1.0))),
+    "ARCCOSINE":      (1, lambda a, b, c: math.acos(min(max(a, -1.0), 1.0))),
+    "ARCTANGENT":     (1, lambda a, b, c: math.atan(a)),
+    "ARCTAN2":        (2, lambda a, b, c: math.atan2(a, b)),
+    "SINH":           (1, lambda a, b, c: math.sinh(a)),
+    "COSH":           (1, lambda a, b, c: math.cosh(a)),
+    "TANH":           (1, lambda a, b, c: math.tanh(a)),
+    "RADIANS":        (1, lambda a, b, c: math.radians(a)),
+    "DEGREES":        (1, lambda a, b, c: math.degrees(a)),
+}
+
+
+def _per(f):
+    """Component-wise vector op from a float op."""
+    return lambda a, b, c, s: tuple(f(x, y) for x, y in zip(a, b))
+
+
+def _length(a):
+    return math.sqrt(sum(x * x for x in a))
+
+
+def _normalize(a):
+    n = _length(a)
+    return tuple(x / n for x in a) if n != 0.0 else (0.0, 0.0, 0.0)
+
+
+# operation → (Vector inputs read, reads Scale, output index, f(a, b, c, scale))
+_VECTOR_OPS = {
+    "ADD":           (2, False, 0, _per(lambda x, y: x + y)),
+    "SUBTRACT":      (2, False, 0, _per(lambda x, y: x - y)),
+    "MULTIPLY":      (2, False, 0, _per(lambda x, y: x * y)),
+    "DIVIDE":        (2, False, 0, _per(_safe_divide)),
+    "MULTIPLY_ADD":  (3, False, 0, lambda a, b, c, s: tuple(x * y + z for x, y, z in zip(a, b, c))),
+    "CROSS_PRODUCT": (2, False, 0, lambda a, b, c, s: (a[1] * b[2] - a[2] * b[1],
+                                                       a[2] * b[0] - a[0] * b[2],
+                                                       a[0] * b[1] - a[1] * b[0])),
+    "DOT_PRODUCT":   (2, False, 1, lambda a, b, c, s: sum(x * y for x, y in zip(a, b))),
+    "DISTANCE":      (2, False, 1, lambda a, b, c, s: _length([x - y for x, y in zip(a, b)])),
+    "LENGTH":        (1, False, 1, lambda a, b, c, s: _length(a)),
+    "SCALE":         (1, True,  0, lambda a, b, c, s: tuple(x * s for x in a)),
+    "NORMALIZE":     (1, False, 0, lambda a, b, c, s: _normalize(a)),
+    "ABSOLUTE":      (1, False, 0, lambda a, b, c, s: tuple(abs(x) for x in a)),
+    "MINIMUM":       (2, False, 0, _per(min)),
+    "MAXIMUM":       (2, False, 0, _per(max)),
+    "FLOOR":         (1, False, 0, lambda a, b, c, s: tuple(float(math.floor(x)) for x in a)),
+    "CEIL":          (1, False, 0, lambda a, b, c, s: tuple(float(math.ceil(x)) for x in a)),
+    "FRACTION":      (1, False, 0, lambda a, b, c, s: tuple(x - math.floor(x) for x in a)),
+    "MODULO":        (2, False, 0, _per(_safe_mod)),
+    "SNAP":          (2, False, 0, _per(lambda x, y: math.floor(_safe_divide(x, y)) * y)),
+    "SINE":          (1, False, 0, lambda a, b, c, s: tuple(math.sin(x) for x in a)),
+    "COSINE":        (1, False, 0, lambda a, b, c, s: tuple(math.cos(x) for x in a)),
+    "TANGENT":       (1, False, 0, lambda a, b, c, s: tuple(math.tan(x) for x in a)),
+}
+
+# Mix (Color) blend_type → f(a, b) on one channel; the result is lerp(a, f, fac)
+# and keeps A's alpha.
+_BLEND_OPS = {
+    "MIX":      lambda a, b: b,
+    "ADD":      lambda a, b: a + b,
+    "SUBTRACT": lambda a, b: a - b,
+    "MULTIPLY": lambda a, b: a * b,
+}
+
+
+def _fold_value(node, get):
+    return {0: node["output_defaults"][0]}
+
+
+def _fold_math(node, get):
+    attrs = node["attributes"]
+    op = _MATH_OPS.get(attrs.get("operation", "ADD"))
+    if op is None:
+        raise _NotConstant
+    n, f = op
+    args = [get(i, "VALUE") for i in range(n)] + [0.0] * (3 - n)
+    r = f(*args)
+    if attrs.get("use_clamp"):
+        r = _clamp01(r)
+    return {0: float(r)}
+
+
+def _fold_vector_math(node, get):
+    op = _VECTOR_OPS.get(node["attributes"].get("operation", "ADD"))
+    if op is None:
+        raise _NotConstant
+    n, scaled, out, f = op
+    zero = (0.0, 0.0, 0.0)
+    vecs = [get(i, "VECTOR") for i in range(n)] + [zero] * (3 - n)
+    r = f(*vecs, get(3, "VALUE") if scaled else 1.0)
+    if out == 0:
+        return {0: tuple(float(x) for x in r), 1: 0.0}
+    return {0: zero, 1: float(r)}
+
+
+def _fold_mix(node, get):
+    attrs = node["attributes"]
+    data_type = attrs.get("data_type", "FLOAT")
+    clamp = attrs.get("clamp_factor", True)
+    if data_type == "VECTOR" and attrs.get("factor_mode", "UNIFORM") == "NON_UNIFORM":
+        fac = get(1, "VECTOR")
+        if clamp:
+            fac = tuple(_clamp01(x) for x in fac)
+        a, b = get(4, "VECTOR"), get(5, "VECTOR")
+        return {1: tuple(x + f * (y - x) for f, x, y in zip(fac, a, b))}
+    fac = get(0, "VALUE")
+    if clamp:
+        fac = _clamp01(fac)
+    if data_type == "FLOAT":
+        a, b = get(2, "VALUE"), get(3, "VALUE")
+        return {0: a + fac * (b - a)}
+    if data_type == "VECTOR":
+        a, b = get(4, "VECTOR"), get(5, "VECTOR")
+        return {1: tuple(x + fac * (y - x) for x, y in zip(a, b))}
+    blend = _BLEND_OPS.get(attrs.get("blend_type", "MIX"))
+    if data_type != "RGBA" or blend is None:
+        raise _NotConstant
+    a, b = get(6, "RGBA"), get(7, "RGBA")
+    r = tuple(x + fac * (blend(x, y) - x) for x, y in zip(a[:3], b[:3])) + (a[3],)
+    if attrs.get("clamp_result"):
+        r = tuple(_clamp01(x) for x in r)
+    return {2: r}
+
+
+_FOLDERS = {
+    "ShaderNodeValue":      _fold_value,
+    "ShaderNodeRGB":        _fold_value,
+    "ShaderNodeMath":       _fold_math,
+    "ShaderNodeVectorMath": _fold_vector_math,
+    "ShaderNodeMix":        _fold_mix,
+}
+
+
+# ---------------------------------------------------------------------------
+# Socket conversion
+# ---------------------------------------------------------------------------
+
+def _convert(value, from_type: str, to_type: str | None):
+    """
+    *value* as Blender's implicit conversion hands it to a *to_type* socket, or
+    None when that conversion isn't one this pass reproduces (float ← vector /
+    colour goes through averaging / luminance; INT, SHADER, ... aren't folded).
+    """
+    if from_type == "VALUE":
+        v = float(value)
+        return {"VALUE": v, "VECTOR": (v, v, v), "RGBA": (v, v, v, 1.0)}.get(to_type)
+    if from_type == "VECTOR":
+        v = tuple(float(x) for x in value)
+        return {"VECTOR": v, "RGBA": v + (1.0,)}.get(to_type)
+    if from_type == "RGBA":
+        v = tuple(float(x) for x in value)
+        return {"RGBA": v, "VECTOR": v[:3]}.get(to_type)
+    return None
+
+
+def _f32(value):
+    """*value* rounded to float32, as the socket (and Blender's math) holds it."""
+    if isinstance(value, tuple):
+        return tuple(struct.unpack("f", struct.pack("f", x))[0] for x in value)
+    return struct.unpack("f", struct.pack("f", value))[0]
+
+
+def _finite(value) -> bool:
+    if isinstance(value, tuple):
+        return all(math.isfinite(x) for x in value)
+    return math.isfinite(value)
+
+
+# ---------------------------------------------------------------------------
+# Public
+# ---------------------------------------------------------------------------
+
+def evaluate_constants(info: dict) -> tuple[dict[str, dict[int, object]], list[str]]:
+    """
+    Evaluate every foldable node whose inputs are all constant.
+
+    Returns ``(values, order)``: var_name → {output index: value} for each
+    constant node, and those var_names producers-first.
+    """
+    by_var = {n["var_name"]: n for n in info["nodes"]}
+    incoming = {(lnk["to_var"], lnk["to_socket_index"]): lnk for lnk in info["links"]}
+    feeds: dict[str, list[str]] = {}    # foldable var → its producers, in link order
+    for lnk in info["links"]:
+        to_node = by_var.get(lnk["to_var"])
+        if (to_node is not None and lnk["from_var"] in by_var
+                and to_node["bl_idname"] in _FOLDERS):
+            feeds.setdefault(lnk["to_var"], []).append(lnk["from_var"])
+    values: dict[str, dict] = {}
+    order: list[str] = []
+
+    def evaluate(var):
+        """*var*'s outputs, if constant; its producers are already settled."""
+        node = by_var[var]
+        fold = _FOLDERS.get(node["bl_idname"])
+        if fold is None:
+            return None
+
+        def get(idx, to_type):
+            lnk = incoming.get((var, idx))
+            if lnk is None:
+                if idx not in node["input_defaults"]:
+                    raise _NotConstant
+                value, from_type = node["input_defaults"][idx], to_type
+                if isinstance(value, (tuple, list)) and to_type == "VALUE":
+                    raise _NotConstant
+            else:
+                src = values.get(lnk["from_var"])
+                i = lnk["from_socket_index"]
+                if src is None or i not in src:
+                    raise _NotConstant
+                value = src[i]
+                from_type = _OUT_TYPES[by_var[lnk["from_var"]]["bl_idname"]][i]
+            converted = _convert(value, from_type, to_type)
+            if converted is None:
+                raise _NotConstant
+            return converted
+
+        try:
+            outs = fold(node, get)
+            if not all(_finite(v) for v in outs.values()):
+                return None
+            return {i: _f32(v) for i, v in outs.items()}
+        except (_NotConstant, ArithmeticError, ValueError, KeyError, IndexError, TypeError):
+            return None
+
+    # Producers first, with an explicit stack: a long Math chain must not hit
+    # the interpreter's recursion limit. A producer still on the stack (a link
+    # cycle, which Blender marks invalid) has no value yet, so it reads as
+    # not constant.
+    seen: set[str] = set()
+    for root in by_var:
+        if root in seen:
+            continue
+        seen.add(root)
+        stack = [(root, iter(feeds.get(root, ())))]
+        while stack:
+            var, producers = stack[-1]
+            nxt = next((p for p in producers if p not in seen), None)
+            if nxt is not None:
+                seen.add(nxt)
+                stack.append((nxt, iter(feeds.get(nxt, ()))))
+                continue
+            stack.pop()
+            outs = evaluate(var)
+            if outs is not None:
+                values[var] = outs
+                order.append(var)
+    return values, order
+
+
+def fold_constants(info: dict) -> tuple[dict, int]:
+    """Return ``(info with constant subgraphs folded, number of nodes folded)``."""
+    if info.get("type", "SHADER") != "SHADER":
+        return info, 0
+    values, order = evaluate_constants(info)
+    if not order:
+        return info, 0
+
+    by_var = {n["var_name"]: n for n in info["nodes"]}
+    outgoing: dict[str, list[dict]] = {}
+    for lnk in info["links"]:
+        outgoing.setdefault(lnk["from_var"], []).append(lnk)
+
+    changed: dict[str, dict] = {}       # var_name → copied / replaced node
+    baked: set[int] = set()             # id() of links turned into defaults
+    rewired: dict[int, dict] = {}       # id() of link → its replacement
+    removed: set[str] = set()
+    replaced: set[str] = set()
+
+    def bake(lnk) -> bool:
+        target = changed.get(lnk["to_var"]) or by_var[lnk["to_var"]]
+        if target["type"] == "GROUP_OUTPUT" or lnk["from_socket_index"] not in values[lnk["from_var"]]:
+            return False
+        idx = lnk["to_socket_index"]
+        types = target.get("input_socket_types") or ()
+        value = _convert(
+            values[lnk["from_var"]][lnk["from_socket_index"]],
+            _OUT_TYPES[by_var[lnk["from_var"]]["bl_idname"]][lnk["from_socket_index"]],
+            types[idx] if idx < len(types) else None,
+        )
+        if value is None:
+            return False
+        if lnk["to_var"] not in changed:
+            changed[lnk["to_var"]] = dict(target, input_defaults=dict(target["input_defaults"]))
+        changed[lnk["to_var"]]["input_defaults"][idx] = value
+        baked.add(id(lnk))
+        return True
+
+    # Readers first, so a node's fate is settled before its producers look at it.
+    for var in reversed(order):
+        kept = []
+        for lnk in outgoing.get(var, ()):
+            if lnk["to_var"] in removed or lnk["to_var"] in replaced:
+                continue
+            if not bake(lnk):
+                kept.append(lnk)
+        if not kept:
+            removed.add(var)
+            continue
+        node = by_var[var]
+        outs = {lnk["from_socket_index"] for lnk in kept}
+        if node["bl_idname"] in ("ShaderNodeValue", "ShaderNodeRGB") or len(outs) != 1:
+            continue
+        out = outs.pop()
+        if out not in values[var]:
+            continue
+        constant = _constant_node(changed.get(var) or node, values[var][out],
+                                  _OUT_TYPES[node["bl_idname"]][out])
+        changed[var] = constant
+        replaced.add(var)
+        for lnk in kept:
+            rewired[id(lnk)] = dict(lnk, from_socket_name=constant["output_socket_names"][0],
+                                    from_socket_index=0)
+
+    if not removed and not replaced:
+        return info, 0
+    folded = dict(info)
+    folded["nodes"] = [changed.get(n["var_name"], n) for n in info["nodes"]
+                       if n["var_name"] not in removed]
+    folded["links"] = [
+        rewired.get(id(lnk), lnk) for lnk in info["links"]
+        if id(lnk) not in baked
+        and lnk["from_var"] not in removed
+        and lnk["to_var"] not in removed and lnk["to_var"] not in replaced
+    ]
+    return folded, len(removed) + len(replaced)
+
+
+def _constant_node(node: dict, value, socket_type: str) -> dict:
+    """A Value / RGB / Combine XYZ node in *node*'s place, producing *value*."""
+    const = dict(
+        node,
+        attributes={}, input_defaults={}, output_defaults={},
+        input_socket_names=[], input_socket_types=[],
+        color_ramp=None, curve_mapping=None, enum_items=[],
+        index_switch_count=None, active_index=None,
+    )
+    if socket_type == "VALUE":
+        const.update(type="VALUE", bl_idname="ShaderNodeValue", output_defaults={0: value},
+                     output_socket_names=["Value"], output_socket_types=["VALUE"])
+    elif socket_type == "RGBA":
+        const.update(type="RGB", bl_idname="ShaderNodeRGB", output_defaults={0: value},
+                     output_socket_names=["Color"], output_socket_types=["RGBA"])
+    else:
+        const.update(type="COMBXYZ", bl_idname="ShaderNodeCombineXYZ",
+                     input_defaults={0: value[0], 1: value[1], 2: value[2]},
+                     input_socket_names=["X", "Y", "Z"],
+                     input_socket_types=["VALUE", "VALUE", "VALUE"],
+                     output_socket_names=["Vector"], output_socket_types=["VECTOR"])
+    return const
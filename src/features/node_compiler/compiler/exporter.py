@@ -8,6 +8,9 @@ from __future__ import annotations
 import os
 import bpy  # type: ignore
 
+from ....nodes.manifest import MANIFEST_NAME, make_entry, write_manifest
+from .image_optimizer import ImageReport, optimize_png_file
+
 _FILE_HEADER = """\
 # ============================================================
 # AUTO-GENERATED by LSPotato NodeCompiler
@@ -28,21 +31,42 @@ _INIT_HEADER = """\
 # Write helpers
 # ---------------------------------------------------------------------------
 
-def write_compiled_file(base_out_dir: str, subpath: str, filename: str, code: str) -> str:
+def write_compiled_file(base_out_dir: str, subpath: str, filename: str, code: str,
+                        header: str = _FILE_HEADER) -> str:
     """
     Write *code* to ``<base_out_dir>/<subpath>/<filename>``.
-    Creates the subfolder if it doesn't exist.
+    Creates the subfolder if it doesn't exist. Tree descriptions (JSON) are
+    written with ``header=""``.
     Returns the absolute path of the written file.
     """
     folder = os.path.join(base_out_dir, subpath)
     os.makedirs(folder, exist_ok=True)
     path = os.path.join(folder, filename)
     with open(path, "w", encoding="utf-8") as fh:
-        fh.write(_FILE_HEADER)
+        fh.write(header)
         fh.write(code)
     return path
 
 
+def write_compiled_file_if_changed(base_out_dir: str, subpath: str, filename: str,
+                                   code: str, header: str = _FILE_HEADER) -> tuple[str, bool]:
+    """
+    Like write_compiled_file(), but leave the file (and its mtime) alone when it
+    already holds exactly this output. Used by incremental compiles so NodeLib's
+    manifest / code cache stay warm for regenerated-but-identical modules.
+    Returns ``(path, written)``.
+    """
+    path = os.path.join(base_out_dir, subpath, filename)
+    content = header + code
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            if fh.read() == content:
+                return path, False
+    except OSError:
+        pass
+    return write_compiled_file(base_out_dir, subpath, filename, code, header), True
+
+
 def write_all_inits(base_out_dir: str, subpath_modules: dict[str, list[str]]):
     """
     Write an ``__init__.py`` for every subfolder that has compiled modules.
@@ -99,7 +123,30 @@ def _write_init(folder: str, module_stems: list[str], child_subfolders: list[str
         fh.write("\n".join(lines))
 
 
-def export_packed_images(base_out_dir: str, images: dict) -> list[str]:
+def write_node_manifest(base_out_dir: str, records: list[tuple[str, str, str, str]],
+                        tree_hashes: dict[str, str] | None = None) -> str:
+    """
+    Write ``<base_out_dir>/node_manifest.json`` describing every compiled class.
+
+    ``records`` holds one ``(class_name, bl_label, subpath, filename)`` tuple per
+    file written this run. Each entry stamps the file's size / mtime / sha1 as
+    it is on disk now, so call this after every compiled file is written.
+    ``tree_hashes`` maps class name → canonical tree hash (tree_hasher.py);
+    classes without one are recorded with an empty hash.
+    NodeLib reads the shipped copy to register without executing each module.
+    Returns the manifest path.
+    """
+    tree_hashes = tree_hashes or {}
+    entries = [
+        make_entry(base_out_dir, f"{subpath}/{filename}", class_name, bl_label,
+                   class_name, tree_hashes.get(class_name, ""))
+        for class_name, bl_label, subpath, filename in records
+    ]
+    return write_manifest(os.path.join(base_out_dir, MANIFEST_NAME), entries)
+
+
+def export_packed_images(base_out_dir: str, images: dict,
+                         optimize: bool = False) -> tuple[list[str], list[ImageReport]]:
     """
     Save predefined textures into ``<base_out_dir>/images/`` (sibling of the
     ``lscherry/`` tree), matching where load_packaged_image() looks at runtime.
@@ -108,7 +155,12 @@ def export_packed_images(base_out_dir: str, images: dict) -> list[str]:
     packed inside the source .blend, so each is copied first (to avoid
     mutating the source datablock's filepath) and then saved out, decoding the
     packed pixels to disk. Existing files are left untouched so re-compiles are
-    idempotent. Returns the list of written/extant paths.
+    idempotent.
+
+    With *optimize* every PNG among them, new or existing, then goes through
+    image_optimizer.optimize_png_file() (files it already rewrote are skipped).
+
+    Returns ``(written/extant paths, one ImageReport per optimized candidate)``.
     """
     folder = os.path.join(base_out_dir, "images")
     os.makedirs(folder, exist_ok=True)
@@ -127,7 +179,11 @@ def export_packed_images(base_out_dir: str, images: dict) -> list[str]:
             written.append(dest)
         finally:
             bpy.data.images.remove(tmp)
-    return written
+    reports: list[ImageReport] = []
+    if optimize:
+        reports = [optimize_png_file(path) for path in written
+                   if path.lower().endswith(".png")]
+    return written, reports
 
 
 # ---------------------------------------------------------------------------
@@ -29,10 +29,20 @@ sharing are preserved everywhere else.
 This operates on the plain-dict ``info`` produced by analyzer.analyze_node_group
 (reroutes already inlined, links already node-to-node), so no live bpy data is
 touched here.
+
+Children are spliced top-down, breadth-first, rather than flattened bottom-up
+once and memoized: a cached flattened child would splice its grandchildren
+depth-first, and a boundary link or input default can only be rewired once the
+parent's own sources are known. Either way the node and link order would move,
+and that order reaches the generated code, so every module (and every build
+fingerprint) would change for no behavioural gain. What is cached per compile
+is each child's splice data (_ChildTemplate), which keeps a splice at
+O(child + links at the group node).
 """
 
 from __future__ import annotations
-import copy
+from collections import deque
+from typing import NamedTuple
 
 _GI = "GROUP_INPUT"
 _GO = "GROUP_OUTPUT"
@@ -104,33 +114,255 @@ def needs_flatten(info: dict, infos: dict, memo: dict) -> bool:
 # ---------------------------------------------------------------------------
 # Flatten
 # ---------------------------------------------------------------------------
+#
+# Splice order is part of the output: nodes and links are emitted in the order
+# the splices leave them, and that order reaches the generated code. Inline
+# targets are processed FIFO — the parent's own targets in node order, then the
+# targets each splice brings in, in the order they were appended — with every
+# splice removing its group node in place and appending the child's interior
+# (and new links) at the end. The state below keeps exactly that order while
+# making each splice cost O(child + links at the group node): nodes live in an
+# insertion-ordered dict, links in an id-ordered dict indexed by endpoint, and
+# each child's splice data is prepared once (_ChildTemplate) however often it
+# is inlined.
+
+
+class _ChildTemplate(NamedTuple):
+    """A nested group's splice data, prepared once per flatten (or per compile)."""
+    interior: list          # child nodes minus Group Input / Output, unprefixed
+    gi_vars: frozenset
+    go_vars: frozenset
+    name_to_idx: dict       # INPUT interface socket name → group node input index
+    links: list             # child links, read-only
+
+
+def _child_template(name: str, infos: dict, templates: dict) -> _ChildTemplate:
+    tpl = templates.get(name)
+    if tpl is None:
+        child = infos[name]
+        name_to_idx: dict[str, int] = {}
+        idx = 0
+        for s in child["interface"]:
+            if s.get("item_kind", "socket") == "socket" and s["in_out"] == "INPUT":
+                name_to_idx[s["name"]] = idx
+                idx += 1
+        tpl = _ChildTemplate(
+            interior=[n for n in child["nodes"] if n["type"] not in (_GI, _GO)],
+            gi_vars=frozenset(n["var_name"] for n in child["nodes"] if n["type"] == _GI),
+            go_vars=frozenset(n["var_name"] for n in child["nodes"] if n["type"] == _GO),
+            name_to_idx=name_to_idx,
+            links=child["links"],
+        )
+        templates[name] = tpl
+    return tpl
+
+
+def _clone(node: dict) -> dict:
+    """
+    Copy of *node* that splices may write to. Only ``input_defaults`` is ever
+    written (see _Splicer._set_default), so that is the one nested value copied;
+    ramps, curves, attributes etc. stay shared with the read-only analyzed info.
+    """
+    nc = dict(node)
+    if "input_defaults" in nc:
+        nc["input_defaults"] = dict(nc["input_defaults"])
+    return nc
+
+
+class _Splicer:
+    """Ordered node / link state of one flatten_info() call."""
+
+    def __init__(self, nodes: list, links: list):
+        self.nodes: dict[str, dict] = {n["var_name"]: _clone(n) for n in nodes}
+        self.links: dict[int, dict] = {}
+        self.by_from: dict[str, list[int]] = {}
+        self.by_to: dict[str, list[int]] = {}
+        self._next_id = 0
+        for lnk in links:
+            self.add_link(dict(lnk))
+
+    def add_link(self, lnk: dict) -> None:
+        lid = self._next_id
+        self._next_id += 1
+        self.links[lid] = lnk
+        self.by_from.setdefault(lnk["from_var"], []).append(lid)
+        self.by_to.setdefault(lnk["to_var"], []).append(lid)
+
+    def live(self, ids: list[int]) -> list[dict]:
+        return [self.links[i] for i in ids if i in self.links]
+
+    @staticmethod
+    def _set_default(node_dict, sock_index, value):
+        node_dict.setdefault("input_defaults", {})[sock_index] = value
+
+    def splice(self, gvar: str, tpl: _ChildTemplate) -> list[dict]:
+        """
+        Replace group node *gvar* by *tpl*'s interior (standard 'ungroup').
+        Returns the new interior nodes, in order.
+        """
+        group_node = self.nodes[gvar]
+        prefix = gvar + "__"
+        group_defaults = group_node.get("input_defaults", {})
+
+        # Parent links touching the group node, indexed by boundary socket
+        # name, in link order.
+        in_source: dict[str, list[tuple]] = {}    # sockName → [(from_var, fsn, fsi), ...]
+        out_consumers: dict[str, list[tuple]] = {}  # sockName → [(to_var, tsn, tsi), ...]
+        to_ids = self.by_to.pop(gvar, [])
+        from_ids = self.by_from.pop(gvar, [])
+        for lnk in self.live(to_ids):
+            in_source.setdefault(lnk["to_socket_name"], []).append(
+                (lnk["from_var"], lnk["from_socket_name"], lnk["from_socket_index"])
+            )
+        for lnk in self.live(from_ids):
+            out_consumers.setdefault(lnk["from_socket_name"], []).append(
+                (lnk["to_var"], lnk["to_socket_name"], lnk["to_socket_index"])
+            )
+
+        # The child's interior nodes with prefixed var names.
+        remap: dict[str, str] = {}
+        new_child_nodes: list[dict] = []
+        for cn in tpl.interior:
+            nc = _clone(cn)
+            nc["var_name"] = prefix + cn["var_name"]
+            remap[cn["var_name"]] = nc["var_name"]
+            new_child_nodes.append(nc)
+        nc_by_var = {nc["var_name"]: nc for nc in new_child_nodes}
+
+        def _parent_default(sock_name):
+            i = tpl.name_to_idx.get(sock_name)
+            if i is not None and i in group_defaults:
+                return True, group_defaults[i]
+            return False, None
+
+        new_links: list[dict] = []
+        for lnk in tpl.links:
+            f, t = lnk["from_var"], lnk["to_var"]
+            f_gi, t_go = f in tpl.gi_vars, t in tpl.go_vars
+
+            if f_gi and t_go:
+                # passthrough: group input → group output
+                sources = in_source.get(lnk["from_socket_name"], [])
+                consumers = out_consumers.get(lnk["to_socket_name"], [])
+                if sources:
+                    for fv, fsn, fsi in sources:
+                        for tv, tsn, tsi in consumers:
+                            new_links.append(_link(fv, fsn, fsi, tv, tsn, tsi))
+                else:
+                    has, val = _parent_default(lnk["from_socket_name"])
+                    if has:
+                        for tv, tsn, tsi in consumers:
+                            pn = self.nodes.get(tv)
+                            if pn is not None:
+                                self._set_default(pn, tsi, val)
+                continue
 
-def flatten_info(info: dict, infos: dict, memo: dict) -> dict:
+            if f_gi:
+                # group input → interior consumer
+                consumer = remap.get(t)
+                if consumer is None:
+                    continue
+                sources = in_source.get(lnk["from_socket_name"], [])
+                if sources:
+                    for fv, fsn, fsi in sources:
+                        new_links.append(
+                            _link(fv, fsn, fsi, consumer, lnk["to_socket_name"], lnk["to_socket_index"])
+                        )
+                else:
+                    has, val = _parent_default(lnk["from_socket_name"])
+                    if has:
+                        self._set_default(nc_by_var[consumer], lnk["to_socket_index"], val)
+                continue
+
+            if t_go:
+                # interior producer → group output
+                producer = remap.get(f)
+                if producer is None:
+                    continue
+                for tv, tsn, tsi in out_consumers.get(lnk["to_socket_name"], []):
+                    new_links.append(
+                        _link(producer, lnk["from_socket_name"], lnk["from_socket_index"], tv, tsn, tsi)
+                    )
+                continue
+
+            # interior → interior
+            fv, tv = remap.get(f), remap.get(t)
+            if fv is None or tv is None:
+                continue
+            nl = dict(lnk)
+            nl["from_var"], nl["to_var"] = fv, tv
+            new_links.append(nl)
+
+        # Drop the group node and its links; the interior and new links go last.
+        del self.nodes[gvar]
+        for lid in to_ids + from_ids:
+            self.links.pop(lid, None)
+        for nc in new_child_nodes:
+            self.nodes[nc["var_name"]] = nc
+        for nl in new_links:
+            self.add_link(nl)
+        return new_child_nodes
+
+
+def prepare_flatten(info: dict, infos: dict, memo: dict, templates: dict) -> None:
+    """
+    Fill *memo* and *templates* with everything flatten_info(info, infos, memo,
+    templates) will look up — the inline decision for every group node it will
+    meet and the template of every child it will splice — so the flatten itself
+    only reads them and can run on a worker thread.
+    """
+    seen: set[str] = set()
+    stack = [info["nodes"]]
+    while stack:
+        for n in stack.pop():
+            name = n.get("node_tree_name") if n["type"] == "GROUP" else None
+            if (name in infos and name not in seen
+                    and group_needs_inline(name, infos, memo)):
+                seen.add(name)
+                stack.append(_child_template(name, infos, templates).interior)
+
+
+def flatten_info(info: dict, infos: dict, memo: dict, templates: dict | None = None) -> dict:
     """
     Return a NEW info dict whose inline-forcing nested groups are inlined
     (those transitively carrying an Attribute node or a placeholder image).
 
     The top interface, name, type, color_tag, description and bl_label are kept
     unchanged — only ``nodes`` / ``links`` (and the derived image/uv/nested-group
-    bookkeeping) change.
+    bookkeeping) change. *templates* caches each child's splice data; pass one
+    dict for a whole compile to share it across parents.
     """
-    nodes = copy.deepcopy(info["nodes"])
-    links = copy.deepcopy(info["links"])
+    if templates is None:
+        templates = {}
+
+    def _is_target(n):
+        return (n["type"] == "GROUP"
+                and n.get("node_tree_name") in infos
+                and group_needs_inline(n["node_tree_name"], infos, memo))
+
+    state = _Splicer(info["nodes"], info["links"])
+    queue = deque(var for var, n in state.nodes.items() if _is_target(n))
     inlined_children: list[str] = []
 
-    while True:
-        target = None
-        for n in nodes:
-            if (n["type"] == "GROUP"
-                    and n.get("node_tree_name") in infos
-                    and group_needs_inline(n["node_tree_name"], infos, memo)):
-                target = n
-                break
-        if target is None:
-            break
-        nodes, links = _inline_one(target, nodes, links, infos)
-        inlined_children.append(target["node_tree_name"])
+    while queue:
+        gvar = queue.popleft()
+        cname = state.nodes[gvar]["node_tree_name"]
+        added = state.splice(gvar, _child_template(cname, infos, templates))
+        queue.extend(nc["var_name"] for nc in added if _is_target(nc))
+        inlined_children.append(cname)
+
+    # Carry forward predefined (packed) textures from every inlined child so the
+    # exporter still writes them; the caller dedupes by filename.
+    predefined = list(info.get("_predefined_images", []))
+    for cname in inlined_children:
+        cinfo = infos.get(cname)
+        if cinfo:
+            predefined.extend(cinfo.get("_predefined_images", []))
+    return _with_nodes(info, list(state.nodes.values()), list(state.links.values()), predefined)
 
+
+def _with_nodes(info: dict, nodes: list, links: list, predefined: list) -> dict:
+    """Copy of *info* carrying *nodes* / *links* and the bookkeeping derived from them."""
     new_info = dict(info)
     new_info["nodes"] = nodes
     new_info["links"] = links
@@ -157,104 +389,256 @@ def flatten_info(info: dict, infos: dict, memo: dict) -> dict:
             seen.add(tn)
             nested.append(tn)
     new_info["nested_groups"] = nested
-
-    # Carry forward predefined (packed) textures from every inlined child so the
-    # exporter still writes them; the caller dedupes by filename.
-    predefined = list(info.get("_predefined_images", []))
-    for cname in inlined_children:
-        cinfo = infos.get(cname)
-        if cinfo:
-            predefined.extend(cinfo.get("_predefined_images", []))
     new_info["_predefined_images"] = predefined
-
     return new_info
 
 
-def _inline_one(group_node: dict, nodes: list, links: list, infos: dict):
-    """
-    Splice the child group referenced by *group_node* into the parent node/link
-    lists (standard recursive 'ungroup'). Returns new (nodes, links) lists.
+# ---------------------------------------------------------------------------
+# Hoist split (opt-in)
+# ---------------------------------------------------------------------------
+#
+# Plain inlining gives every parent a private copy of the whole child, and the
+# copies multiply up the hierarchy. Only the inline-forcing nodes actually have
+# to leave the shared datablock, so a split child keeps the rest as a shared
+# "core" group:
+#
+#   * hoisted = the forcing nodes of the (split-flattened) child plus everything
+#     upstream of them inside the child, so the parent stays acyclic;
+#   * core    = the remaining nodes, compiled as their own class. Its interface
+#     is the child's, plus one extra input (in a trailing panel, so the original
+#     socket indices don't move) per hoisted output the core consumes.
+#
+# In the parent, the group node is re-pointed at the core, the hoisted nodes are
+# spliced in beside it and wired to the core's extra inputs, and parent links
+# from outputs that a hoisted node feeds directly are re-sourced from it.
+# Applied bottom-up, a split parent's hoisted nodes are split out again for its
+# own parents, so the forcing nodes still bubble up to the topmost compiled node.
+
+_SOCKET_TYPES = {
+    "VALUE":   "NodeSocketFloat",
+    "INT":     "NodeSocketInt",
+    "BOOLEAN": "NodeSocketBool",
+    "VECTOR":  "NodeSocketVector",
+    "RGBA":    "NodeSocketColor",
+    "SHADER":  "NodeSocketShader",
+    "STRING":  "NodeSocketString",
+}
+_HOIST_PANEL = "__hoisted__"
+
+
+class SplitPlan(NamedTuple):
+    """How parents splice a split child; built once per child by plan_split()."""
+    core_ref: str           # node_tree_name the parent's group node is re-pointed at
+    core: dict              # the core's info (the caller names it / sets bl_label)
+    hoisted: list           # hoisted node dicts, unprefixed
+    hoisted_vars: frozenset
+    gi_vars: frozenset
+    go_vars: frozenset
+    name_to_idx: dict       # INPUT interface socket name → group node input index
+    extra: dict             # (hoisted var, output index) → extra core input index
+    input_names: list       # group node input roster once pointed at the core
+    links: list             # the split-flattened child's links, read-only
+    predefined: list        # the child's predefined images
+
+
+def plan_split(flat: dict, core_ref: str, hoist_uv: bool = False) -> SplitPlan | None:
     """
-    child = infos[group_node["node_tree_name"]]
-    gvar = group_node["var_name"]
-    prefix = gvar + "__"
+    Split the flattened child *flat* into hoisted nodes and a shared core.
 
-    gi_vars = {n["var_name"] for n in child["nodes"] if n["type"] == _GI}
-    go_vars = {n["var_name"] for n in child["nodes"] if n["type"] == _GO}
+    With *hoist_uv* UV Map nodes are hoisted too, as the instance wrapper needs
+    every node the compiled node's own properties write to.
 
-    # child INPUT interface socket name → its index in the group node's inputs
+    Returns None when a split would not pay off or cannot be expressed: nothing
+    forces inlining, every interior node would be hoisted anyway, or a hoisted
+    output feeding the core has no interface socket type.
+    """
+    nodes, links = flat["nodes"], flat["links"]
+    by_var = {n["var_name"]: n for n in nodes}
+    gi_vars = frozenset(v for v, n in by_var.items() if n["type"] == _GI)
+    go_vars = frozenset(v for v, n in by_var.items() if n["type"] == _GO)
+
+    feeders: dict[str, list[str]] = {}
+    for lnk in links:
+        feeders.setdefault(lnk["to_var"], []).append(lnk["from_var"])
+    hoisted_vars: set[str] = set()
+    stack = [n["var_name"] for n in nodes
+             if _forces_inline(n) or (hoist_uv and n["type"] == "UVMAP")]
+    while stack:
+        var = stack.pop()
+        if var in hoisted_vars or var in gi_vars or var in go_vars or var not in by_var:
+            continue
+        hoisted_vars.add(var)
+        stack.extend(feeders.get(var, ()))
+    if not hoisted_vars or len(hoisted_vars) + len(gi_vars) + len(go_vars) == len(nodes):
+        return None
+
+    # One extra core input per distinct hoisted output the core reads.
+    extra: dict[tuple[str, int], int] = {}
+    extra_items: list[dict] = []
+    for lnk in links:
+        f, t = lnk["from_var"], lnk["to_var"]
+        if f not in hoisted_vars or t in hoisted_vars or t in go_vars:
+            continue
+        key = (f, lnk["from_socket_index"])
+        if key in extra:
+            continue
+        types = by_var[f].get("output_socket_types") or []
+        socket_type = (_SOCKET_TYPES.get(types[key[1]])
+                       if key[1] < len(types) else None)
+        if socket_type is None:
+            return None
+        extra[key] = len(extra_items)
+        extra_items.append(_hoist_socket(
+            f"{by_var[f]['name']}: {lnk['from_socket_name']}", socket_type))
+
+    input_names = [
+        s["name"] for s in flat["interface"]
+        if s.get("item_kind", "socket") == "socket" and s["in_out"] == "INPUT"
+    ]
     name_to_idx: dict[str, int] = {}
-    idx = 0
-    for s in child["interface"]:
-        if s.get("item_kind", "socket") == "socket" and s["in_out"] == "INPUT":
-            name_to_idx[s["name"]] = idx
-            idx += 1
+    for i, name in enumerate(input_names):
+        name_to_idx.setdefault(name, i)
+    n_inputs = len(input_names)
+    extra_names = [item["name"] for item in extra_items]
+
+    # The core: everything not hoisted, reading hoisted values from the extras.
+    core_nodes = [_clone(n) for n in nodes if n["var_name"] not in hoisted_vars]
+    core_links = [
+        dict(lnk) for lnk in links
+        if lnk["from_var"] not in hoisted_vars and lnk["to_var"] not in hoisted_vars
+    ]
+    if extra_items:
+        gi = next((n for n in core_nodes if n["type"] == _GI), None)
+        if gi is None:
+            gi = _group_input_node(input_names)
+            core_nodes.insert(0, gi)
+        names = list(gi.get("output_socket_names") or input_names)
+        gi["output_socket_names"] = names[:n_inputs] + extra_names + names[n_inputs:]
+        for lnk in links:
+            k = extra.get((lnk["from_var"], lnk["from_socket_index"]))
+            if k is None or lnk["to_var"] in hoisted_vars or lnk["to_var"] in go_vars:
+                continue
+            core_links.append(_link(gi["var_name"], extra_names[k], n_inputs + k,
+                                    lnk["to_var"], lnk["to_socket_name"], lnk["to_socket_index"]))
+    core_interface = list(flat["interface"])
+    if extra_items:
+        core_interface.append({
+            "item_kind":      "panel",
+            "name":           "Hoisted",
+            "description":    "",
+            "default_closed": True,
+            "identifier":     _HOIST_PANEL,
+            "parent_id":      None,
+        })
+        core_interface.extend(extra_items)
+    core_images = {n.get("image_name") for n in core_nodes if n.get("image_name")}
+    core = _with_nodes(
+        dict(flat, interface=core_interface), core_nodes, core_links,
+        [(fn, img) for fn, img in flat.get("_predefined_images", []) if fn in core_images],
+    )
+
+    return SplitPlan(
+        core_ref=core_ref,
+        core=core,
+        hoisted=[n for n in nodes if n["var_name"] in hoisted_vars],
+        hoisted_vars=frozenset(hoisted_vars),
+        gi_vars=gi_vars,
+        go_vars=go_vars,
+        name_to_idx=name_to_idx,
+        extra=extra,
+        input_names=input_names + extra_names,
+        links=links,
+        predefined=list(flat.get("_predefined_images", [])),
+    )
+
+
+def _hoist_socket(name: str, socket_type: str) -> dict:
+    return {
+        "item_kind":        "socket",
+        "name":             name,
+        "in_out":           "INPUT",
+        "socket_type":      socket_type,
+        "description":      "",
+        "default_value":    None,
+        "min_value":        None,
+        "max_value":        None,
+        "subtype":          "NONE",
+        "hide_value":       False,
+        "hide_in_modifier": False,
+        "dimensions":       None,
+        "identifier":       None,
+        "parent_id":        _HOIST_PANEL,
+    }
 
-    group_defaults = group_node.get("input_defaults", {})
 
-    # Parent links touching the group node, indexed by boundary socket name.
-    in_source: dict[str, list[tuple]] = {}    # sockName → [(from_var, fsn, fsi), ...]
-    out_consumers: dict[str, list[tuple]] = {}  # sockName → [(to_var, tsn, tsi), ...]
-    for lnk in links:
-        if lnk["to_var"] == gvar:
-            in_source.setdefault(lnk["to_socket_name"], []).append(
-                (lnk["from_var"], lnk["from_socket_name"], lnk["from_socket_index"])
-            )
-        if lnk["from_var"] == gvar:
-            out_consumers.setdefault(lnk["from_socket_name"], []).append(
-                (lnk["to_var"], lnk["to_socket_name"], lnk["to_socket_index"])
-            )
+def _group_input_node(input_names: list) -> dict:
+    """A bare Group Input node for a core whose child had none."""
+    return {
+        "var_name":            "Group_Input_hoisted",
+        "name":                "Group Input",
+        "type":                _GI,
+        "bl_idname":           "NodeGroupInput",
+        "location":            (0.0, 0.0),
+        "width":               140.0,
+        "label":               "",
+        "hide":                False,
+        "attributes":          {},
+        "input_defaults":      {},
+        "output_defaults":     {},
+        "input_socket_names":  [],
+        "output_socket_names": list(input_names) + [""],
+        "node_tree_name":      None,
+        "repeat_items":        [],
+        "color_ramp":          None,
+        "curve_mapping":       None,
+        "enum_items":          [],
+        "index_switch_count":  None,
+        "active_index":        None,
+    }
 
-    # Copy the child's interior nodes (drop Group In/Out) with prefixed var names.
-    remap: dict[str, str] = {}
-    new_child_nodes: list[dict] = []
-    for cn in child["nodes"]:
-        if cn["type"] in (_GI, _GO):
-            continue
-        nc = copy.deepcopy(cn)
-        nc["var_name"] = prefix + cn["var_name"]
-        remap[cn["var_name"]] = nc["var_name"]
-        new_child_nodes.append(nc)
 
-    nc_by_var = {nc["var_name"]: nc for nc in new_child_nodes}
-    parent_by_var = {n["var_name"]: n for n in nodes}
+def _split_splice(state: _Splicer, gvar: str, plan: SplitPlan) -> list[dict]:
+    """
+    Re-point group node *gvar* at *plan*'s core and splice the hoisted nodes in
+    beside it. Returns the new hoisted nodes, in order.
+    """
+    group_node = state.nodes[gvar]
+    prefix = gvar + "__"
+    group_defaults = group_node.get("input_defaults", {})
 
-    def _set_default(node_dict, sock_index, value):
-        node_dict.setdefault("input_defaults", {})[sock_index] = value
+    in_source: dict[str, list[tuple]] = {}
+    for lnk in state.live(state.by_to.get(gvar, [])):
+        in_source.setdefault(lnk["to_socket_name"], []).append(
+            (lnk["from_var"], lnk["from_socket_name"], lnk["from_socket_index"])
+        )
+    out_ids: dict[int, list[int]] = {}          # output index → parent link ids
+    for lid in state.by_from.get(gvar, []):
+        lnk = state.links.get(lid)
+        if lnk is not None:
+            out_ids.setdefault(lnk["from_socket_index"], []).append(lid)
 
-    def _parent_default(sock_name):
-        i = name_to_idx.get(sock_name)
-        if i is not None and i in group_defaults:
-            return True, group_defaults[i]
-        return False, None
+    remap: dict[str, str] = {}
+    new_nodes: list[dict] = []
+    for hn in plan.hoisted:
+        nc = _clone(hn)
+        nc["var_name"] = prefix + hn["var_name"]
+        remap[hn["var_name"]] = nc["var_name"]
+        new_nodes.append(nc)
+    nc_by_var = {nc["var_name"]: nc for nc in new_nodes}
 
     new_links: list[dict] = []
-    for lnk in child["links"]:
+    dropped: set[int] = set()
+    wired: set[int] = set()
+    n_inputs = len(plan.input_names) - len(plan.extra)
+    for lnk in plan.links:
         f, t = lnk["from_var"], lnk["to_var"]
-        f_gi, t_go = f in gi_vars, t in go_vars
-
-        if f_gi and t_go:
-            # passthrough: group input → group output
-            sources = in_source.get(lnk["from_socket_name"], [])
-            consumers = out_consumers.get(lnk["to_socket_name"], [])
-            if sources:
-                for fv, fsn, fsi in sources:
-                    for tv, tsn, tsi in consumers:
-                        new_links.append(_link(fv, fsn, fsi, tv, tsn, tsi))
-            else:
-                has, val = _parent_default(lnk["from_socket_name"])
-                if has:
-                    for tv, tsn, tsi in consumers:
-                        pn = parent_by_var.get(tv)
-                        if pn is not None:
-                            _set_default(pn, tsi, val)
-            continue
+        f_in, t_in = f in plan.hoisted_vars, t in plan.hoisted_vars
+        if not f_in and not t_in:
+            continue                            # stays inside the core
 
-        if f_gi:
-            # group input → interior consumer
-            consumer = remap.get(t)
-            if consumer is None:
-                continue
+        if f in plan.gi_vars:
+            # group input → hoisted consumer: take the parent's source directly
+            consumer = remap[t]
             sources = in_source.get(lnk["from_socket_name"], [])
             if sources:
                 for fv, fsn, fsi in sources:
@@ -262,35 +646,134 @@ def _inline_one(group_node: dict, nodes: list, links: list, infos: dict):
                         _link(fv, fsn, fsi, consumer, lnk["to_socket_name"], lnk["to_socket_index"])
                     )
             else:
-                has, val = _parent_default(lnk["from_socket_name"])
-                if has:
-                    _set_default(nc_by_var[consumer], lnk["to_socket_index"], val)
+                i = plan.name_to_idx.get(lnk["from_socket_name"])
+                if i is not None and i in group_defaults:
+                    state._set_default(nc_by_var[consumer], lnk["to_socket_index"], group_defaults[i])
             continue
 
-        if t_go:
-            # interior producer → group output
-            producer = remap.get(f)
-            if producer is None:
-                continue
-            for tv, tsn, tsi in out_consumers.get(lnk["to_socket_name"], []):
-                new_links.append(
-                    _link(producer, lnk["from_socket_name"], lnk["from_socket_index"], tv, tsn, tsi)
-                )
-            continue
+        producer = remap[f]
+        if t_in:
+            nl = dict(lnk)
+            nl["from_var"], nl["to_var"] = producer, remap[t]
+            new_links.append(nl)
+        elif t in plan.go_vars:
+            # hoisted producer → group output: its parent consumers read the
+            # hoisted node instead (that core output is left unlinked)
+            for lid in out_ids.get(lnk["to_socket_index"], []):
+                pl = state.links[lid]
+                new_links.append(_link(producer, lnk["from_socket_name"], lnk["from_socket_index"],
+                                       pl["to_var"], pl["to_socket_name"], pl["to_socket_index"]))
+                dropped.add(lid)
+        else:
+            # hoisted producer → core: through the core's extra input
+            k = plan.extra[(f, lnk["from_socket_index"])]
+            if k not in wired:
+                wired.add(k)
+                new_links.append(_link(producer, lnk["from_socket_name"], lnk["from_socket_index"],
+                                       gvar, plan.input_names[n_inputs + k], n_inputs + k))
+
+    group_node["node_tree_name"] = plan.core_ref
+    group_node["input_socket_names"] = list(plan.input_names)
+    for lid in dropped:
+        state.links.pop(lid, None)
+    for nc in new_nodes:
+        state.nodes[nc["var_name"]] = nc
+    for nl in new_links:
+        state.add_link(nl)
+    return new_nodes
+
+
+def hoist_flatten_info(info: dict, infos: dict, memo: dict, plans: dict,
+                       templates: dict | None = None) -> dict:
+    """
+    flatten_info() for the hoist split: a nested group with a SplitPlan in
+    *plans* (ng.name → plan) keeps its core as a shared sub-group and only its
+    hoisted nodes are spliced in; other inline-forcing groups are inlined whole.
+    """
+    if templates is None:
+        templates = {}
 
-        # interior → interior
-        fv, tv = remap.get(f), remap.get(t)
-        if fv is None or tv is None:
-            continue
-        nl = dict(lnk)
-        nl["from_var"], nl["to_var"] = fv, tv
-        new_links.append(nl)
-
-    result_nodes = [n for n in nodes if n["var_name"] != gvar] + new_child_nodes
-    result_links = [
-        lnk for lnk in links if lnk["from_var"] != gvar and lnk["to_var"] != gvar
-    ] + new_links
-    return result_nodes, result_links
+    def _is_target(n):
+        return (n["type"] == "GROUP"
+                and n.get("node_tree_name") in infos
+                and group_needs_inline(n["node_tree_name"], infos, memo))
+
+    state = _Splicer(info["nodes"], info["links"])
+    queue = deque(var for var, n in state.nodes.items() if _is_target(n))
+    predefined = list(info.get("_predefined_images", []))
+
+    while queue:
+        gvar = queue.popleft()
+        cname = state.nodes[gvar]["node_tree_name"]
+        plan = plans.get(cname)
+        if plan is not None:
+            added = _split_splice(state, gvar, plan)
+            predefined.extend(plan.predefined)
+        else:
+            added = state.splice(gvar, _child_template(cname, infos, templates))
+            predefined.extend(infos[cname].get("_predefined_images", []))
+        queue.extend(nc["var_name"] for nc in added if _is_target(nc))
+
+    return _with_nodes(info, list(state.nodes.values()), list(state.links.values()), predefined)
+
+
+# ---------------------------------------------------------------------------
+# Instance wrapper (opt-in)
+# ---------------------------------------------------------------------------
+#
+# A compiled node's image and UV Map properties are written into its own tree,
+# so valuesUpdate gives each instance that sets them a private copy of the
+# whole tree. The wrapper makes that copy small: the group's own tree becomes
+# Group Input / Output, the nodes those properties write to (the hoisted nodes
+# of a plan_split(..., hoist_uv=True) plan) and one group node running the rest
+# as the plan's shared core. Copying a tree does not copy the node groups it
+# references, so every instance keeps reading the same core datablock.
+
+_WRAP_BODY = "Body"
+
+
+def wrap_split(flat: dict, plan: SplitPlan) -> dict:
+    """
+    The instance wrapper of the flattened SHADER group *flat*: its interface,
+    *plan*'s hoisted nodes and one group node pointing at ``plan.core_ref``.
+    """
+    sockets = [s for s in flat["interface"] if s.get("item_kind", "socket") == "socket"]
+    in_names = [s["name"] for s in sockets if s["in_out"] == "INPUT"]
+    out_names = [s["name"] for s in sockets if s["in_out"] == "OUTPUT"]
+
+    xs = [n["location"][0] for n in flat["nodes"]] or [0.0]
+    ends = {n["type"]: tuple(n["location"]) for n in flat["nodes"] if n["type"] in (_GI, _GO)}
+    gi_loc = ends.get(_GI, (min(xs) - 300.0, 0.0))
+    go_loc = ends.get(_GO, (max(xs) + 300.0, 0.0))
+    bare = _group_input_node([])
+    nodes = [
+        dict(bare, var_name="Group_Input", location=gi_loc,
+             output_socket_names=in_names + [""]),
+        dict(bare, var_name=_WRAP_BODY, name=_WRAP_BODY, type="GROUP",
+             bl_idname="ShaderNodeGroup", location=(go_loc[0] - 300.0, go_loc[1]),
+             input_socket_names=list(in_names), output_socket_names=list(out_names)),
+        dict(bare, var_name="Group_Output", name="Group Output", type=_GO,
+             bl_idname="NodeGroupOutput", location=go_loc,
+             input_socket_names=out_names + [""], output_socket_names=[]),
+    ]
+    links = [_link("Group_Input", name, i, _WRAP_BODY, name, i)
+             for i, name in enumerate(in_names)]
+    links += [_link(_WRAP_BODY, name, i, "Group_Output", name, i)
+              for i, name in enumerate(out_names)]
+
+    state = _Splicer(nodes, links)
+    _split_splice(state, _WRAP_BODY, plan)
+
+    prefix = _WRAP_BODY + "__"
+    images = {n.get("image_name") for n in plan.hoisted if n.get("image_name")}
+    return _with_nodes(
+        dict(flat, zone_pairs=[
+            (prefix + a, prefix + b) for a, b in flat.get("zone_pairs", ())
+            if a in plan.hoisted_vars and b in plan.hoisted_vars
+        ]),
+        list(state.nodes.values()), list(state.links.values()),
+        [(fn, img) for fn, img in plan.predefined if fn in images],
+    )
 
 
 def _link(fv, fsn, fsi, tv, tsn, tsi) -> dict:
@@ -81,7 +81,8 @@ def write_geometry_hashes(out_dir: str, groups: list) -> str:
     os.makedirs(geo_dir, exist_ok=True)
     hashes_path = os.path.join(geo_dir, _HASHES_NAME)
 
-    manifest = {ng.name: hash_node_tree(ng) for ng in groups}
+    hash_memo: dict = {}
+    manifest = {ng.name: hash_node_tree(ng, hash_memo) for ng in groups}
     with open(hashes_path, "w", encoding="utf-8") as fh:
         json.dump(manifest, fh, indent=2, sort_keys=True)
     return hashes_path
@@ -0,0 +1,195 @@
+"""
+Lossless PNG optimizer for exported textures.
+
+export_packed_images() saves each predefined texture the way Blender writes it:
+default zlib level plus metadata chunks (EXIF, offsets, text). The optimized
+image profile rewrites each exported PNG, pixel for pixel:
+
+* chunks that carry no pixel or colour data (text, time, physical size, ...)
+  are dropped; palette, transparency and colour-space chunks are kept;
+* the pixel stream is re-encoded with zlib level 9;
+* small images (ramps, lookup tables — up to _PIXEL_PASS_LIMIT bytes of pixel
+  data, since the passes run in pure Python) are also unfiltered: one whose
+  rows are all the same (a horizontal ramp) is cut down to one row, one whose
+  columns are all the same to one column — Image Texture nodes sample it
+  exactly as before, at every interpolation and extension mode — and a few
+  filter strategies are tried, keeping the smallest result.
+
+The file is replaced only when the result is not larger, and gets a private
+``lsPo`` chunk so later exports skip it. File names and formats are unchanged,
+so the generated code that references them is unaffected.
+
+Like build_manifest.py this module is bpy-free and can be run under system
+Python.
+"""
+
+from __future__ import annotations
+import os
+import struct
+import zlib
+from typing import NamedTuple
+
+_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_MARKER = b"lsPo"
+# Ancillary chunks that change how pixels are read; everything else is dropped.
+_KEEP = frozenset({b"PLTE", b"tRNS", b"gAMA", b"cHRM", b"sRGB", b"iCCP", b"sBIT"})
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+_PIXEL_PASS_LIMIT = 256 * 1024
+
+
+class ImageReport(NamedTuple):
+    """One exported image: sizes in bytes before / after, and what was done."""
+    filename: str
+    before: int
+    after: int
+    note: str
+
+
+def _chunks(data: bytes) -> list[tuple[bytes, bytes]]:
+    if not data.startswith(_SIGNATURE):
+        raise ValueError("not a PNG file")
+    out = []
+    pos = len(_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        out.append((kind, data[pos + 8:pos + 8 + length]))
+        pos += 12 + length
+        if kind == b"IEND":
+            break
+    return out
+
+
+def _chunk(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(
+        ">I", zlib.crc32(kind + body) & 0xFFFFFFFF)
+
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _unfilter(raw: bytes, height: int, stride: int, bpp: int) -> list[bytes]:
+    rows: list[bytes] = []
+    prior = bytes(stride)
+    pos = 0
+    for _y in range(height):
+        ftype = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        if ftype == 1:
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif ftype == 2:
+            line = bytearray((a + b) & 0xFF for a, b in zip(line, prior))
+        elif ftype == 3:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + prior[i]) >> 1)) & 0xFF
+        elif ftype == 4:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                corner = prior[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + _paeth(left, prior[i], corner)) & 0xFF
+        elif ftype != 0:
+            raise ValueError(f"bad filter type {ftype}")
+        prior = bytes(line)
+        rows.append(prior)
+    return rows
+
+
+def _filtered(rows: list[bytes], bpp: int, ftype: int) -> bytes:
+    """Every row under one filter: 0 (None), 1 (Sub) or 2 (Up)."""
+    out = bytearray()
+    prior = bytes(len(rows[0])) if rows else b""
+    for row in rows:
+        out.append(ftype)
+        if ftype == 0:
+            out += row
+        elif ftype == 1:
+            out += row[:bpp]
+            out += bytes((a - b) & 0xFF for a, b in zip(row[bpp:], row))
+        else:
+            out += bytes((a - b) & 0xFF for a, b in zip(row, prior))
+        prior = row
+    return bytes(out)
+
+
+def read_png(data: bytes) -> tuple[dict, list[bytes]]:
+    """``(header, unfiltered rows)`` of a non-interlaced PNG."""
+    chunks = _chunks(data)
+    width, height, depth, ctype, _comp, _filt, interlace = struct.unpack(
+        ">IIBBBBB", chunks[0][1])
+    if interlace:
+        raise ValueError("interlaced PNG")
+    bits = _CHANNELS[ctype] * depth
+    stride, bpp = (width * bits + 7) // 8, max(1, bits // 8)
+    raw = zlib.decompress(b"".join(body for kind, body in chunks if kind == b"IDAT"))
+    header = {"width": width, "height": height, "depth": depth, "color_type": ctype}
+    return header, _unfilter(raw, height, stride, bpp)
+
+
+def optimize_png(data: bytes) -> tuple[bytes, str]:
+    """
+    Re-encode the PNG *data* losslessly. Returns ``(new data, note)``; the new
+    data is *data* itself when the file is already marked or nothing helped.
+    """
+    chunks = _chunks(data)
+    if any(kind == _MARKER for kind, _b in chunks):
+        return data, "already optimized"
+    ihdr = chunks[0][1]
+    width, height, depth, ctype, _comp, _filt, interlace = struct.unpack(">IIBBBBB", ihdr)
+    kept = [_chunk(kind, body) for kind, body in chunks if kind in _KEEP]
+    stream = b"".join(body for kind, body in chunks if kind == b"IDAT")
+    raw = zlib.decompress(stream)
+    candidates = [raw]
+    notes = []
+
+    if not interlace and len(raw) <= _PIXEL_PASS_LIMIT:
+        bits = _CHANNELS[ctype] * depth
+        stride, bpp = (width * bits + 7) // 8, max(1, bits // 8)
+        rows = _unfilter(raw, height, stride, bpp)
+        if height > 1 and all(row == rows[0] for row in rows):
+            rows = rows[:1]
+            notes.append(f"rows {height} -> 1")
+            height = 1
+        if width > 1 and bits >= 8 and all(
+                row == row[:bpp] * width for row in rows):
+            rows = [row[:bpp] for row in rows]
+            notes.append(f"columns {width} -> 1")
+            width = 1
+        if notes:
+            ihdr = struct.pack(">IIBBBBB", width, height, depth, ctype, 0, 0, 0)
+            candidates = []
+        candidates += [_filtered(rows, bpp, ftype) for ftype in (0, 1, 2)]
+
+    idat = min((zlib.compress(c, 9) for c in candidates), key=len)
+    out = b"".join([
+        _SIGNATURE, _chunk(b"IHDR", ihdr), *kept, _chunk(b"IDAT", idat),
+        _chunk(_MARKER, b""), _chunk(b"IEND", b""),
+    ])
+    if len(out) > len(data):
+        return data, "kept (no gain)"
+    return out, ", ".join(notes + ["recompressed"])
+
+
+def optimize_png_file(path: str) -> ImageReport:
+    """Optimize the PNG at *path* in place; other files are reported untouched."""
+    name = os.path.basename(path)
+    with open(path, "rb") as fh:
+        data = fh.read()
+    if not data.startswith(_SIGNATURE):
+        return ImageReport(name, len(data), len(data), "not a PNG")
+    try:
+        out, note = optimize_png(data)
+    except (ValueError, KeyError, struct.error, zlib.error) as exc:
+        return ImageReport(name, len(data), len(data), f"skipped ({exc})")
+    if out is not data:
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(out)
+        os.replace(tmp, path)
+    return ImageReport(name, len(data), len(out), note)
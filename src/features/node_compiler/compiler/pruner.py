@@ -0,0 +1,69 @@
+"""
+Dead-node pruner.
+
+The analyzer captures every non-frame node of a group, including ones nothing
+depends on: debug Value nodes, disconnected experiments, a Math chain whose
+result was unplugged. Each of them would be generated, built at runtime, hashed
+and compiled by EEVEE for nothing.
+
+prune_dead_nodes() keeps a node only when a chain of links leads from it to a
+root, and drops the links that touched a removed node. Roots are:
+
+* every node without output sockets (Group Output, AOV Output, ...);
+* placeholder TEX_IMAGE and UV Map nodes — they back the compiled node's image
+  inputs and UV Map field, so removing one would change its UI;
+* the other half of a live zone (Repeat / Simulation input and output).
+
+It runs on the final (flattened) info just before code generation. Like the
+flattener it works on plain dicts and never mutates its input: analyzed infos
+are shared between the emit workers.
+"""
+
+from __future__ import annotations
+
+
+def prune_dead_nodes(info: dict) -> tuple[dict, int]:
+    """Return ``(info without dead nodes, number of nodes removed)``."""
+    nodes = info["nodes"]
+    exposed = set(info.get("has_image_nodes", ())) | set(info.get("has_uv_nodes", ()))
+
+    upstream: dict[str, list[str]] = {}
+    for lnk in info["links"]:
+        upstream.setdefault(lnk["to_var"], []).append(lnk["from_var"])
+    partner: dict[str, str] = {}
+    for in_var, out_var in info.get("zone_pairs", ()):
+        partner[in_var] = out_var
+        partner[out_var] = in_var
+
+    stack = [
+        n["var_name"] for n in nodes
+        if not n["output_socket_names"] or n["var_name"] in exposed
+    ]
+    live: set[str] = set()
+    while stack:
+        var = stack.pop()
+        if var in live:
+            continue
+        live.add(var)
+        stack.extend(upstream.get(var, ()))
+        if var in partner:
+            stack.append(partner[var])
+
+    kept = [n for n in nodes if n["var_name"] in live]
+    removed = len(nodes) - len(kept)
+    if not removed:
+        return info, 0
+
+    pruned = dict(info)
+    pruned["nodes"] = kept
+    pruned["links"] = [
+        lnk for lnk in info["links"]
+        if lnk["from_var"] in live and lnk["to_var"] in live
+    ]
+    pruned["zone_pairs"] = [p for p in info.get("zone_pairs", ()) if p[0] in live]
+    # Packaged textures only a removed node used are not exported either.
+    images = {n.get("image_name") for n in kept}
+    pruned["_predefined_images"] = [
+        (fn, img) for fn, img in info.get("_predefined_images", ()) if fn in images
+    ]
+    return pruned, removed
@@ -2,6 +2,13 @@
 Reroute Resolver
 Traces NodeReroute chains to find the true source socket,
 so compiled code never needs to create reroute nodes.
+
+``socket.links`` is a Python property that scans the whole tree's links on
+every access, and looking a socket up in its collection compares RNA structs
+one by one, so resolving every input of a large group that way is quadratic.
+The analyzer therefore builds one LinkIndex per tree: a single pass over
+``ng.links`` and over every node's sockets, keyed by ``as_pointer()``.
+resolve_from_socket() / get_socket_index() remain as the per-socket forms.
 """
 
 
@@ -38,3 +45,54 @@ def get_socket_index(socket_collection, target_socket):
         if s == target_socket:
             return i
     return 0
+
+
+class LinkIndex:
+    """
+    Per-tree lookup tables built in one pass:
+
+      * input-socket pointer → the link ``socket.links[0]`` would return
+        (for multi-input sockets: highest ``multi_input_sort_id``, as Blender
+        orders them);
+      * socket pointer → index of the socket in its node's inputs / outputs.
+    """
+
+    def __init__(self, ng):
+        incoming: dict[int, object] = {}
+        for link in ng.links:
+            key = link.to_socket.as_pointer()
+            first = incoming.get(key)
+            if first is None or (getattr(link, "multi_input_sort_id", 0)
+                                 > getattr(first, "multi_input_sort_id", 0)):
+                incoming[key] = link
+        self._incoming = incoming
+
+        positions: dict[int, int] = {}
+        for node in ng.nodes:
+            for i, s in enumerate(node.inputs):
+                positions[s.as_pointer()] = i
+            for i, s in enumerate(node.outputs):
+                positions[s.as_pointer()] = i
+        self._positions = positions
+
+    def resolve(self, socket):
+        """Indexed resolve_from_socket(): (from_node, from_socket) or (None, None)."""
+        link = self._incoming.get(socket.as_pointer())
+        if link is None:
+            return None, None
+        from_node = link.from_node
+        from_socket = link.from_socket
+
+        # Walk through reroutes (a reroute loop can't exist: Blender rejects it)
+        while from_node.type == 'REROUTE':
+            link = self._incoming.get(from_node.inputs[0].as_pointer())
+            if link is None:
+                return None, None
+            from_node = link.from_node
+            from_socket = link.from_socket
+
+        return from_node, from_socket
+
+    def socket_index(self, socket) -> int:
+        """Indexed get_socket_index(): position of *socket* on its node, 0 if unknown."""
+        return self._positions.get(socket.as_pointer(), 0)
@@ -2,56 +2,148 @@
 Topological Sorter
 Returns node groups in bottom-up order (leaves first, roots last),
 so that when a parent group is compiled its child groups already exist.
+
+The sort itself is bpy-free (Kahn's algorithm over a reverse-adjacency map with
+a name-ordered heap, so the order is stable across runs); only
+get_all_node_groups() touches bpy.data.
 """
 
 from __future__ import annotations
-import bpy  # type: ignore
-from collections import defaultdict, deque
+import heapq
+from typing import NamedTuple
 
 
-def topological_sort(node_groups: list) -> list:
-    """
-    Sort *node_groups* so that each group appears AFTER all groups
-    it depends on (i.e. uses as nested ShaderNodeGroup / GeometryNodeGroup).
+class SortResult(NamedTuple):
+    """Outcome of sort_node_groups()."""
+    order: list                     # node groups, leaves first
+    nested: dict[str, list[str]]    # ng.name → distinct GROUP node_tree names, in node order
+    cycles: list[list[str]]         # each dependency cycle's group names (sorted)
+    blocked: list[str]              # groups only ordered after a cycle, not part of one
 
-    Groups that form a cycle are appended at the end (best-effort).
-    """
-    # Build name → ng map and dependency sets
-    all_ngs: dict[str, object] = {ng.name: ng for ng in node_groups}
-    deps: dict[str, set[str]] = defaultdict(set)
 
+def scan_nested_groups(node_groups: list) -> dict[str, list[str]]:
+    """
+    Walk every group's nodes once and return ng.name → the distinct node_tree
+    names its GROUP nodes use, in first-use order. This is the same list the
+    analyzer reports as ``nested_groups``, so it is handed over instead of
+    being collected a second time.
+    """
+    nested: dict[str, list[str]] = {}
     for ng in node_groups:
+        names: dict[str, None] = {}
         for node in ng.nodes:
             if node.type == 'GROUP' and node.node_tree:
-                child = node.node_tree.name
-                if child in all_ngs and child != ng.name:
-                    deps[ng.name].add(child)
+                names.setdefault(node.node_tree.name, None)
+        nested[ng.name] = list(names)
+    return nested
+
+
+def order_names(names: list[str], deps: dict[str, set[str]]) -> tuple[list[str], list[str]]:
+    """
+    Order *names* so every name follows the names it depends on (``deps``).
+
+    Ready names are taken alphabetically, so the order depends only on the
+    graph. Returns ``(order, stuck)``: names in or above a cycle can't be
+    ordered; they are listed in ``stuck`` and appended alphabetically to
+    ``order`` (best-effort).
+    """
+    dependents: dict[str, list[str]] = {n: [] for n in names}
+    in_degree: dict[str, int] = {n: 0 for n in names}
+    for name in names:
+        for child in deps.get(name, ()):
+            dependents[child].append(name)
+            in_degree[name] += 1
 
-    # Kahn's algorithm
-    in_degree: dict[str, int] = {n: 0 for n in all_ngs}
-    # A depends on B → B must come first → B's "out-edges" decrement A's in-degree
-    for name, children in deps.items():
-        for child in children:
-            in_degree[name] += 1  # name depends on child → in_degree[name]++
+    heap = [n for n in names if in_degree[n] == 0]
+    heapq.heapify(heap)
+    order: list[str] = []
+    while heap:
+        name = heapq.heappop(heap)
+        order.append(name)
+        for parent in dependents[name]:
+            in_degree[parent] -= 1
+            if in_degree[parent] == 0:
+                heapq.heappush(heap, parent)
 
-    queue = deque(n for n in all_ngs if in_degree[n] == 0)
-    sorted_names: list[str] = []
+    stuck = sorted(n for n in names if in_degree[n] > 0)
+    order.extend(stuck)
+    return order, stuck
 
-    while queue:
-        name = queue.popleft()
-        sorted_names.append(name)
-        # Find who depends on `name` and decrement their in-degree
-        for other, other_deps in deps.items():
-            if name in other_deps:
-                in_degree[other] -= 1
-                if in_degree[other] == 0:
-                    queue.append(other)
 
-    # Any remaining (cycles) appended at end
-    remaining = [n for n in all_ngs if n not in sorted_names]
-    sorted_names.extend(remaining)
+def _find_cycles(names: list[str], deps: dict[str, set[str]]) -> list[list[str]]:
+    """Strongly connected components of more than one group among *names* (Tarjan, iterative)."""
+    pool = set(names)
 
-    return [all_ngs[n] for n in sorted_names if n in all_ngs]
+    def children(name):
+        return iter(sorted(c for c in deps.get(name, ()) if c in pool))
+
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    cycles: list[list[str]] = []
+
+    for root in names:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, children(root))]
+        while work:
+            name, it = work[-1]
+            for child in it:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, children(child)))
+                    break
+                if child in on_stack:
+                    low[name] = min(low[name], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[name])
+                if low[name] == index[name]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == name:
+                            break
+                    if len(component) > 1:
+                        cycles.append(sorted(component))
+    return sorted(cycles)
+
+
+def sort_node_groups(node_groups: list) -> SortResult:
+    """
+    Sort *node_groups* so that each group appears AFTER all groups
+    it depends on (i.e. uses as nested ShaderNodeGroup / GeometryNodeGroup).
+
+    Groups that form a cycle, and groups above one, are appended at the end
+    (best-effort) and reported in ``cycles`` / ``blocked``.
+    """
+    all_ngs: dict[str, object] = {ng.name: ng for ng in node_groups}
+    nested = scan_nested_groups(node_groups)
+    deps: dict[str, set[str]] = {
+        name: {c for c in children if c in all_ngs and c != name}
+        for name, children in nested.items()
+    }
+
+    order, stuck = order_names(list(all_ngs), deps)
+    cycles = _find_cycles(stuck, deps) if stuck else []
+    in_cycle = {n for cycle in cycles for n in cycle}
+    blocked = [n for n in stuck if n not in in_cycle]
+    return SortResult([all_ngs[n] for n in order], nested, cycles, blocked)
+
+
+def topological_sort(node_groups: list) -> list:
+    """Node groups in dependency order (leaves first); see sort_node_groups()."""
+    return sort_node_groups(node_groups).order
 
 
 def get_all_node_groups() -> list:
@@ -63,4 +155,5 @@ def get_all_node_groups() -> list:
     geometry nodes inside the shader Add menu and break). This is the single
     gate every group passes through before compilation.
     """
+    import bpy  # type: ignore  # local: keeps the sort importable without Blender
     return [ng for ng in bpy.data.node_groups if ng.type == 'SHADER']
@@ -0,0 +1,118 @@
+"""
+Canonical tree hashes (compile side).
+
+The runtime shader reconcile (nodes/refresh.py) has to know whether a node tree
+saved in a .blend still matches what the installed class builds. Without help it
+builds a throwaway copy of every in-use class on every file open just to hash it.
+Here the NodeCompiler builds each class it just wrote ONCE and records
+
+    hash_node_tree(<tree the class builds>)
+
+in the node manifest (NodeEntry.tree_hash). Reconcile compares the saved tree
+against that value and only builds when they differ.
+
+The build runs inside the dev file, so it is fully isolated and undone:
+  * the generated modules are executed from the output folder (not the
+    installed add-on), with nested groups resolved against the new classes via
+    node.node_registry_override();
+  * datablocks already holding a class's stable key are renamed out of the way
+    so ensure_node_group() cannot pick up an older build;
+  * every node group and image the builds created is removed again and the
+    renamed datablocks get their names back.
+
+A class that fails to load or build simply gets no hash; the runtime then falls
+back to building and comparing as before.
+"""
+
+from __future__ import annotations
+import importlib.util
+import os
+import sys
+
+import bpy  # type: ignore
+
+from ....nodes import node as node_module
+from ....nodes.geometry.hashing import hash_node_tree
+from ....utils.logger import get_logger
+
+logger = get_logger("NodeCompiler")
+
+# Suffix for datablocks parked out of the way while the fresh builds run.
+_PARKED_SUFFIX = " [lspotato-hash]"
+
+
+def _load_class(base_out_dir: str, subpath: str, filename: str, class_name: str):
+    """Execute one written module as if it sat under the add-on's shader/ package."""
+    path = os.path.join(base_out_dir, subpath, filename)
+    package = node_module.__package__ + ".shader." + subpath.replace("/", ".")
+    module_name = package + "." + os.path.splitext(filename)[0]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    mod = importlib.util.module_from_spec(spec)
+    mod.__package__ = package
+    # Same as NodeLib._load_file: present only while executing, never left in
+    # sys.modules (the extension policy audit flags leftovers).
+    inserted = module_name not in sys.modules
+    if inserted:
+        sys.modules[module_name] = mod
+    try:
+        spec.loader.exec_module(mod)
+    finally:
+        if inserted:
+            sys.modules.pop(module_name, None)
+    return getattr(mod, class_name)
+
+
+def compute_tree_hashes(base_out_dir: str, records: list[tuple[str, str, str, str]],
+                        only: set[str] | None = None) -> dict[str, str]:
+    """
+    Build every class in *records* from its written module and hash the result.
+
+    ``records`` are the manifest records, ``(class_name, bl_label, subpath,
+    filename)``, in compile (topological) order. ``only`` restricts the builds
+    to those class names (incremental compiles reuse the other hashes); every
+    record is still loaded so nested groups resolve. Returns class name → hash
+    for every class that built.
+    """
+    classes = []
+    for class_name, _bl_label, subpath, filename in records:
+        try:
+            classes.append(_load_class(base_out_dir, subpath, filename, class_name))
+        except Exception as exc:
+            logger.warning(f"Tree hash: cannot load '{subpath}/{filename}': {exc}")
+
+    groups = bpy.data.node_groups
+    parked = {}
+    for cls in classes:
+        existing = groups.get(cls._PREFIX + cls.bl_label)
+        if existing is not None:
+            parked[existing.name] = existing
+            existing.name = existing.name + _PARKED_SUFFIX
+
+    groups_before = {ng.as_pointer() for ng in groups}
+    images_before = {img.as_pointer() for img in bpy.data.images}
+    hashes: dict[str, str] = {}
+    try:
+        built = {}
+        with node_module.node_registry_override(classes):
+            for cls in classes:
+                if only is not None and cls.__name__ not in only:
+                    continue
+                try:
+                    tree = cls.create_node_group()
+                except Exception as exc:
+                    logger.warning(f"Tree hash: build failed for '{cls.bl_label}': {exc}")
+                    continue
+                if tree is not None:
+                    built[cls.__name__] = tree
+        memo: dict = {}
+        for class_name, tree in built.items():
+            hashes[class_name] = hash_node_tree(tree, memo)
+    finally:
+        for ng in [ng for ng in groups if ng.as_pointer() not in groups_before]:
+            groups.remove(ng)
+        for img in [img for img in bpy.data.images if img.as_pointer() not in images_before]:
+            if img.users == 0:
+                bpy.data.images.remove(img)
+        for name, ng in parked.items():
+            ng.name = name
+    return hashes
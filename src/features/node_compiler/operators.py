@@ -5,9 +5,16 @@ matching the LSCherry scene hierarchy used by node_impl.py.
 """
 
 from __future__ import annotations
+import functools
+import itertools
+import json
 import os
 import shutil
+import time
 import traceback
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 
 import bpy  # type: ignore
 
@@ -20,9 +27,19 @@ from ...exception.model.node_compiler_exceptions import (
 from ...utils.logger import get_logger
 
 from .compiler.analyzer import analyze_node_group
-from .compiler.code_gen import generate_class
-from .compiler.flattener import needs_flatten, flatten_info
-from .compiler.sorter import topological_sort, get_all_node_groups
+from .compiler.code_gen import generate_class, generate_tree_data
+from .compiler.const_fold import fold_constants
+from .compiler.pruner import prune_dead_nodes
+from .compiler.flattener import (
+    needs_flatten,
+    flatten_info,
+    group_needs_inline,
+    hoist_flatten_info,
+    plan_split,
+    prepare_flatten,
+    wrap_split,
+)
+from .compiler.sorter import sort_node_groups, get_all_node_groups
 from .compiler.router import (
     make_bl_label,
     make_import_prefix,
@@ -31,15 +48,102 @@ from .compiler.router import (
 )
 from .compiler.exporter import (
     write_compiled_file,
+    write_compiled_file_if_changed,
     write_all_inits,
+    write_node_manifest,
     export_packed_images,
     ng_name_to_filename,
     ng_name_to_class,
 )
 from .compiler.geometry_exporter import export_geometry
+from .compiler.tree_hasher import compute_tree_hashes
+from .compiler.build_manifest import (
+    BUILD_MANIFEST_NAME,
+    TREE_FILE_SUFFIX,
+    BuildRecord,
+    compiler_digest,
+    group_fingerprint,
+    read_build_manifest,
+    sweep_orphans,
+    write_build_manifest,
+)
+from ...nodes.manifest import CORE_LABEL_SUFFIX, file_digest
+from ...nodes.node_impl import NodeLib
 
 logger = get_logger("NodeCompiler")
 
+# Flatten / codegen / write workers. The work is mostly string building under
+# the GIL plus file I/O, so a handful of threads is enough to overlap the I/O.
+_EMIT_WORKERS = min(8, os.cpu_count() or 1)
+
+
+class _EmitJob(NamedTuple):
+    """Everything phase B needs to emit one module; no live bpy data is touched."""
+    info: dict
+    flatten: bool
+    infos: Mapping                         # analyzed infos visible to this group
+    compiled_nodes: Mapping                # compiled_nodes visible to this group
+    class_name: str
+    import_prefix: str
+    bl_label: str
+    subpath: str
+    filename: str
+    module_stem: str
+    fingerprint: str
+    tree_file: str | None                  # JSON tree format: description file name
+    batched: bool                          # batched Python tree format
+    prune: bool                            # drop nodes with no path to a root
+    fold: bool                             # fold constant Math / Mix chains
+
+
+def _emit_module(job: _EmitJob, out_dir: str, incremental: bool, attr_memo: dict,
+                 templates: dict) -> tuple:
+    """
+    Flatten, generate and write one module (runs on a worker thread).
+
+    Returns ``(kind, payload, info)``: ``("ok", (sha1 of the module, sha1 of
+    the tree description or "", dead nodes pruned, constant nodes folded),
+    final info)``,
+    ``("codegen_error", message, info)`` or ``("io_error", (path, exc), info)``;
+    the main thread logs and raises in compile order.
+    """
+    info = job.info
+    n_pruned = n_folded = 0
+    try:
+        if job.flatten:
+            # Phase A prepared every memo entry and template this flatten
+            # needs (prepare_flatten), so workers only read the shared dicts.
+            info = flatten_info(info, job.infos, attr_memo, templates)
+        # Folding first: nodes whose only reader was folded away are dead too.
+        if job.fold:
+            info, n_folded = fold_constants(info)
+        if job.prune:
+            info, n_pruned = prune_dead_nodes(info)
+        tree_text = None
+        if job.tree_file is not None:
+            tree_text = json.dumps(generate_tree_data(info, job.compiled_nodes),
+                                   separators=(",", ":"))
+        code = generate_class(info, job.class_name, job.import_prefix, job.compiled_nodes,
+                              tree_file=job.tree_file, batched=job.batched)
+    except Exception as exc:
+        return "codegen_error", f"{exc}\n{traceback.format_exc()}", info
+
+    def write(filename, text, **kw):
+        if incremental:
+            return write_compiled_file_if_changed(out_dir, job.subpath, filename, text, **kw)[0]
+        return write_compiled_file(out_dir, job.subpath, filename, text, **kw)
+
+    target = job.filename
+    try:
+        tree_sha1 = ""
+        if tree_text is not None:
+            target = job.tree_file
+            tree_sha1 = file_digest(write(target, tree_text, header=""))
+        target = job.filename
+        return "ok", (file_digest(write(target, code)), tree_sha1, n_pruned, n_folded), info
+    except OSError as exc:
+        return "io_error", (os.path.join(out_dir, job.subpath, target), exc), info
+
 
 class LSPOTATO_OT_compile_node_groups(bpy.types.Operator, OperatorExceptionMixin):
     """Compile all node groups into locked Python-based custom nodes"""
@@ -84,8 +188,26 @@ class LSPOTATO_OT_compile_node_groups(bpy.types.Operator, OperatorExceptionMixin
         # orphan duplicate behind (e.g. a stale lscherry/build_face_ramp.py after
         # the group moved to lscherry/utils/procedural/). Sibling images/ and
         # geometry/ folders and any source.blend copy are left untouched.
+        # Incremental mode keeps the tree: unchanged modules are reused as-is
+        # and orphans are swept after the compile loop instead (step 4).
         compiled_root = os.path.join(out_dir, "lscherry")
-        if os.path.isdir(compiled_root):
+        incremental = props.incremental
+        build_manifest_path = os.path.join(out_dir, BUILD_MANIFEST_NAME)
+        hoist = props.hoist_inline_nodes
+        json_trees = props.tree_format == "JSON"
+        batched = props.tree_format == "BATCHED"
+        prune = props.prune_dead_nodes
+        fold = props.fold_constants
+        wrap = props.instance_wrappers
+        # The hoist split, instance wrappers, the tree format, pruning and
+        # folding change what is written, so they are part of the salt.
+        compiler = (compiler_digest() + ("+hoist" if hoist else "") + ("+wrap" if wrap else "")
+                    + ("+json" if json_trees else "") + ("+batched" if batched else "")
+                    + ("+prune" if prune else "") + ("+fold" if fold else ""))
+        previous: dict[str, BuildRecord] = (
+            read_build_manifest(build_manifest_path, compiler) if incremental else {}
+        )
+        if not incremental and os.path.isdir(compiled_root):
             try:
                 shutil.rmtree(compiled_root)
             except OSError as exc:
@@ -97,26 +219,62 @@ class LSPOTATO_OT_compile_node_groups(bpy.types.Operator, OperatorExceptionMixin
             self.report({"WARNING"}, "No node groups found in this file.")
             return {"CANCELLED"}
 
-        sorted_ngs = topological_sort(all_ngs)
+        # One walk over every group's nodes gives both the order and each
+        # group's nested-group list, which the analyzer reuses below.
+        sort_result = sort_node_groups(all_ngs)
+        sorted_ngs = sort_result.order
+        for cycle in sort_result.cycles:
+            logger.warning(f"Node group dependency cycle between: {', '.join(cycle)}")
+        if sort_result.blocked:
+            logger.warning(
+                "Compiled after a dependency cycle (order best-effort): "
+                + ", ".join(sort_result.blocked)
+            )
 
         # ── 3. Build material → node group map (direct ownership only) ─────────
         direct_mat_map = build_direct_material_ng_map()
 
         # ── 4. Compile each group ────────────────────────────────────────────
+        # Phase A (main thread, bpy): route, analyze, fingerprint and decide
+        # what to emit, in topological order. Phase B (thread pool, plain
+        # dicts): flatten, generate and write each emitted module. Results are
+        # folded back in phase A order, so every list below is deterministic.
+        #
         # subpath_modules: { subpath → [module_stem, ...] }
         subpath_modules: dict[str, list[str]] = {}
         # compiled_nodes: original ng.name → (compiled classname, stable node-tree key)
         # Built incrementally (topological order ensures dependencies come first).
-        compiled_nodes: dict[str, tuple[str, str]] = {}
+        compiled_nodes = _Ledger()
         # Predefined (packed) textures to copy out: filename → bpy.types.Image.
         predefined_images: dict = {}
         # Raw analyzed infos, keyed by ng.name. Topological order guarantees a
         # group's children are already cached before it is flattened.
-        analyzed_infos: dict[str, dict] = {}
+        analyzed_infos = _Ledger()
         attr_memo: dict = {}  # group_has_attribute memoisation
+        # One (class_name, bl_label, subpath, filename) per written module, for
+        # the node manifest NodeLib registers from.
+        manifest_records: list[tuple[str, str, str, str]] = []
+        # Incremental bookkeeping: ng.name → fingerprint / BuildRecord, and the
+        # class names whose module was regenerated this run.
+        fingerprints: dict[str, str] = {}
+        build_records: dict[str, BuildRecord] = {}
+        regenerated: set[str] = set()
+        # Phase A output, in order: a reused BuildRecord or an _EmitJob.
+        planned: list = []
+        # Hoist split: ng.name → SplitPlan, and the core keys emitted.
+        split_plans = _SplitPlans()
+        cores: set[str] = set()
+        # Child splice templates are shared: each nested group is prepared
+        # once per compile however many parents inline it.
+        templates: dict = {}
         n_ok  = 0
+        n_unchanged = 0
+        n_pruned = 0
+        n_folded = 0
         errors: list[str] = []
+        timings: dict[str, float] = {}
 
+        t_phase = time.perf_counter()
         for ng in sorted_ngs:
             # Route by the material that directly owns this node group.
             # Falls back to lscherry root for unowned groups (e.g. standalone utilities).
@@ -138,7 +296,7 @@ class LSPOTATO_OT_compile_node_groups(bpy.types.Operator, OperatorExceptionMixin
 
             # Analyze
             try:
-                info = analyze_node_group(ng)
+                info = analyze_node_group(ng, sort_result.nested.get(ng.name))
             except Exception as exc:
                 logger.warning(f"Analysis failed for '{ng.name}': {exc}\n{traceback.format_exc()}")
                 errors.append(ng.name)
@@ -147,6 +305,86 @@ class LSPOTATO_OT_compile_node_groups(bpy.types.Operator, OperatorExceptionMixin
             # Cache the RAW info before flattening so parents can inline it.
             analyzed_infos[ng.name] = info
 
+            # Fingerprint the raw info + route + nested fingerprints. A group
+            # whose fingerprint and written file both match the last run is
+            # reused without flattening, generating or writing anything.
+            fingerprint = group_fingerprint(
+                info,
+                (subpath, bl_label, class_name, filename),
+                [fingerprints.get(child, "") for child in info["nested_groups"]],
+                compiler,
+            )
+            fingerprints[ng.name] = fingerprint
+
+            # Hoist split: rather than being copied whole into every parent, an
+            # inline-forcing group is split into the nodes that must be inlined
+            # (plus what feeds them) and a shared core class. Instance wrappers
+            # reuse the same split for the group's own class: it keeps only the
+            # image / UV nodes and runs the core as a group.
+            forcing = group_needs_inline(ng.name, analyzed_infos, attr_memo)
+            split_self = hoist and forcing
+            wrap_self = wrap and ng.type == "SHADER" and (forcing or bool(info["has_uv_nodes"]))
+            core_ref   = ng.name + CORE_LABEL_SUFFIX
+            core_label = bl_label + CORE_LABEL_SUFFIX
+            core_class = class_name + CORE_LABEL_SUFFIX
+            core_stem  = module_stem + CORE_LABEL_SUFFIX
+
+            # Reuse is decided before any flattening, so a clean group costs
+            # only its fingerprint. Whether the split yields a core is a
+            # function of the fingerprint, so the last run wrote one exactly
+            # when it left a core record with the same fingerprint.
+            prev = previous.get(ng.name)
+            prev_core = previous.get(core_ref)
+            if prev_core is not None and prev_core.fingerprint != fingerprint:
+                prev_core = None
+            if (prev is not None and _is_reusable(prev, fingerprint, out_dir, subpath, filename)
+                    and (prev_core is None or _is_reusable(
+                        prev_core, fingerprint, out_dir, subpath, core_stem + ".py"))):
+                for fn, img in info.get("_predefined_images", []):
+                    predefined_images.setdefault(fn, img)
+                if prev_core is not None:
+                    cores.add(core_ref)
+                    compiled_nodes[core_ref] = (prev_core.class_name, "." + prev_core.bl_label)
+                    planned.append((core_ref, prev_core))
+                if split_self:
+                    # Only a regenerated parent needs the plan; build it then.
+                    split_plans.defer(ng.name, functools.partial(
+                        _split_plan, dict(info, bl_label=bl_label), core_ref, analyzed_infos,
+                        attr_memo, split_plans, templates, wrap,
+                    ))
+                planned.append((ng.name, prev))
+                continue
+
+            flattened = False
+            core_job = None
+            if split_self or wrap_self or (hoist and needs_flatten(info, analyzed_infos, attr_memo)):
+                if hoist:
+                    info = hoist_flatten_info(dict(info, bl_label=bl_label), analyzed_infos,
+                                              attr_memo, split_plans, templates)
+                elif needs_flatten(info, analyzed_infos, attr_memo):
+                    info = flatten_info(dict(info, bl_label=bl_label), analyzed_infos,
+                                        attr_memo, templates)
+                flattened = True
+                plan = (plan_split(info, core_ref, hoist_uv=wrap)
+                        if split_self or wrap_self else None)
+                if plan is not None:
+                    if split_self:
+                        split_plans[ng.name] = plan
+                    if wrap_self:
+                        info = wrap_split(info, plan)
+                    cores.add(plan.core_ref)
+                    compiled_nodes[plan.core_ref] = (core_class, "." + core_label)
+                    core_job = _EmitJob(
+                        dict(plan.core, name=plan.core_ref, bl_label=core_label), False, {},
+                        compiled_nodes.view(), core_class, import_prefix, core_label,
+                        subpath, core_stem + ".py", core_stem, fingerprint,
+                        core_stem + TREE_FILE_SUFFIX if json_trees else None,
+                        batched, prune, fold,
+                    )
+
+            if core_job is not None:
+                planned.append((core_job.info["name"], core_job))
+
             # Inject bl_label into info so code_gen can use it
             info["bl_label"] = bl_label
 
@@ -154,58 +392,182 @@ class LSPOTATO_OT_compile_node_groups(bpy.types.Operator, OperatorExceptionMixin
             # bind geometry attributes through a ShaderNodeCustomGroup boundary,
             # and a placeholder image buried in a nested group can't be exposed as
             # this node's own texture input — so any Attribute node or placeholder
-            # TEX_IMAGE must land in this group's own tree.
-            if needs_flatten(info, analyzed_infos, attr_memo):
-                info = flatten_info(info, analyzed_infos, attr_memo)
+            # TEX_IMAGE must land in this group's own tree. The decision and the
+            # child templates are made here, once per child for the whole
+            # compile; the splice itself runs in phase B. (The split above has
+            # already done this.)
+            flatten = not flattened and needs_flatten(info, analyzed_infos, attr_memo)
+            if flatten:
+                prepare_flatten(info, analyzed_infos, attr_memo, templates)
+
+            # The views show each job only the groups compiled before it, as a
+            # serial compile would, even inside dependency cycles.
+            planned.append((ng.name, _EmitJob(
+                info, flatten, analyzed_infos.view(), compiled_nodes.view(),
+                class_name, import_prefix, bl_label, subpath, filename, module_stem,
+                fingerprint, module_stem + TREE_FILE_SUFFIX if json_trees else None, batched,
+                prune, fold,
+            )))
+        timings["analyze"] = time.perf_counter() - t_phase
+
+        # Phase B: flatten / codegen / write on a thread pool. Blender's Python
+        # can't ship bpy references to other processes, so this is threads;
+        # executor.map hands results back in submission order.
+        t_phase = time.perf_counter()
+        jobs = [(name, job) for name, job in planned if isinstance(job, _EmitJob)]
+        results: dict[str, tuple] = {}
+        if jobs:
+            emit = functools.partial(_emit_module, out_dir=out_dir, incremental=incremental,
+                                     attr_memo=attr_memo, templates=templates)
+            with ThreadPoolExecutor(max_workers=_EMIT_WORKERS) as pool:
+                for (name, _job), result in zip(jobs, pool.map(emit, [j for _n, j in jobs])):
+                    results[name] = result
+        timings["emit"] = time.perf_counter() - t_phase
+
+        for ng_name, item in planned:
+            if isinstance(item, BuildRecord):
+                subpath_modules.setdefault(item.subpath, []).append(
+                    os.path.splitext(item.filename)[0]
+                )
+                manifest_records.append((item.class_name, item.bl_label, item.subpath, item.filename))
+                build_records[ng_name] = item
+                if ng_name not in cores:
+                    n_ok += 1
+                    n_unchanged += 1
+                continue
+
+            job = item
+            kind, payload, info = results[ng_name]
+            if kind == "codegen_error":
+                logger.warning(f"Code gen failed for '{ng_name}': {payload}")
+                errors.append(ng_name)
+                continue
+            if kind == "io_error":
+                path, exc = payload
+                raise ExportIOException(path, str(exc)) from exc
 
             # Collect predefined textures to copy out (dedup by filename).
             for fn, img in info.get("_predefined_images", []):
                 predefined_images.setdefault(fn, img)
 
-            # Generate code (pass compiled_nodes so GROUP refs use create_node_group)
-            try:
-                code = generate_class(info, class_name, import_prefix, compiled_nodes)
-            except Exception as exc:
-                logger.warning(f"Code gen failed for '{ng.name}': {exc}\n{traceback.format_exc()}")
-                errors.append(ng.name)
-                continue
-
-            # Write file
+            subpath_modules.setdefault(job.subpath, []).append(job.module_stem)
+            manifest_records.append((job.class_name, job.bl_label, job.subpath, job.filename))
+            sha1, tree_sha1, pruned, folded = payload
+            build_records[ng_name] = BuildRecord(
+                job.fingerprint, job.class_name, job.bl_label, job.subpath, job.filename,
+                sha1, tree_sha1=tree_sha1,
+            )
+            regenerated.add(job.class_name)
+            if ng_name not in cores:
+                n_ok += 1
+            n_pruned += pruned
+            n_folded += folded
+            notes = ([f"{folded} constant node(s) folded"] if folded else []) + (
+                [f"{pruned} dead node(s) pruned"] if pruned else [])
+            logger.info(
+                f"Compiled: {ng_name} → {job.subpath}/{job.filename}  [{job.bl_label}]"
+                + (f"  ({', '.join(notes)})" if notes else "")
+            )
+
+        # ── 4. Sweep orphans, then write __init__.py for every folder ────────
+        t_phase = time.perf_counter()
+        # Incremental runs did not wipe lscherry/, so drop modules no group
+        # produced this time (renamed / re-routed / deleted / failed groups).
+        if incremental:
+            keep = {
+                os.path.join(out_dir, subpath, filename)
+                for _cls, _label, subpath, filename in manifest_records
+            }
+            if json_trees:
+                keep |= {
+                    os.path.join(out_dir, subpath, os.path.splitext(filename)[0] + TREE_FILE_SUFFIX)
+                    for _cls, _label, subpath, filename in manifest_records
+                }
             try:
-                write_compiled_file(out_dir, subpath, filename, code)
+                for path in sweep_orphans(compiled_root, keep):
+                    logger.info(f"Removed orphan: {os.path.relpath(path, out_dir)}")
             except OSError as exc:
-                raise ExportIOException(
-                    os.path.join(out_dir, subpath, filename), str(exc)
-                ) from exc
-
-            subpath_modules.setdefault(subpath, []).append(module_stem)
-            n_ok += 1
-            logger.info(f"Compiled: {ng.name} → {subpath}/{filename}  [{bl_label}]")
+                raise ExportIOException(compiled_root, str(exc)) from exc
 
-        # ── 4. Write __init__.py for every folder ────────────────────────────
         try:
             write_all_inits(out_dir, subpath_modules)
         except OSError as exc:
             raise ExportIOException(out_dir, str(exc)) from exc
 
+        # ── 4a. Node manifest (class identity + file state per module) ─────────
+        # Optionally build each written class once and record its tree hash, so
+        # the runtime reconcile can skip rebuilding trees that already match.
+        # Reused modules keep the hash recorded for them last time.
+        tree_hashes: dict[str, str] = {}
+        if props.record_tree_hashes and manifest_records:
+            to_hash = {rec[0] for rec in manifest_records}
+            for rec in build_records.values():
+                if rec.class_name not in regenerated and rec.tree_hash:
+                    tree_hashes[rec.class_name] = rec.tree_hash
+                    to_hash.discard(rec.class_name)
+            if to_hash:
+                t_hash = time.perf_counter()
+                try:
+                    tree_hashes.update(compute_tree_hashes(out_dir, manifest_records, to_hash))
+                except Exception as exc:
+                    logger.warning(f"Could not record tree hashes: {exc}")
+                timings["tree hashes"] = time.perf_counter() - t_hash
+            logger.info(
+                f"Recorded {len(tree_hashes)}/{len(manifest_records)} tree hash(es)"
+            )
+        try:
+            write_node_manifest(out_dir, manifest_records, tree_hashes)
+        except OSError as exc:
+            raise ExportIOException(out_dir, str(exc)) from exc
+        # NodeLib's session cache describes the tree this compile replaced.
+        NodeLib.invalidate()
+
+        # ── 4a. Build manifest (fingerprints for the next incremental run) ───
+        # Always written, so switching to incremental after a full compile
+        # starts from a warm baseline.
+        try:
+            write_build_manifest(build_manifest_path, compiler, {
+                name: rec._replace(tree_hash=tree_hashes.get(rec.class_name, ""))
+                for name, rec in build_records.items()
+            })
+        except OSError as exc:
+            raise ExportIOException(build_manifest_path, str(exc)) from exc
+        timings["manifests"] = (
+            time.perf_counter() - t_phase - timings.get("tree hashes", 0.0)
+        )
+
         # ── 4b. Copy predefined (packed) textures into images/ ───────────────
         if predefined_images:
+            t_phase = time.perf_counter()
             try:
-                saved = export_packed_images(out_dir, predefined_images)
+                saved, image_reports = export_packed_images(
+                    out_dir, predefined_images, optimize=props.image_profile == "OPTIMIZED"
+                )
                 logger.info(
                     f"Exported {len(saved)} predefined image(s) → {out_dir}/images"
                 )
+                for rep in image_reports:
+                    logger.info(f"  {rep.filename}: {rep.before} → {rep.after} bytes "
+                                f"({rep.note})")
+                if image_reports:
+                    before = sum(rep.before for rep in image_reports)
+                    after = sum(rep.after for rep in image_reports)
+                    logger.info(f"Optimized images: {before} → {after} bytes, "
+                                f"{before - after} saved")
             except Exception as exc:
                 logger.warning(f"Could not export predefined images: {exc}")
+            timings["images"] = time.perf_counter() - t_phase
 
         # ── 5. Optionally copy the blend file ────────────────────────────────
         if props.copy_blend:
+            t_phase = time.perf_counter()
             blend_copy = os.path.join(out_dir, "source.blend")
             try:
                 bpy.ops.wm.save_as_mainfile(filepath=blend_copy, copy=True)
                 logger.info(f"Blend copy saved → {blend_copy}")
             except Exception as exc:
                 logger.warning(f"Could not copy blend file: {exc}")
+            timings["blend copy"] = time.perf_counter() - t_phase
 
         # ── 5c. Export geometry node groups (library.blend + hashes.json) ─────
         # Geometry groups take a different path than shaders: rather than Python,
@@ -213,6 +575,7 @@ class LSPOTATO_OT_compile_node_groups(bpy.types.Operator, OperatorExceptionMixin
         # loader to append. Failure here must not sink a successful shader compile.
         n_geo = 0
         if props.compile_geometry:
+            t_phase = time.perf_counter()
             try:
                 n_geo = export_geometry(out_dir)
                 if n_geo:
@@ -221,16 +584,127 @@ class LSPOTATO_OT_compile_node_groups(bpy.types.Operator, OperatorExceptionMixin
                     )
             except Exception as exc:
                 logger.warning(f"Could not export geometry node groups: {exc}")
+            timings["geometry"] = time.perf_counter() - t_phase
 
         # ── 6. Report ────────────────────────────────────────────────────────
         n_err = len(errors)
         msg   = f"✅ Compiled {n_ok} node group(s)"
+        if incremental:
+            msg += f" ({n_unchanged} unchanged)"
+        if cores:
+            msg += f", {len(cores)} shared core(s)"
+        if n_folded:
+            msg += f", {n_folded} constant node(s) folded"
+        if n_pruned:
+            msg += f", {n_pruned} dead node(s) pruned"
         if n_err:
             msg += f", {n_err} failed (see system console)"
         if n_geo:
             msg += f", {n_geo} geometry group(s)"
-        msg += f". Output: {out_dir}"
+        if sort_result.cycles:
+            msg += f", {len(sort_result.cycles)} dependency cycle(s) (see system console)"
+        msg += f". Output: {out_dir}. Time: {_format_timings(timings)}"
         self.report({"INFO"}, msg)
-        logger.info(f"Compile complete: {n_ok} ok, {n_err} failed, {n_geo} geometry.")
-
-        return {"FINISHED"}
\ No newline at end of file
+        logger.info(
+            f"Compile complete: {n_ok} ok ({n_unchanged} unchanged), "
+            f"{n_err} failed, {n_geo} geometry. Time: {_format_timings(timings)}"
+        )
+
+        return {"FINISHED"}
+
+
+class _Ledger(dict):
+    """
+    Append-only dict that hands out read-only views of its earlier states in
+    O(1): a view taken after n insertions keeps showing exactly those n keys.
+    Keys are never removed; phase A never re-assigns one.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._seq: dict = {}
+
+    def __setitem__(self, key, value):
+        if key not in self._seq:
+            self._seq[key] = len(self._seq)
+        super().__setitem__(key, value)
+
+    def view(self) -> "_LedgerView":
+        return _LedgerView(self, len(self._seq))
+
+
+class _LedgerView(Mapping):
+    """The first *limit* keys of a _Ledger."""
+    __slots__ = ("_ledger", "_limit")
+
+    def __init__(self, ledger: _Ledger, limit: int):
+        self._ledger = ledger
+        self._limit = limit
+
+    def __getitem__(self, key):
+        if self._ledger._seq.get(key, self._limit) >= self._limit:
+            raise KeyError(key)
+        return dict.__getitem__(self._ledger, key)
+
+    def __iter__(self):
+        return itertools.islice(self._ledger._seq, self._limit)
+
+    def __len__(self):
+        return self._limit
+
+
+class _SplitPlans(dict):
+    """
+    ng.name → SplitPlan. A reused group's plan is deferred and only built the
+    first time a regenerated parent looks it up, so a no-op incremental build
+    flattens nothing.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._deferred: dict = {}
+
+    def defer(self, name: str, build) -> None:
+        self._deferred[name] = build
+
+    def get(self, name, default=None):
+        build = self._deferred.pop(name, None)
+        if build is not None:
+            plan = build()
+            if plan is not None:
+                self[name] = plan
+        return super().get(name, default)
+
+
+def _split_plan(info: dict, core_ref: str, infos: dict, memo: dict, plans: dict,
+                templates: dict, hoist_uv: bool):
+    """The SplitPlan of the analyzed group *info* (None if it does not split)."""
+    flat = hoist_flatten_info(info, infos, memo, plans, templates)
+    return plan_split(flat, core_ref, hoist_uv=hoist_uv)
+
+
+def _is_reusable(prev: BuildRecord, fingerprint: str, out_dir: str,
+                 subpath: str, filename: str) -> bool:
+    """
+    True if *prev* describes this exact build and its module (and tree
+    description, if it has one) is still on disk untouched.
+    """
+    if prev.fingerprint != fingerprint or (prev.subpath, prev.filename) != (subpath, filename):
+        return False
+    try:
+        if file_digest(os.path.join(out_dir, subpath, filename)) != prev.sha1:
+            return False
+        if prev.tree_sha1:
+            tree_file = os.path.splitext(filename)[0] + TREE_FILE_SUFFIX
+            return file_digest(os.path.join(out_dir, subpath, tree_file)) == prev.tree_sha1
+        return True
+    except OSError:
+        return False
+
+
+def _format_timings(timings: dict[str, float]) -> str:
+    """'analyze 1.24 s, emit 310 ms, …' in phase order."""
+    parts = []
+    for phase, seconds in timings.items():
+        parts.append(f"{phase} {seconds:.2f} s" if seconds >= 1.0 else f"{phase} {seconds * 1000:.0f} ms")
+    return ", ".join(parts)
@@ -34,3 +34,95 @@ class NodeCompilerProperties(bpy.types.PropertyGroup):
         ),
         default=True,
     )  # type: ignore
+
+    record_tree_hashes: bpy.props.BoolProperty(
+        name="Record Tree Hashes",
+        description=(
+            "Build every compiled node once after writing it and store its tree "
+            "hash in the node manifest, so opening a file skips rebuilding "
+            "up-to-date node trees"
+        ),
+        default=True,
+    )  # type: ignore
+
+    incremental: bpy.props.BoolProperty(
+        name="Incremental",
+        description=(
+            "Keep the previous output and only regenerate node groups whose "
+            "content (or a nested group's) changed since the last compile, as "
+            "recorded in build_manifest.json. Unchanged files are not rewritten"
+        ),
+        default=False,
+    )  # type: ignore
+
+    hoist_inline_nodes: bpy.props.BoolProperty(
+        name="Hoist Inline Nodes",
+        description=(
+            "When a nested group has to be inlined for an Attribute node or an "
+            "image placeholder, lift only those nodes (and what feeds them) into "
+            "the parent and keep the rest as one shared sub-group, instead of "
+            "copying the whole group into every parent"
+        ),
+        default=False,
+    )  # type: ignore
+
+    instance_wrappers: bpy.props.BoolProperty(
+        name="Instance Wrappers",
+        description=(
+            "Compile a shader group with image or UV Map inputs as a small "
+            "wrapper holding only those nodes around one shared body group, so "
+            "an instance with its own textures copies the wrapper instead of "
+            "the whole tree"
+        ),
+        default=False,
+    )  # type: ignore
+
+    prune_dead_nodes: bpy.props.BoolProperty(
+        name="Prune Dead Nodes",
+        description=(
+            "Leave out nodes with no path to the group output (debug values, "
+            "disconnected experiments). Image placeholders and UV Map nodes "
+            "are always kept"
+        ),
+        default=False,
+    )  # type: ignore
+
+    fold_constants: bpy.props.BoolProperty(
+        name="Fold Constants",
+        description=(
+            "Evaluate Value / Math / Vector Math / Mix chains fed only by constants "
+            "at compile time and bake the result into the node that reads it"
+        ),
+        default=False,
+    )  # type: ignore
+
+    tree_format: bpy.props.EnumProperty(
+        name="Tree Format",
+        description="How each compiled node carries its node tree",
+        items=[
+            ("PYTHON", "Python",
+             "Generate the tree as Python statements in the node's module"),
+            ("BATCHED", "Python (Batched)",
+             "Generate the tree as Python, applying socket defaults and links "
+             "from tables in one loop each"),
+            ("JSON", "JSON",
+             "Write the tree as a compact <module>.tree.json next to a small class "
+             "stub; the shared builder in nodes/node.py applies it"),
+        ],
+        default="PYTHON",
+    )  # type: ignore
+
+    image_profile: bpy.props.EnumProperty(
+        name="Image Profile",
+        description="How predefined textures are written into images/",
+        items=[
+            ("ORIGINAL", "Original",
+             "Save each texture as Blender writes it, in its source format"),
+            ("OPTIMIZED", "Optimized PNG",
+             "Re-encode PNG textures losslessly: drop metadata, cut ramps whose "
+             "rows or columns are all the same to one row or column, and keep "
+             "the smallest maximum-compression encoding. Logs the bytes saved "
+             "per image"),
+        ],
+        default="ORIGINAL",
+    )  # type: ignore
@@ -29,6 +29,14 @@ def draw_compiler_panel(layout, context):
     row.prop(props, "copy_blend", text="Copy .blend")
 
     col.prop(props, "compile_geometry", text="Compile Geometry Nodes")
+    col.prop(props, "record_tree_hashes", text="Record Tree Hashes")
+    col.prop(props, "incremental", text="Incremental")
+    col.prop(props, "hoist_inline_nodes", text="Hoist Inline Nodes")
+    col.prop(props, "instance_wrappers", text="Instance Wrappers")
+    col.prop(props, "fold_constants", text="Fold Constants")
+    col.prop(props, "prune_dead_nodes", text="Prune Dead Nodes")
+    col.prop(props, "tree_format", text="Tree Format")
+    col.prop(props, "image_profile", text="Image Profile")
 
     col.separator(factor=0.5)
     col.operator(
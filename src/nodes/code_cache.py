@@ -0,0 +1,103 @@
+"""
+Marshalled code-object cache for the generated node modules.
+
+NodeLib executes every compiled module by hand (the leaf is popped from
+sys.modules again for the extension policy audit), and the __pycache__ that
+SourceFileLoader would use is keyed on the source mtime — which a zip install
+or an extension update rewrites — and is excluded from the built package. This
+cache is keyed on the source's sha1 plus the interpreter's cache tag instead, so
+an unchanged module is never recompiled across sessions or reinstalls:
+
+    <directory>/<sha1>.<cache_tag>.bin   →   marshal.dumps(code)
+
+The sha1 is the same digest the node manifest records, so with a current
+manifest NodeLib can hit the cache without reading the source at all.
+
+Like manifest.py this module is intentionally bpy-free.
+"""
+
+from __future__ import annotations
+import hashlib
+import marshal
+import os
+import sys
+
+_SUFFIX = "." + (sys.implementation.cache_tag or "py") + ".bin"
+
+
+class CodeCache:
+    """Code objects for source files, loaded from / stored to *directory*."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str, digest: str | None = None):
+        """
+        Return the code object for the source at *path*.
+
+        *digest* is the source's sha1 when the caller already knows it (from
+        the node manifest); otherwise the source is read and hashed. Raises
+        what compile() / open() raise when there is no usable cache entry.
+        """
+        source = None
+        if digest is None:
+            with open(path, "rb") as fh:
+                source = fh.read()
+            digest = hashlib.sha1(source).hexdigest()
+
+        cached = os.path.join(self.directory, digest + _SUFFIX)
+        try:
+            with open(cached, "rb") as fh:
+                code = marshal.loads(fh.read())
+            self.hits += 1
+            return code
+        except (OSError, ValueError, EOFError, TypeError):
+            pass
+
+        if source is None:
+            with open(path, "rb") as fh:
+                source = fh.read()
+        code = compile(source, path, "exec", dont_inherit=True)
+        self.misses += 1
+        self._store(cached, code)
+        return code
+
+    def prune(self, keep: set[str]) -> int:
+        """Delete entries whose digest is not in *keep* or that another interpreter wrote."""
+        removed = 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return 0
+        for name in names:
+            if not name.endswith(".bin"):
+                continue
+            if name.endswith(_SUFFIX) and name[:-len(_SUFFIX)] in keep:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _store(cached: str, code) -> None:
+        # Write-then-rename so a crash never leaves a truncated entry behind;
+        # an unwritable cache just means compiling again next time.
+        tmp = f"{cached}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as fh:
+                fh.write(marshal.dumps(code))
+            os.replace(tmp, cached)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
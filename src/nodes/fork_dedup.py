@@ -0,0 +1,68 @@
+"""
+Per-instance fork grouping for the save-time fork dedup (refresh.py).
+
+valuesUpdate forks a shared tree to '<key>.001', '.002', ... the first time an
+instance sets its own image or UV map. Before each save, refresh.py merges the
+forks of one key that ended up identical; this module decides which merge
+into which.
+
+Two forks can only be identical if their images and UV maps are, and those
+are a few attribute reads per TEX_IMAGE / UV Map node. So forks are first
+bucketed by that cheap key, and the full tree hash (which skips pointer
+properties such as images) is taken only inside a bucket that holds more than
+one datablock. A file whose forks all carry different textures is never
+hashed.
+
+Like manifest.py this module is intentionally bpy-free: it works on duck-typed
+node trees, and the hash function is passed in.
+"""
+
+from __future__ import annotations
+
+
+def instance_values(block) -> tuple:
+    """The images and UV maps the nodes of *block* hold, by node name."""
+    values = []
+    for node in block.nodes:
+        if node.type == "TEX_IMAGE":
+            image = getattr(node, "image", None)
+            values.append((node.name, "image", image.name_full if image is not None else ""))
+        elif node.type == "UVMAP":
+            values.append((node.name, "uv_map", getattr(node, "uv_map", "")))
+    return tuple(sorted(values))
+
+
+def plan_fork_merges(key: str, blocks: list, hash_tree) -> tuple[list, list]:
+    """
+    Decide the merges among *blocks*, the datablocks of stable key *key*.
+
+    Returns ``(merges, failed)``: ``(block, survivor)`` pairs in order, and the
+    blocks that could not be read. The canonical datablock comes first, then
+    forks by name, so the survivor of each group is deterministic and is the
+    canonical one when it is in the group. Fake-user datablocks are never
+    merged away. *hash_tree* maps a datablock to its tree hash.
+    """
+    ordered = sorted(blocks, key=lambda b: (b.name != key, b.name))
+    buckets: dict[tuple, list] = {}
+    failed: list = []
+    for block in ordered:
+        try:
+            buckets.setdefault(instance_values(block), []).append(block)
+        except Exception:
+            failed.append(block)
+
+    merges: list = []
+    for bucket in buckets.values():
+        if len(bucket) < 2:
+            continue
+        survivors: dict[str, object] = {}
+        for block in bucket:
+            try:
+                digest = hash_tree(block)
+            except Exception:
+                failed.append(block)
+                continue
+            keep = survivors.setdefault(digest, block)
+            if keep is not block and not block.use_fake_user:
+                merges.append((block, keep))
+    return merges, failed
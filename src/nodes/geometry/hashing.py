@@ -66,27 +66,142 @@ def _node_location(node):
         return None
 
 
+# RNA property types whose non-array values are plain Python scalars (ENUM
+# flags excepted — those read back as a set).
+_SCALAR_RNA_TYPES = frozenset({"BOOLEAN", "INT", "FLOAT", "STRING", "ENUM"})
+
+# bl_idname → (node class, names) — see _prop_plan().
+_PROP_PLANS: dict = {}
+
+
+def _is_scalar(val) -> bool:
+    return isinstance(val, (int, float, str, bool))
+
+
+def _keep_attr(attr: str) -> bool:
+    return not attr.startswith("_") and attr not in _VOLATILE_NODE_ATTRS
+
+
+def _build_prop_plan(cls, rna) -> tuple:
+    """
+    Names _scalar_props would keep for every node of type *cls*.
+
+    RNA properties are selected by declared type (scalar, non-array, not an
+    enum flag) — the same rule as node_attrs.get_serialisable_attrs, minus its
+    code-gen exclusions — and plain Python class attributes (custom node
+    classes) by their class-level value. Together that is exactly the set of
+    scalar attributes dir(node) would surface.
+    """
+    names: set = set()
+    rna_names: set = set()
+    for prop in rna.properties:
+        name = prop.identifier
+        rna_names.add(name)
+        if prop.type not in _SCALAR_RNA_TYPES or getattr(prop, "is_array", False):
+            continue
+        if prop.type == "ENUM" and getattr(prop, "is_enum_flag", False):
+            continue
+        names.add(name)
+    for name in dir(cls):
+        if name in rna_names:
+            continue
+        try:
+            val = getattr(cls, name)
+        except Exception:
+            continue
+        if _is_scalar(val):
+            names.add(name)
+    return tuple(sorted(n for n in names if _keep_attr(n)))
+
+
+def _prop_plan(node) -> tuple | None:
+    """
+    The cached property plan for *node*'s type, or None for duck-typed fakes.
+
+    Keyed by bl_idname; the class is kept alongside so a re-registered custom
+    node class (same bl_idname, new class object) gets a fresh plan.
+    """
+    rna = getattr(node, "bl_rna", None)
+    if rna is None:
+        return None
+    cls = type(node)
+    idname = getattr(node, "bl_idname", "")
+    cached = _PROP_PLANS.get(idname)
+    if cached is None or cached[0] is not cls:
+        cached = _PROP_PLANS[idname] = (cls, _build_prop_plan(cls, rna))
+    return cached[1]
+
+
+def drop_prop_plan(idname: str) -> None:
+    """Forget the plan of *idname*, whose class changed in place (lazy stubs)."""
+    _PROP_PLANS.pop(idname, None)
+
+
 def _scalar_props(node) -> dict:
     """
-    Collect the node's content-bearing scalar properties via introspection.
+    Collect the node's content-bearing scalar properties.
 
-    Iterates ``dir(node)`` (works on real bpy nodes and on plain fakes), keeps
-    only int / float / str / bool values, and drops private and volatile-UI
-    attributes. Anything that raises on access is skipped.
+    Real bpy nodes read only the names in their type's property plan (built
+    once per bl_idname from ``bl_rna``); anything else — the plain fakes the
+    tests use — falls back to iterating ``dir(node)``. Either way only
+    int / float / str / bool values are kept, private and volatile-UI
+    attributes are dropped, and anything that raises on access is skipped.
     """
+    plan = _prop_plan(node)
     props: dict = {}
+    if plan is not None:
+        for attr in plan:
+            try:
+                val = getattr(node, attr)
+            except Exception:
+                continue
+            if _is_scalar(val):
+                props[attr] = val
+        return props
+
     for attr in dir(node):
-        if attr.startswith("_") or attr in _VOLATILE_NODE_ATTRS:
+        if not _keep_attr(attr):
             continue
         try:
             val = getattr(node, attr)
         except Exception:
             continue
-        if isinstance(val, (int, float, str, bool)):
+        if _is_scalar(val):
             props[attr] = val
     return props
 
 
+def _node_entry(node) -> dict:
+    """Serialise one node's own content (everything except a nested group)."""
+    inputs = []
+    for inp in getattr(node, "inputs", []):
+        try:
+            inputs.append(to_serializable(getattr(inp, "default_value", None)))
+        except Exception:
+            inputs.append(None)
+
+    return {
+        "name": getattr(node, "name", ""),
+        "type": getattr(node, "bl_idname", ""),
+        "location": _node_location(node),
+        "props": _scalar_props(node),
+        "inputs": inputs,
+    }
+
+
+def _serialize_links(nt) -> list:
+    links = []
+    for link in nt.links:
+        links.append({
+            "from": [link.from_node.name, link.from_socket.name],
+            "to": [link.to_node.name, link.to_socket.name],
+        })
+    links.sort(key=lambda link: (
+        link["from"][0], link["from"][1], link["to"][0], link["to"][1],
+    ))
+    return links
+
+
 def serialize_node_tree(nt, _ancestors=frozenset()) -> dict:
     """
     Build a deterministic, JSON-serialisable description of a node tree.
@@ -106,20 +221,7 @@ def serialize_node_tree(nt, _ancestors=frozenset()) -> dict:
     next_ancestors = _ancestors | {id(nt)}
     nodes = []
     for node in nt.nodes:
-        inputs = []
-        for inp in getattr(node, "inputs", []):
-            try:
-                inputs.append(to_serializable(getattr(inp, "default_value", None)))
-            except Exception:
-                inputs.append(None)
-
-        entry = {
-            "name": getattr(node, "name", ""),
-            "type": getattr(node, "bl_idname", ""),
-            "location": _node_location(node),
-            "props": _scalar_props(node),
-            "inputs": inputs,
-        }
+        entry = _node_entry(node)
 
         # Fold the referenced group's CONTENT into the hash (group nodes expose
         # the nested tree via ``.node_tree``). Cycle-guarded; name is ignored.
@@ -131,22 +233,94 @@ def serialize_node_tree(nt, _ancestors=frozenset()) -> dict:
             )
         nodes.append(entry)
 
-    links = []
-    for link in nt.links:
-        links.append({
-            "from": [link.from_node.name, link.from_socket.name],
-            "to": [link.to_node.name, link.to_socket.name],
-        })
+    nodes.sort(key=lambda n: n["name"])
+    return {"nodes": nodes, "links": _serialize_links(nt)}
+
+
+# ---------------------------------------------------------------------------
+# Memoized hashing
+#
+# hash_node_tree() produces exactly json.dumps(serialize_node_tree(nt),
+# sort_keys=True) — the format hashes.json was written with — but serialises
+# each sub-tree ONCE per memo: a nested group's JSON text is cached and spliced
+# into every parent that embeds it (a nested dict dumps to the same text on its
+# own as inside its parent). A core ramp under 20 starters is walked once, not
+# 20+ times.
+#
+# A memo is only valid while none of the trees in it change. Callers that edit
+# or delete trees between hashes must drop_from_memo() / clear() accordingly.
+# ---------------------------------------------------------------------------
+
+# Placeholder for a nested group while its parent is dumped. Node and socket
+# names are C strings, so the NUL (json-encoded as \u0000) never occurs in
+# real content.
+_SUBTREE_TOKEN = "\x00lspotato-subtree-"
+
+
+def _memo_key(nt):
+    """Stable identity of a tree for the memo (the ID pointer on real bpy trees)."""
+    as_pointer = getattr(nt, "as_pointer", None)
+    if as_pointer is not None:
+        try:
+            return as_pointer()
+        except Exception:
+            pass
+    return id(nt)
+
+
+def drop_from_memo(memo: dict, nt) -> None:
+    """Forget *nt* before it is removed (its pointer may be reused)."""
+    memo.pop(_memo_key(nt), None)
+
+
+def _tree_json(nt, memo: dict, ancestors: frozenset) -> tuple[str, bool]:
+    """
+    JSON text of serialize_node_tree(nt), reusing memoized sub-trees.
+
+    Returns (text, cyclic). A tree whose serialisation hit a ``<cycle>`` marker
+    depends on the path it was reached by, so it is never memoized.
+    """
+    key = _memo_key(nt)
+    hit = memo.get(key)
+    if hit is not None:
+        return hit[1], False
+
+    next_ancestors = ancestors | {id(nt)}
+    cyclic = False
+    splices: dict[str, str] = {}
+    nodes = []
+    for node in nt.nodes:
+        entry = _node_entry(node)
+        sub = getattr(node, "node_tree", None)
+        if sub is not None:
+            if id(sub) in next_ancestors:
+                entry["group"] = "<cycle>"
+                cyclic = True
+            else:
+                sub_text, sub_cyclic = _tree_json(sub, memo, next_ancestors)
+                cyclic = cyclic or sub_cyclic
+                token = f"{_SUBTREE_TOKEN}{len(splices)}"
+                splices[json.dumps(token)] = sub_text
+                entry["group"] = token
+        nodes.append(entry)
 
     nodes.sort(key=lambda n: n["name"])
-    links.sort(key=lambda link: (
-        link["from"][0], link["from"][1], link["to"][0], link["to"][1],
-    ))
+    text = json.dumps({"nodes": nodes, "links": _serialize_links(nt)}, sort_keys=True)
+    for token, sub_text in splices.items():
+        text = text.replace(token, sub_text, 1)
 
-    return {"nodes": nodes, "links": links}
+    if not cyclic:
+        # Hold the tree itself so its id() cannot be reused while memoized.
+        memo[key] = (nt, text)
+    return text, cyclic
 
 
-def hash_node_tree(nt) -> str:
-    """Return the MD5 hex digest of a node tree's deterministic serialisation."""
-    payload = json.dumps(serialize_node_tree(nt), sort_keys=True)
-    return hashlib.md5(payload.encode("utf-8")).hexdigest()
+def hash_node_tree(nt, memo: dict | None = None) -> str:
+    """
+    Return the MD5 hex digest of a node tree's deterministic serialisation.
+
+    Pass the same *memo* dict to every call of one pass (e.g. a whole reconcile)
+    so shared nested groups are serialised once; see "Memoized hashing" above.
+    """
+    text, _cyclic = _tree_json(nt, {} if memo is None else memo, frozenset())
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
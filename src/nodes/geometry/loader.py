@@ -128,10 +128,11 @@ def init_geometry_nodes() -> dict:
     # ── Classify each shipped group ──────────────────────────────────────────
     to_bring: list[str] = []        # names that are absent or stale
     old_blocks: dict = {}           # name → existing datablock to replace
+    hash_memo: dict = {}            # shared sub-tree serialisations (read-only pass)
     for name, shipped_hash in hashes.items():
         existing = ng.get(name)
         if existing is not None and getattr(existing, "type", None) == "GEOMETRY":
-            if hash_node_tree(existing) == shipped_hash:
+            if hash_node_tree(existing, hash_memo) == shipped_hash:
                 result["skipped"] += 1
                 continue
             old_blocks[name] = existing
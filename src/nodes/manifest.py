@@ -0,0 +1,286 @@
+"""
+Compiled node-class manifest.
+
+Single source of truth for the manifest format, shared by:
+  * the NodeCompiler (compiler/exporter.py) — records every compiled class it
+    writes into ``<out_dir>/node_manifest.json``.
+  * the runtime NodeLib (node_impl.py)     — reads the manifest that ships at
+    ``src/nodes/shader/node_manifest.json`` so it can register the library,
+    build the idname index and filter starter packs WITHOUT executing every
+    generated module.
+  * package.py                             — regenerates it from the module
+    sources (scan_sources()) so every packaged zip ships a current one.
+
+Each entry records the class identity (bl_idname, bl_label, class name) and the
+module it lives in, plus that file's size / mtime / sha1 so the runtime can tell
+whether the manifest still describes the files on disk. An install rewrites
+every mtime; the shipped manifest stays read-only, so once the sha1s have
+vouched for the files NodeLib records their new stats in a side file in the
+add-on's user directory (see file_stamps) and later loads only stat them.
+``tree_hash`` is the
+hash_node_tree() of the tree the class builds, when the compiler could record
+it; the shader reconcile compares saved trees against it instead of building a
+fresh copy. A manifest that does not
+match the tree exactly is ignored and NodeLib falls back to the full scan.
+
+Like geometry/hashing.py this module is intentionally bpy-free, so it can be
+exercised under system Python.
+"""
+
+from __future__ import annotations
+import ast
+import hashlib
+import json
+import os
+from typing import NamedTuple
+
+MANIFEST_NAME = "node_manifest.json"
+
+# Side file of install-local file stats (see file_stamps), kept outside the
+# install; versioned like the manifest.
+STAMPS_NAME = "node_stamps.json"
+STAMPS_VERSION = 1
+
+# Python files under shader/ that are not generated node modules.
+SKIP_STEMS = frozenset({"__init__", "node", "utils", "node_impl", "node_info"})
+
+# Bump whenever the on-disk layout changes; a reader seeing any other version
+# treats the manifest as absent.
+MANIFEST_VERSION = 1
+
+# bl_label suffix of the shared cores the NodeCompiler's hoist split emits. They
+# are registered and reconciled like every compiled class, but are only ever
+# nested inside their parents, so the Add menu leaves them out.
+CORE_LABEL_SUFFIX = "__core"
+
+
+class NodeEntry(NamedTuple):
+    """One compiled node class as recorded in the manifest."""
+    bl_idname: str
+    bl_label: str
+    class_name: str
+    module: str       # posix path relative to the shader/ root, e.g. "lscherry/core/toon.py"
+    size: int
+    mtime_ns: int
+    sha1: str
+    tree_hash: str = ""   # canonical hash_node_tree() of the built tree, "" if unknown
+    props: tuple | None = None   # declared bpy.props (see _prop_spec), None if unknown
+
+
+def file_digest(path: str) -> str:
+    """Return the sha1 hex digest of the file at *path*."""
+    h = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def make_entry(root: str, module: str, bl_idname: str, bl_label: str,
+               class_name: str, tree_hash: str = "", props: tuple | None = None) -> NodeEntry:
+    """
+    Build an entry for *module* (relative to *root*), stamping its file state.
+    *props* defaults to the class's property declarations read from the source.
+    """
+    path = os.path.join(root, *module.split("/"))
+    if props is None:
+        props = next((found for _idname, _label, name, found in _source_classes(path)
+                      if name == class_name), None)
+    st = os.stat(path)
+    return NodeEntry(
+        bl_idname=bl_idname,
+        bl_label=bl_label,
+        class_name=class_name,
+        module=module,
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        sha1=file_digest(path),
+        tree_hash=tree_hash,
+        props=props,
+    )
+
+
+def is_current(entry: NodeEntry, path: str, stamps: dict | None = None) -> bool:
+    """
+    True if the file at *path* is still the one *entry* was recorded from.
+
+    Size + mtime is the cheap check, against the manifest or against the
+    install-local *stamps* (module → [size, mtime_ns, sha1], see file_stamps);
+    when neither matches (a zip install or a git checkout rewrites the mtime)
+    the content digest decides.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if st.st_size != entry.size:
+        return False
+    if st.st_mtime_ns == entry.mtime_ns:
+        return True
+    if stamps and stamps.get(entry.module) == [st.st_size, st.st_mtime_ns, entry.sha1]:
+        return True
+    try:
+        return file_digest(path) == entry.sha1
+    except OSError:
+        return False
+
+
+def file_stamps(entries: list[NodeEntry], root: str) -> dict:
+    """
+    module → [size, mtime_ns, sha1] of the files under *root*, for entries
+    is_current() just accepted: the content digest has vouched for those
+    files, so recording their stats lets the next load take the size + mtime
+    path instead of hashing every module again.
+    """
+    stamps = {}
+    for e in entries:
+        st = os.stat(os.path.join(root, *e.module.split("/")))
+        stamps[e.module] = [st.st_size, st.st_mtime_ns, e.sha1]
+    return stamps
+
+
+def read_stamps(path: str) -> dict:
+    """The stamps at *path*; empty when absent, unreadable or another version."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != STAMPS_VERSION:
+        return {}
+    modules = data.get("modules")
+    return modules if isinstance(modules, dict) else {}
+
+
+def write_stamps(path: str, stamps: dict) -> str:
+    """Write *stamps* to *path*. Returns the path."""
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"version": STAMPS_VERSION, "modules": stamps}, fh, sort_keys=True)
+    return path
+
+
+def _prop_spec(stmt: ast.AnnAssign) -> dict | None:
+    """
+    ``{"attr", "prop", "type", "update", "options"}`` for a class-level
+    ``name: bpy.props.X(...)`` declaration, or None when it is not one the
+    lazy stubs can redeclare: every keyword a literal, ``type`` a
+    ``bpy.types`` name and ``update`` (if any) the compiler's forward to
+    ``self.valuesUpdate``.
+    """
+    call = stmt.annotation
+    func = call.func if isinstance(call, ast.Call) else None
+    if not (stmt.value is None and isinstance(stmt.target, ast.Name)
+            and isinstance(func, ast.Attribute)
+            and ast.unparse(func.value) == "bpy.props" and not call.args):
+        return None
+    spec = {"attr": stmt.target.id, "prop": func.attr, "type": "", "update": False, "options": {}}
+    for kw in call.keywords:
+        if kw.arg == "type":
+            if not (isinstance(kw.value, ast.Attribute)
+                    and ast.unparse(kw.value.value) == "bpy.types"):
+                return None
+            spec["type"] = kw.value.attr
+        elif kw.arg == "update":
+            if ast.unparse(kw.value) != "lambda self, ctx: self.valuesUpdate(ctx)":
+                return None
+            spec["update"] = True
+        else:
+            try:
+                spec["options"][kw.arg] = ast.literal_eval(kw.value)
+            except ValueError:
+                return None
+    return spec
+
+
+def _class_props(node: ast.ClassDef) -> tuple | None:
+    """The prop specs of every annotated class attribute, or None if any is unknown."""
+    specs = []
+    for stmt in node.body:
+        if isinstance(stmt, ast.AnnAssign):
+            spec = _prop_spec(stmt)
+            if spec is None:
+                return None
+            specs.append(spec)
+    return tuple(specs)
+
+
+def _source_classes(path: str) -> list[tuple[str, str, str, tuple | None]]:
+    """
+    (bl_idname, bl_label, class name, props) of every class in *path* that
+    assigns both literally.
+    """
+    with open(path, "r", encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), filename=path)
+    found = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        attrs = {}
+        for stmt in node.body:
+            if (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1
+                    and isinstance(stmt.targets[0], ast.Name)
+                    and isinstance(stmt.value, ast.Constant)
+                    and isinstance(stmt.value.value, str)):
+                attrs[stmt.targets[0].id] = stmt.value.value
+        if "bl_idname" in attrs and "bl_label" in attrs:
+            found.append((attrs["bl_idname"], attrs["bl_label"], node.name, _class_props(node)))
+    return found
+
+
+def scan_sources(root: str) -> list[NodeEntry]:
+    """
+    Entries for every generated module under *root*, read from the source
+    without executing it — what packaging uses when no compile has left a
+    manifest behind. Tree hashes need Blender, so they are carried over from
+    the manifest already at *root* for modules whose sha1 is unchanged and are
+    otherwise left empty.
+    """
+    previous = {
+        (e.module, e.class_name): e
+        for e in read_manifest(os.path.join(root, MANIFEST_NAME)) or []
+    }
+    entries: list[NodeEntry] = []
+    for folder, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            stem, ext = os.path.splitext(name)
+            if ext != ".py" or stem in SKIP_STEMS:
+                continue
+            path = os.path.join(folder, name)
+            module = os.path.relpath(path, root).replace(os.sep, "/")
+            for bl_idname, bl_label, class_name, props in _source_classes(path):
+                entry = make_entry(root, module, bl_idname, bl_label, class_name,
+                                   props=props)
+                old = previous.get((module, class_name))
+                if old is not None and old.sha1 == entry.sha1:
+                    entry = entry._replace(tree_hash=old.tree_hash)
+                entries.append(entry)
+    return entries
+
+
+def read_manifest(path: str) -> list[NodeEntry] | None:
+    """Load the manifest at *path*; None when absent, unreadable or another version."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+    try:
+        entries = [NodeEntry(**rec) for rec in data.get("classes", [])]
+    except TypeError:
+        return None
+    return [e if e.props is None else e._replace(props=tuple(e.props)) for e in entries]
+
+
+def write_manifest(path: str, entries: list[NodeEntry]) -> str:
+    """Write *entries* to *path* (sorted by module, then class). Returns the path."""
+    ordered = sorted(entries, key=lambda e: (e.module, e.class_name))
+    payload = {
+        "version": MANIFEST_VERSION,
+        "classes": [e._asdict() for e in ordered],
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, indent=2)
+    return path
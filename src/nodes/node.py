@@ -1,4 +1,6 @@
+import json
 import os
+from contextlib import contextmanager
 import bpy  # type: ignore
 
 
@@ -29,6 +31,27 @@ def clear_node_registry() -> None:
     _NODE_CLASS_BY_IDNAME.clear()
 
 
+@contextmanager
+def node_registry_override(classes):
+    """
+    Resolve nested groups against *classes* only, for the duration of a block.
+
+    The NodeCompiler uses this to build the classes it just generated (rather
+    than the installed ones) so it can record their canonical tree hashes; the
+    previous registry contents are restored afterwards.
+    """
+    saved = dict(_NODE_CLASS_REGISTRY), dict(_NODE_CLASS_BY_IDNAME)
+    clear_node_registry()
+    for cls in classes:
+        register_node_class(cls)
+    try:
+        yield
+    finally:
+        clear_node_registry()
+        _NODE_CLASS_REGISTRY.update(saved[0])
+        _NODE_CLASS_BY_IDNAME.update(saved[1])
+
+
 def get_node_class_by_idname(idname: str):
     """Return the compiled class for a bl_idname, or None if unknown."""
     return _NODE_CLASS_BY_IDNAME.get(idname)
@@ -65,9 +88,67 @@ def ensure_node_group(key: str):
     return None
 
 
+# ---------------------------------------------------------------------------
+# Packaged image registry
+#
+# Each packaged texture maps to exactly one image datablock, whichever node or
+# nested group asks for it. The datablock is tagged with its filename, so the
+# mapping survives save / reload, and the registry remembers its name so a
+# repeat request is one dict lookup (images.load(check_existing=True) compares
+# the path against every image in the file, per call).
+#
+# The open file is indexed once, on the first request after each file load
+# (reset_packaged_images runs from the load_post handler); later additions are
+# registered as they are made. A texture the registry does not know yet goes
+# through images.load(check_existing=True), which reuses a datablock already
+# holding that path and otherwise sets the colour space and alpha from the
+# file the way opening it by hand would.
+# ---------------------------------------------------------------------------
+_IMAGE_KEY_PROP = "lspotato_packaged_image"
+_PACKAGED_IMAGES: dict = {}   # filename → image datablock name
+_PACKAGED_INDEXED = False
+_PACKAGED_IMAGE_DIR = os.path.join(os.path.dirname(__file__), "shader", "images")
+
+
+def _index_packaged_images() -> None:
+    """
+    Rebuild the registry from the open file: tagged images, plus untagged ones
+    an older version loaded straight from the packaged folder (adopted and
+    tagged, so existing files keep one datablock per texture).
+    """
+    global _PACKAGED_INDEXED
+    _PACKAGED_IMAGES.clear()
+    _PACKAGED_INDEXED = True
+    folder = os.path.normcase(os.path.abspath(_PACKAGED_IMAGE_DIR))
+    for image in bpy.data.images:
+        key = image.get(_IMAGE_KEY_PROP)
+        if key is None and image.source == "FILE" and image.filepath:
+            path = os.path.normcase(os.path.abspath(bpy.path.abspath(image.filepath)))
+            if os.path.dirname(path) == folder:
+                key = os.path.basename(image.filepath)
+                image[_IMAGE_KEY_PROP] = key
+        if isinstance(key, str):
+            _PACKAGED_IMAGES.setdefault(key, image.name)
+
+
+def reset_packaged_images():
+    """Drop the registry; the next request re-indexes the newly loaded file."""
+    global _PACKAGED_INDEXED
+    _PACKAGED_IMAGES.clear()
+    _PACKAGED_INDEXED = False
+
+
+def _registered_image(filename: str):
+    image = bpy.data.images.get(_PACKAGED_IMAGES.get(filename, ""))
+    if image is not None and image.get(_IMAGE_KEY_PROP) == filename:
+        return image
+    return None
+
+
 def load_packaged_image(filename: str):
     """
-    Load a texture shipped inside the addon's nodes/shader/images/ folder.
+    The image datablock of a texture shipped inside the addon's
+    nodes/shader/images/ folder.
 
     Used by compiled nodes whose source group already had an image assigned
     (a *predefined* texture, as opposed to an empty user-input placeholder).
@@ -75,15 +156,241 @@ def load_packaged_image(filename: str):
     this file is src/nodes/node.py, so the path is resolved relative to this
     module and is independent of the calling node's folder depth.
 
-    check_existing=True dedupes — a second node referencing the same file
-    reuses the already-loaded datablock. A missing file degrades gracefully
-    to None (the node behaves like an empty placeholder) instead of raising.
+    Every call for one filename returns the same datablock (see "Packaged
+    image registry" above). A missing file
+    degrades gracefully to None (the node behaves like an empty placeholder)
+    instead of raising.
     """
-    path = os.path.join(os.path.dirname(__file__), "shader", "images", filename)
+    if not _PACKAGED_INDEXED:
+        _index_packaged_images()
+    image = _registered_image(filename)
+    if image is not None:
+        return image
+
+    path = os.path.join(_PACKAGED_IMAGE_DIR, filename)
+    if not os.path.isfile(path):
+        return None
     try:
-        return bpy.data.images.load(path, check_existing=True)
+        image = bpy.data.images.load(path, check_existing=True)
     except Exception:
         return None
+    image[_IMAGE_KEY_PROP] = filename
+    _PACKAGED_IMAGES[filename] = image.name
+    return image
+
+
+# ---------------------------------------------------------------------------
+# Per-instance values (generated valuesUpdate)
+#
+# A compiled node writes its image properties and UV map into the placeholder
+# TEX_IMAGE and UV Map nodes of its own tree. The NodeCompiler names those nodes
+# after their var_name, so they are found by name, and their positions are
+# cached per tree (ID.session_uid): an edit touches just those nodes instead
+# of scanning the whole tree. Positions, not node references, are cached —
+# undo frees and re-reads nodes — and a stale position is caught by its name
+# and looked up again. The cache is dropped on every file load (see
+# clear_instance_cache), so trees of closed files do not pile up.
+# ---------------------------------------------------------------------------
+_NODE_POSITIONS: dict = {}
+
+
+def clear_instance_cache():
+    """Forget every cached node position (called from the load_post handler)."""
+    _NODE_POSITIONS.clear()
+
+
+def _instance_nodes(nt, names) -> list:
+    """The nodes of *nt* called *names*, in order (None where absent)."""
+    nodes = nt.nodes
+    count = len(nodes)
+    cache = _NODE_POSITIONS.setdefault(nt.session_uid, {})
+    found = []
+    for name in names:
+        i = cache.get(name, -1)
+        node = nodes[i] if 0 <= i < count else None
+        if node is None or node.name != name:
+            i = nodes.find(name)
+            if i < 0 and len(name.encode("utf-8")) > 63:
+                # Modules compiled before names were bounded: Blender cut
+                # the name to 63 bytes when the tree was built.
+                i = nodes.find(name.encode("utf-8")[:63].decode("utf-8", "ignore"))
+            cache[name] = i
+            node = nodes[i] if i >= 0 else None
+        found.append(node)
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Tree descriptions (NodeCompiler JSON tree format)
+#
+# Instead of carrying its tree as straight-line Python, a class compiled in the
+# JSON format ships a ``<module>.tree.json`` next to a small stub whose
+# createNodetree() calls build_node_tree(). The builder performs the steps the
+# generated code would (see code_gen.generate_tree_data), one loop per step
+# over every node rather than one statement per value.
+# ---------------------------------------------------------------------------
+
+# Layout version written by code_gen.generate_tree_data(); others are refused.
+TREE_FORMAT_VERSION = 1
+
+
+def build_node_tree(owner, path: str):
+    """Build *owner*'s class-level node tree from the tree description at *path*."""
+    with open(path, "r", encoding="utf-8") as fh:
+        data = json.load(fh)
+    if data.get("format") != TREE_FORMAT_VERSION:
+        raise ValueError(
+            f"{os.path.basename(path)}: unsupported tree format {data.get('format')!r}"
+        )
+
+    nt = owner.node_tree = bpy.data.node_groups.new(
+        owner._PREFIX + owner.bl_label, data["tree_type"]
+    )
+    nt.color_tag = data["color_tag"]
+    if data.get("description"):
+        nt.description = data["description"]
+
+    items = _build_interface(nt, data["interface"])
+
+    specs = data["nodes"]
+    nodes = [nt.nodes.new(spec["idname"]) for spec in specs]
+    for node, spec in zip(nodes, specs):
+        node.location = spec["loc"]
+        if "name" in spec:
+            node.name = spec["name"]
+        if "width" in spec:
+            node.width = spec["width"]
+        if "label" in spec:
+            node.label = spec["label"]
+        if spec.get("hide"):
+            node.hide = True
+    for node, spec in zip(nodes, specs):
+        if "group" in spec:
+            node.node_tree = ensure_node_group(spec["group"])
+        elif "blend_group" in spec:
+            node.node_tree = bpy.data.node_groups.get(spec["blend_group"])
+        if "image" in spec:
+            node.image = load_packaged_image(spec["image"])
+        for attr, value in spec.get("attrs", {}).items():
+            setattr(node, attr, value)
+        # Internal datablocks + dynamic sockets before any default or link
+        # touches the sockets they create.
+        if "ramp" in spec:
+            _apply_color_ramp(node.color_ramp, spec["ramp"])
+        if "curve" in spec:
+            _apply_curve_mapping(node.mapping, spec["curve"])
+        if "enum" in spec or "index_switch" in spec:
+            _apply_dynamic_items(node, spec)
+        for idx, value in spec.get("outputs", ()):
+            node.outputs[idx].default_value = value
+        for idx, value in spec.get("inputs", ()):
+            node.inputs[idx].default_value = value
+
+    for in_idx, out_idx in data.get("zones", ()):
+        nodes[in_idx].pair_with_output(nodes[out_idx])
+        for socket_type, name in specs[out_idx].get("repeat_items", ()):
+            nodes[out_idx].repeat_items.new(socket_type, name)
+
+    new_link = nt.links.new
+    for from_idx, from_key, to_idx, to_key in data["links"]:
+        new_link(nodes[from_idx].outputs[from_key], nodes[to_idx].inputs[to_key])
+
+    # A Menu socket's enum only exists once its Group Input is linked.
+    for idx, value in data.get("menu_defaults", ()):
+        items[idx].default_value = value
+
+    if data.get("values_update"):
+        owner.valuesUpdate(None)
+    return nt
+
+
+def _build_interface(nt, specs: list) -> list:
+    """Create every interface panel / socket in order; returns them by position."""
+    items = []
+    for spec in specs:
+        parent = items[spec["parent"]] if "parent" in spec else None
+        if "panel" in spec:
+            item = nt.interface.new_panel(name=spec["panel"],
+                                          default_closed=spec.get("closed", False))
+            if spec.get("description"):
+                item.description = spec["description"]
+            if parent is not None:
+                nt.interface.move_to_parent(item, parent, len(parent.interface_items))
+        else:
+            item = nt.interface.new_socket(name=spec["socket"], in_out=spec["in_out"],
+                                           socket_type=spec["type"], parent=parent)
+            if "default" in spec:
+                item.default_value = spec["default"]
+            if "min" in spec:
+                item.min_value = spec["min"]
+            if "max" in spec:
+                item.max_value = spec["max"]
+            if "subtype" in spec:
+                item.subtype = spec["subtype"]
+            if spec.get("hide_value"):
+                item.hide_value = True
+            if spec.get("hide_in_modifier"):
+                item.hide_in_modifier = True
+            if "dimensions" in spec:
+                item.dimensions = spec["dimensions"]
+        items.append(item)
+    return items
+
+
+def _apply_color_ramp(cr, spec: dict) -> None:
+    cr.color_mode = spec["color_mode"]
+    cr.interpolation = spec["interpolation"]
+    cr.hue_interpolation = spec["hue_interpolation"]
+    # A fresh ramp has two stops; trim to one, then place each captured stop.
+    while len(cr.elements) > 1:
+        cr.elements.remove(cr.elements[-1])
+    for i, element in enumerate(spec.get("elements", ())):
+        e = cr.elements[0] if i == 0 else cr.elements.new(element["position"])
+        e.position = element["position"]
+        e.color = element["color"]
+
+
+def _apply_curve_mapping(m, spec: dict) -> None:
+    if spec.get("use_clip"):
+        m.use_clip = True
+    for key in ("clip_min_x", "clip_min_y", "clip_max_x", "clip_max_y",
+                "extend", "black_level", "white_level"):
+        if spec.get(key) is not None:
+            setattr(m, key, spec[key])
+    for ci, points in enumerate(spec.get("curves", ())):
+        c = m.curves[ci]
+        # Curves start with two points; trim extras, then place each point.
+        while len(c.points) > 2:
+            c.points.remove(c.points[-1])
+        for pi, p in enumerate(points):
+            x, y = p["location"][0], p["location"][1]
+            if pi < 2:
+                point = c.points[pi]
+                point.location = (x, y)
+            else:
+                point = c.points.new(x, y)
+            point.handle_type = p["handle_type"]
+    m.update()
+
+
+def _apply_dynamic_items(node, spec: dict) -> None:
+    """Rebuild Menu / Index Switch items, then re-apply the deferred active_index."""
+    if "enum" in spec:
+        enum_items = node.enum_definition.enum_items
+        while len(enum_items):
+            enum_items.remove(enum_items[-1])
+        for it in spec["enum"]:
+            item = enum_items.new(it["name"])
+            if it.get("description"):
+                item.description = it["description"]
+    else:
+        isw = node.index_switch_items
+        while len(isw) > spec["index_switch"]:
+            isw.remove(isw[-1])
+        while len(isw) < spec["index_switch"]:
+            isw.new()
+    if "active_index" in spec:
+        node.active_index = spec["active_index"]
 
 
 class Node:
@@ -159,6 +466,42 @@ class Node:
             return proxy.node_tree
         return bpy.data.node_groups.get(key)
 
+    def applyInstanceValues(self, context, images, uv_nodes=()):
+        """
+        Body of the generated valuesUpdate(): write the image properties
+        (*images*: placeholder node name → property name) and ``uv_map`` into
+        the named nodes of this node's tree.
+
+        When every node already holds its value nothing happens, so picking
+        the current image again neither forks nor touches the tree. Otherwise
+        a tree shared with other instances is copied first (on a real update,
+        i.e. with a context) and the values are written into the copy.
+        """
+        nt = self.node_tree
+        if nt is None:
+            return
+        names = list(images) + list(uv_nodes)
+        wanted = [("image", getattr(self, prop)) for prop in images.values()]
+        uv_map = self.uv_map if uv_nodes else ""
+        wanted += [("uv_map", uv_map)] * len(uv_nodes)
+
+        def pending(nodes):
+            return [
+                (node, attr, value)
+                for node, (attr, value) in zip(nodes, wanted)
+                if node is not None and (attr == "image" or value)
+                and getattr(node, attr) != value
+            ]
+
+        writes = pending(_instance_nodes(nt, names))
+        if not writes:
+            return
+        if context is not None and nt.users > 1:
+            nt = self.node_tree = nt.copy()
+            writes = pending(_instance_nodes(nt, names))
+        for node, attr, value in writes:
+            setattr(node, attr, value)
+
     def addSocket(self, is_output, sockettype, name):
         in_out = "OUTPUT" if is_output else "INPUT"
         return self.node_tree.interface.new_socket(
@@ -203,3 +546,92 @@ class ShaderNode(Node, bpy.types.ShaderNodeCustomGroup):
 class GeometryNode(Node, bpy.types.GeometryNodeCustomGroup):
     """Base class for every Geometry node group."""
     _PREFIX = "."
+
+
+# ---------------------------------------------------------------------------
+# Lazy node classes
+#
+# In lazy mode (addon preference) NodeLib registers one LazyShaderNode subclass
+# per manifest entry instead of executing the compiled module. The stub carries
+# bl_idname / bl_label / draw_label and, declared up front from the manifest,
+# the class's bpy.props — Blender only takes properties at registration. The
+# real module is executed the first time the class has to build or drive its
+# tree, and its methods are then copied onto the registered stub so later calls
+# go direct.
+# ---------------------------------------------------------------------------
+
+# Names never copied from the real class onto the registered stub.
+_LAZY_KEEP = frozenset({
+    "__module__", "__qualname__", "__dict__", "__weakref__", "__doc__",
+    "__annotations__", "__annotate__", "bl_idname", "bl_label", "bl_rna",
+})
+
+
+def lazy_annotations(props) -> dict:
+    """bpy.props declarations for a stub, from a manifest entry's prop specs."""
+    annotations = {}
+    for spec in props:
+        options = dict(spec["options"])
+        if spec["type"]:
+            options["type"] = getattr(bpy.types, spec["type"])
+        if spec["update"]:
+            options["update"] = lambda self, ctx: self.valuesUpdate(ctx)
+        annotations[spec["attr"]] = getattr(bpy.props, spec["prop"])(**options)
+    return annotations
+
+
+def _lazy_owner(obj):
+    """The stub class behind a node instance or a create_node_group proxy."""
+    if isinstance(obj, LazyShaderNode):
+        return type(obj)
+    return _NODE_CLASS_REGISTRY.get(obj._PREFIX + obj.bl_label)
+
+
+class LazyShaderNode(ShaderNode):
+    """Registered stand-in for a compiled class whose module is not loaded yet."""
+    _LAZY_ENTRY = None      # nodes.manifest.NodeEntry the stub was made from
+    _LAZY_DISPLAY = ""
+
+    def draw_label(self):
+        return self._LAZY_DISPLAY
+
+    @classmethod
+    def _materialize(cls):
+        """Load the real class once, graft it onto this stub, and return it."""
+        real = cls.__dict__.get("_LAZY_REAL")
+        if real is not None:
+            return real
+        from .node_impl import NodeLib
+        real = NodeLib.load_class(cls._LAZY_ENTRY)
+        if real is None:
+            raise RuntimeError(f"cannot load compiled class for '{cls.bl_idname}'")
+        declared = real.__dict__.get("__annotations__", {})
+        if set(declared) != set(cls.__dict__.get("__annotations__", {})):
+            raise RuntimeError(f"'{cls.bl_idname}' declares other properties than its manifest entry")
+        for name, value in real.__dict__.items():
+            if name not in _LAZY_KEEP and name not in declared:
+                setattr(cls, name, value)
+        cls._LAZY_REAL = real
+        # The stub's class attributes just changed under the same bl_idname.
+        from .geometry.hashing import drop_prop_plan
+        drop_prop_plan(cls.bl_idname)
+        return real
+
+    @classmethod
+    def create_node_group(cls):
+        cls._materialize()
+        return super().create_node_group()
+
+    def init(self, context):
+        type(self)._materialize().init(self, context)
+
+    def draw_buttons(self, context, layout):
+        type(self)._materialize().draw_buttons(self, context, layout)
+
+    def createNodetree(self, name):
+        _lazy_owner(self)._materialize().createNodetree(self, name)
+
+    def valuesUpdate(self, context):
+        fn = getattr(_lazy_owner(self)._materialize(), "valuesUpdate", None)
+        if fn is not None:
+            fn(self, context)
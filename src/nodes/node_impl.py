@@ -1,9 +1,16 @@
+import hashlib
 import importlib.util
 import sys
+import time
 from pathlib import Path
 import os
 import bpy  # type: ignore
 from ..utils.logger import get_logger
+from .code_cache import CodeCache
+from .manifest import (
+    MANIFEST_NAME, SKIP_STEMS, STAMPS_NAME, NodeEntry, file_stamps, is_current,
+    read_manifest, read_stamps, write_stamps,
+)
 
 
 logger = get_logger("NodeImpl")
@@ -14,6 +21,20 @@ logger = get_logger("NodeImpl")
 _NODES_DIR   = Path(os.path.dirname(os.path.abspath(__file__)))
 _shader_DIR = _NODES_DIR / "shader"
 
+# Written by the NodeCompiler next to lscherry/ (see nodes/manifest.py).
+_MANIFEST_PATH = _shader_DIR / MANIFEST_NAME
+
+# Sub-folder of the add-on's user directory holding marshalled code objects
+# (see nodes/code_cache.py).
+_CODE_CACHE_DIR = "node_code"
+
+# Session cache, filled by NodeLib.refresh(). Lives for the whole Blender
+# session — across unregister/register (starter toggles) and every load_post.
+# refresh() re-stats the tree once per register and drops the cache when the
+# fingerprint (manifest + module stats) moved; a recompile drops it outright
+# with NodeLib.invalidate().
+_SESSION: dict = {}
+
 # Base types used to validate candidate classes.
 # Shader only for now — geometry node support is deferred, so GeometryNode
 # subclasses are intentionally NOT scanned, registered, or added to the menu.
@@ -56,25 +77,365 @@ _BASE_TYPES = (
 
 class NodeLib:
     """
-    Scans the entire src/nodes/shader/ tree following the actual LSCherry layout
-    and returns the list of compiled node classes, ready to register.
+    Discovers the compiled node classes under src/nodes/shader/ following the
+    actual LSCherry layout, ready to register.
+
+    When the compiler's node_manifest.json matches the files on disk, class
+    identity (bl_idname / bl_label) comes straight from the manifest and only
+    the modules that are actually needed get executed. Without a current
+    manifest every generated module is executed, as before.
+
+    Entries, the idname index and every executed module's classes are memoized
+    for the session, so repeated calls are lookups; refresh() re-stats the tree
+    once per registration.
     """
 
     @staticmethod
-    def get_node_classes() -> list:
-        """Returns the list of all shader node classes. Safe — never raises."""
+    def get_node_classes(select=None, lazy: bool = False) -> list:
+        """
+        Returns the compiled shader node classes. Safe — never raises.
+
+        *select* optionally narrows the set before anything is loaded: it takes
+        a list of items exposing ``bl_label`` / ``bl_idname`` (manifest entries,
+        or classes on the scan fallback) and returns the subset to keep, e.g.
+        addon_preferences.filter_enabled_node_classes. With a manifest, modules
+        of unselected classes are never executed.
+
+        *lazy* returns LazyShaderNode stubs instead of the real classes, so no
+        module runs until a node of that type is built. It needs a current
+        manifest; without one the scan has already executed everything and the
+        real classes are returned.
+        """
         try:
-            return NodeLib._scan_all()
+            start = time.perf_counter()
+            code_cache = NodeLib._session()["code"]
+            if code_cache is not None:
+                code_cache.reset_stats()
+            entries = NodeLib._manifest_entries()
+            if entries is None:
+                classes = NodeLib._scan_all()
+                classes = select(classes) if select else classes
+            else:
+                if select:
+                    entries = select(entries)
+                if lazy:
+                    classes = [cls for cls in map(NodeLib.make_lazy_class, entries)
+                               if cls is not None]
+                    NodeLib._log_deferred(entries)
+                    return classes
+                classes = NodeLib._load_entries(entries)
+            NodeLib._log_load_time(len(classes), start, code_cache)
+            return classes
         except Exception as e:
             logger.error(f"NodeLib.get_node_classes error: {e}")
             return []
 
+    @staticmethod
+    def get_node_entries() -> list[NodeEntry]:
+        """
+        Returns one NodeEntry per compiled class. Safe — never raises.
+
+        Read from the manifest when it is current; otherwise derived from a full
+        scan (which executes every module).
+        """
+        try:
+            return NodeLib._cached("entries", NodeLib._build_entries)
+        except Exception as e:
+            logger.error(f"NodeLib.get_node_entries error: {e}")
+            return []
+
+    @staticmethod
+    def get_index() -> dict[str, NodeEntry]:
+        """bl_idname → NodeEntry for every compiled class, memoized for the session."""
+        return NodeLib._cached(
+            "index", lambda: {e.bl_idname: e for e in NodeLib.get_node_entries()}
+        )
+
+    @staticmethod
+    def get_idnames() -> frozenset[str]:
+        """bl_idname of every compiled class (manifest-backed when possible)."""
+        return NodeLib._cached("idnames", lambda: frozenset(NodeLib.get_index()))
+
+    @staticmethod
+    def get_library_fingerprint() -> str:
+        """
+        Content fingerprint of the whole compiled library, or "" when unknown.
+
+        Derived from the manifest's per-module sha1 and tree hash, so it only
+        moves when generated code does (not on a reinstall that rewrites
+        mtimes). The scan fallback records no digests and yields "".
+        """
+        return NodeLib._cached("library", NodeLib._build_library_fingerprint)
+
     @staticmethod
     def get_class_names() -> list[str]:
-        return [cls.__name__ for cls in NodeLib.get_node_classes()]
+        return [e.class_name for e in NodeLib.get_node_entries()]
+
+    @staticmethod
+    def load_class(entry: NodeEntry):
+        """Execute *entry*'s module and return its class, or None."""
+        start = time.perf_counter()
+        for cls in NodeLib._load_module(entry.module, NodeLib._session()):
+            if cls.__name__ == entry.class_name:
+                logger.debug(
+                    f"NodeLib: lazy-loaded '{entry.class_name}' in "
+                    f"{(time.perf_counter() - start) * 1000:.1f} ms"
+                )
+                return cls
+        logger.error(f"NodeLib: '{entry.class_name}' not found in '{entry.module}'")
+        return None
+
+    @staticmethod
+    def make_lazy_class(entry: NodeEntry):
+        """
+        A registrable stub for *entry*; see node.LazyShaderNode. An entry whose
+        properties the manifest could not record gets its real class instead
+        (None if it fails to load), since a stub cannot gain them later.
+        """
+        if entry.props is None:
+            return NodeLib.load_class(entry)
+        from .node import LazyShaderNode, lazy_annotations
+        label = entry.bl_label
+        display = label.rsplit(".", 1)[-1].strip() if "." in label else label
+        return type(entry.class_name, (LazyShaderNode,), {
+            "bl_idname":       entry.bl_idname,
+            "bl_label":        entry.bl_label,
+            "__annotations__": lazy_annotations(entry.props),
+            "_LAZY_ENTRY":     entry,
+            "_LAZY_DISPLAY":   display,
+        })
 
     # ------------------------------------------------------------------ internal
 
+    @staticmethod
+    def _log_deferred(entries: list[NodeEntry]) -> None:
+        """Debug summary of the generated source lazy mode left unexecuted, per folder."""
+        per_pack: dict[str, list[int]] = {}
+        for e in entries:
+            pack = e.module.rsplit("/", 1)[0]
+            stats = per_pack.setdefault(pack, [0, 0])
+            stats[0] += 1
+            stats[1] += e.size
+        for pack, (count, size) in sorted(per_pack.items()):
+            logger.debug(f"NodeLib: lazy — deferred {count} module(s), {size / 1024:.0f} KB in {pack}/")
+
+    @staticmethod
+    def _log_load_time(count: int, start: float, code_cache) -> None:
+        elapsed = (time.perf_counter() - start) * 1000
+        if code_cache is None:
+            logger.info(f"NodeLib: {count} class(es) ready in {elapsed:.1f} ms (no code cache)")
+        else:
+            logger.info(
+                f"NodeLib: {count} class(es) ready in {elapsed:.1f} ms "
+                f"(code cache: {code_cache.hits} hit(s), {code_cache.misses} compiled)"
+            )
+
+    @staticmethod
+    def refresh() -> None:
+        """
+        Re-stat the tree and drop the session cache if it moved since the last
+        refresh. Called once per add-on registration.
+
+        The fingerprint is the manifest's stat plus (path, size, mtime) of every
+        generated module — one directory walk and a few hundred stats, far
+        cheaper than re-validating the manifest or re-executing the modules, but
+        not free, so it is not repeated on every lookup.
+        """
+        files = NodeLib._module_files()
+        fingerprint = NodeLib._fingerprint(files)
+        if _SESSION.get("fingerprint") != fingerprint:
+            _SESSION.clear()
+            _SESSION.update(
+                fingerprint=fingerprint, files=files, modules={}, digests={},
+                code=NodeLib._open_code_cache(),
+            )
+
+    @staticmethod
+    def invalidate() -> None:
+        """Drop the session cache (e.g. after a recompile); the next call rereads the tree."""
+        _SESSION.clear()
+
+    @staticmethod
+    def _session() -> dict:
+        """The session cache, filled by refresh() on first use."""
+        if not _SESSION:
+            NodeLib.refresh()
+        return _SESSION
+
+    @staticmethod
+    def _cached(key: str, build):
+        """Session value *key*, built with *build()* on first use."""
+        session = NodeLib._session()
+        if key not in session:
+            session[key] = build()
+        return session[key]
+
+    @staticmethod
+    def _build_entries() -> list[NodeEntry]:
+        entries = NodeLib._manifest_entries()
+        if entries is None:
+            entries = [NodeLib._entry_for(cls) for cls in NodeLib._scan_all()]
+        return entries
+
+    @staticmethod
+    def _build_library_fingerprint() -> str:
+        entries = NodeLib.get_node_entries()
+        if not entries or any(not e.sha1 for e in entries):
+            return ""
+        h = hashlib.sha1()
+        for e in sorted(entries, key=lambda e: (e.module, e.class_name)):
+            h.update(f"{e.module}:{e.class_name}:{e.sha1}:{e.tree_hash}\n".encode("utf-8"))
+        return h.hexdigest()
+
+    @staticmethod
+    def _user_path(path: str = "") -> str | None:
+        """*path* in the add-on's user directory, or None when there is none."""
+        try:
+            base_package = (__package__ or "").rsplit(".", 1)[0]
+            return bpy.utils.extension_path_user(base_package, path=path, create=True)
+        except Exception:
+            # Legacy (non-extension) install or no writable user directory.
+            return None
+
+    @staticmethod
+    def _open_code_cache() -> CodeCache | None:
+        """The code cache in the add-on's user directory, or None when there is none."""
+        directory = NodeLib._user_path(_CODE_CACHE_DIR)
+        # Without one, modules are compiled from source as before.
+        return CodeCache(directory) if directory is not None else None
+
+    @staticmethod
+    def _fingerprint(files: dict[str, Path]) -> tuple:
+        stamps = []
+        for module, path in files.items():
+            st = path.stat()
+            stamps.append((module, st.st_size, st.st_mtime_ns))
+        try:
+            st = _MANIFEST_PATH.stat()
+            manifest = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            manifest = None
+        return manifest, tuple(stamps)
+
+    @staticmethod
+    def _module_files() -> dict[str, Path]:
+        """Every generated module under shader/, keyed by its posix path relative to it."""
+        files: dict[str, Path] = {}
+        for py_file in sorted(_shader_DIR.rglob("*.py")):
+            if py_file.stem in SKIP_STEMS:
+                continue
+            files[py_file.relative_to(_shader_DIR).as_posix()] = py_file
+        return files
+
+    @staticmethod
+    def _manifest_entries() -> list[NodeEntry] | None:
+        """
+        Return the manifest entries if the manifest describes the tree exactly,
+        else None. Exact means the same module set and every module unchanged
+        since the compiler recorded it — a partial copy or a hand edit falls
+        back to the scan rather than registering from stale metadata.
+        """
+        session = NodeLib._session()
+        if "manifest" in session:
+            return session["manifest"]
+        session["manifest"] = entries = NodeLib._read_current_manifest(session["files"])
+        if entries is not None:
+            # Manifest sha1s double as code-cache keys: no source read on a hit,
+            # and anything the current tree no longer has can go.
+            session["digests"] = {e.module: e.sha1 for e in entries}
+            if session["code"] is not None:
+                session["code"].prune(set(session["digests"].values()))
+        return entries
+
+    @staticmethod
+    def _read_current_manifest(files: dict[str, Path]) -> list[NodeEntry] | None:
+        if not _shader_DIR.is_dir():
+            return None
+        entries = read_manifest(str(_MANIFEST_PATH))
+        if entries is None:
+            return None
+
+        recorded: dict[str, NodeEntry] = {}
+        for e in entries:
+            recorded.setdefault(e.module, e)
+        if set(recorded) != set(files):
+            logger.warning("NodeLib: node manifest does not match shader/ — rescanning")
+            return None
+        user_dir = NodeLib._user_path()
+        stamps_path = os.path.join(user_dir, STAMPS_NAME) if user_dir is not None else None
+        stamps = read_stamps(stamps_path) if stamps_path is not None else {}
+        for module, entry in recorded.items():
+            if not is_current(entry, str(files[module]), stamps):
+                logger.warning(f"NodeLib: '{module}' changed since the manifest was written — rescanning")
+                return None
+        if stamps_path is not None:
+            NodeLib._record_stamps(list(recorded.values()), stamps, stamps_path)
+        return entries
+
+    @staticmethod
+    def _record_stamps(entries: list[NodeEntry], stamps: dict, path: str) -> None:
+        """
+        Record the modules' current stats once the sha1s accepted them, so an
+        install (which rewrites every mtime) hashes the modules only on its
+        first load. The shipped manifest is never written: the stats go to the
+        user directory, next to the code cache. Best effort.
+        """
+        current = file_stamps(entries, str(_shader_DIR))
+        if current == stamps:
+            return
+        try:
+            write_stamps(path, current)
+        except OSError as e:
+            logger.debug(f"NodeLib: cannot record node module stats: {e}")
+            return
+        logger.info(f"NodeLib: recorded node module stats ({len(current)} module(s))")
+
+    @staticmethod
+    def _load_entries(entries: list[NodeEntry]) -> list:
+        """Execute only the modules *entries* live in and return their classes, in entry order."""
+        wanted: dict[str, set[str]] = {}
+        for e in entries:
+            wanted.setdefault(e.module, set()).add(e.class_name)
+
+        session = NodeLib._session()
+        by_name: dict[str, type] = {}
+        for module, names in wanted.items():
+            for cls in NodeLib._load_module(module, session):
+                if cls.__name__ in names:
+                    by_name.setdefault(cls.__name__, cls)
+
+        classes: list = []
+        seen: set[str] = set()
+        for e in entries:
+            cls = by_name.get(e.class_name)
+            if cls is None:
+                logger.error(f"NodeLib: '{e.class_name}' not found in '{e.module}'")
+                continue
+            if cls.__name__ not in seen:
+                seen.add(cls.__name__)
+                classes.append(cls)
+        return classes
+
+    @staticmethod
+    def _entry_for(cls) -> NodeEntry:
+        """Manifest-shaped entry for a class found by the scan (no file state)."""
+        # _load_file names modules "<package>.shader.<a>.<b>.<stem>"; map that
+        # back onto the shader/-relative path the manifest uses.
+        base = (__package__ or "") + ".shader."
+        dotted = cls.__module__
+        if dotted.startswith(base):
+            dotted = dotted[len(base):]
+        module = dotted.replace(".", "/") + ".py"
+        return NodeEntry(
+            bl_idname=cls.bl_idname,
+            bl_label=cls.bl_label,
+            class_name=cls.__name__,
+            module=module,
+            size=0,
+            mtime_ns=0,
+            sha1="",
+        )
+
     @staticmethod
     def _scan_all() -> list:
         if not _shader_DIR.is_dir():
@@ -84,12 +445,9 @@ class NodeLib:
         seen: set[str] = set()
         classes: list = []
 
-        SKIP_STEMS = {"__init__", "node", "utils", "node_impl", "node_info"}
-
-        for py_file in sorted(_shader_DIR.rglob("*.py")):
-            if py_file.stem in SKIP_STEMS:
-                continue
-            for cls in NodeLib._load_file(py_file):
+        session = NodeLib._session()
+        for module in session["files"]:
+            for cls in NodeLib._load_module(module, session):
                 if cls.__name__ not in seen:
                     seen.add(cls.__name__)
                     classes.append(cls)
@@ -97,7 +455,18 @@ class NodeLib:
         return classes
 
     @staticmethod
-    def _load_file(py_file: Path) -> list:
+    def _load_module(module: str, session: dict) -> list:
+        """Classes of the shader/-relative *module*, executed at most once per session."""
+        loaded = session["modules"]
+        if module not in loaded:
+            loaded[module] = NodeLib._load_file(
+                _shader_DIR / module, session["digests"].get(module), session["code"]
+            )
+        return loaded[module]
+
+    @staticmethod
+    def _load_file(py_file: Path, digest: str | None = None,
+                   code_cache: CodeCache | None = None) -> list:
         # Derive the dotted module name from __package__ so the namespace matches
         # what Blender actually uses: "LSPotato.nodes" in dev, but
         # "bl_ext.user_default.LSPotato.nodes" inside the extension sandbox.
@@ -129,7 +498,10 @@ class NodeLib:
             if module_name not in sys.modules:
                 sys.modules[module_name] = mod
                 inserted = True
-            spec.loader.exec_module(mod)
+            if code_cache is None:
+                spec.loader.exec_module(mod)
+            else:
+                exec(code_cache.get(str(py_file), digest), mod.__dict__)
         except Exception as e:
             logger.error(f"NodeLib: cannot load '{py_file.name}': {e}")
             return []
@@ -1,8 +1,8 @@
 import bpy  # type: ignore
-from bpy.app.handlers import persistent
 from ..utils.logger import get_logger
 from .node_impl import NodeLib
 from .node import get_node_class_by_idname
+from .manifest import CORE_LABEL_SUFFIX
 
 
 logger = get_logger("NodeInfo")
@@ -135,6 +135,8 @@ def _build_menu_classes(node_classes: list) -> list:
     # ── Pass 0: group nodes by their exact category path ─────────────────
     groups: dict[str, list] = defaultdict(list)
     for cls in node_classes:
+        if cls.bl_label.endswith(CORE_LABEL_SUFFIX):
+            continue    # hoist-split core: only used nested inside its parent
         cat  = _get_category(cls.bl_label)
         name = _display_name(cls.bl_label)
         groups[cat].append((cls.bl_idname, name))
@@ -249,55 +251,61 @@ def ng_unregister():
 
 
 # ---------------------------------------------------------------------------
-# Handler: restore NodeUndefined → shader node when loading a file
+# Load pass: restore NodeUndefined → shader node when loading a file
+#
+# Runs first in refresh.shader_reconcile_load_post, on the shared ShaderTreeIndex, so
+# restored nodes are reconciled by the passes after it.
 # ---------------------------------------------------------------------------
 
-@persistent
-def restore_undefined_nodes(dummy=None):
-    known = {cls.bl_idname for cls in NodeLib.get_node_classes()}
+def restore_undefined_nodes(index=None):
+    """
+    Replace every NodeUndefined whose original type is a compiled class.
+
+    *index* is the load-time ShaderTreeIndex; it is updated in place (restored
+    nodes move from ``undefined`` to ``by_idname``). Without one, a fresh index
+    is built.
+    """
+    known = NodeLib.get_idnames()
     if not known:
         return
-    for mat in bpy.data.materials:
-        if mat.use_nodes and mat.node_tree:
-            _restore_in_tree(mat.node_tree, known)
-    for ng in bpy.data.node_groups:
-        _restore_in_tree(ng, known)
-
-
-def _restore_in_tree(tree, known_idnames: set):
-    for node in list(tree.nodes):
-        if node.bl_idname != "NodeUndefined":
-            continue
-        original = getattr(node, "type", None)
-        if original not in known_idnames:
-            continue
-        try:
-            new = tree.nodes.new(original)
-            new.location = node.location
-            new.label    = node.label
-            for si, di in zip(node.inputs, new.inputs):
-                try:
-                    if not si.is_linked:
-                        di.default_value = si.default_value
-                except Exception:
-                    pass
-                if si.is_linked and si.links:
-                    tree.links.new(si.links[0].from_socket, di)
-            for so, do in zip(node.outputs, new.outputs):
-                for lnk in list(so.links):
-                    tree.links.new(do, lnk.to_socket)
-            saved = node.name
-            tree.nodes.remove(node)
-            new.name = saved
-        except Exception as e:
-            logger.error(f"restore_undefined_nodes: '{node.name}': {e}")
-
-
-def register_restore_handler():
-    if restore_undefined_nodes not in bpy.app.handlers.load_post:
-        bpy.app.handlers.load_post.append(restore_undefined_nodes)
+    if index is None:
+        from .tree_index import ShaderTreeIndex
+        index = ShaderTreeIndex.build()
+
+    remaining = []
+    for tree, node in index.undefined:
+        new = _restore_node(tree, node, known)
+        if new is None:
+            remaining.append((tree, node))
+        else:
+            index.add(tree, new)
+    index.undefined = remaining
 
 
-def unregister_restore_handler():
-    if restore_undefined_nodes in bpy.app.handlers.load_post:
-        bpy.app.handlers.load_post.remove(restore_undefined_nodes)
+def _restore_node(tree, node, known_idnames):
+    """Swap one NodeUndefined for its original type; return the new node or None."""
+    original = getattr(node, "type", None)
+    if original not in known_idnames:
+        return None
+    try:
+        new = tree.nodes.new(original)
+        new.location = node.location
+        new.label    = node.label
+        for si, di in zip(node.inputs, new.inputs):
+            try:
+                if not si.is_linked:
+                    di.default_value = si.default_value
+            except Exception:
+                pass
+            if si.is_linked and si.links:
+                tree.links.new(si.links[0].from_socket, di)
+        for so, do in zip(node.outputs, new.outputs):
+            for lnk in list(so.links):
+                tree.links.new(do, lnk.to_socket)
+        saved = node.name
+        tree.nodes.remove(node)
+        new.name = saved
+        return new
+    except Exception as e:
+        logger.error(f"restore_undefined_nodes: '{node.name}': {e}")
+        return None
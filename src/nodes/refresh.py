@@ -13,13 +13,24 @@ in-use node class's canonical tree, compares it against the saved one by hash,
 and on mismatch overwrites via user_remap so every instance and parent group
 is redirected to the refreshed version. Unchanged trees are left untouched.
 
+Before each save, identical per-instance forks of a tree are merged back
+onto one datablock (see "Fork dedup" below).
+
 Guards:
   * The load_post handler never raises (a handler must not).
   * Only node types actually present in the file are reconciled, so cost
     scales with the file, not with the whole shipped library.
+  * A file whose stamp (see "Reconcile stamp" below) still matches the
+    library and its node-group names skips every load pass, the index walk
+    included: the test reads no tree. Whether the trees still deserve the
+    stamp is checked when the file is saved.
 """
 
 from __future__ import annotations
+import functools
+import hashlib
+import json
+import os
 import re
 import types
 
@@ -27,8 +38,15 @@ import bpy  # type: ignore
 from bpy.app.handlers import persistent  # type: ignore
 
 from ..utils.logger import get_logger
-from .node import iter_registered_node_classes, get_node_class_by_idname
-from .geometry.hashing import hash_node_tree
+from .node import (
+    clear_instance_cache, get_node_class_by_idname, iter_registered_node_classes,
+    reset_packaged_images,
+)
+from .node_impl import NodeLib
+from .node_info import restore_undefined_nodes
+from .fork_dedup import plan_fork_merges
+from .tree_index import ShaderTreeIndex
+from .geometry.hashing import drop_from_memo, hash_node_tree
 
 logger = get_logger("ShaderReconcile")
 
@@ -42,23 +60,6 @@ def _base_name(name: str) -> str:
     return _DUP_SUFFIX_RE.sub("", name)
 
 
-def _iter_shader_trees() -> list:
-    """Snapshot of every shader tree a custom node could live in."""
-    trees: list = []
-    for mat in bpy.data.materials:
-        if mat.use_nodes and mat.node_tree:
-            trees.append(mat.node_tree)
-    for world in bpy.data.worlds:
-        if world.use_nodes and world.node_tree:
-            trees.append(world.node_tree)
-    for light in bpy.data.lights:
-        if light.use_nodes and light.node_tree:
-            trees.append(light.node_tree)
-    for ng in bpy.data.node_groups:
-        trees.append(ng)
-    return trees
-
-
 def _build_fresh(cls):
     """
     Build the class's canonical tree from scratch; return the new datablock.
@@ -83,10 +84,26 @@ def _build_fresh(cls):
     return proxy.node_tree
 
 
-def _reconcile_key(key: str, cls) -> None:
-    """Refresh the canonical datablock for one class if it is stale/absent."""
+def _reconcile_key(key: str, cls, memo: dict, index: ShaderTreeIndex) -> None:
+    """
+    Refresh the canonical datablock for one class if it is stale/absent.
+
+    *memo* is the pass's shared hash memo and *index* the load-time tree index;
+    both are kept in step with every datablock this removes or remaps.
+
+    When the node manifest carries the class's compile-time tree hash and the
+    saved tree matches it, nothing is built at all. Any other outcome (no
+    recorded hash, or a mismatch that may only be environmental) takes the
+    build-and-compare path, so the shipped hash can skip work but never
+    trigger an overwrite on its own.
+    """
     ng = bpy.data.node_groups
     canonical = ng.get(key)
+    if canonical is not None:
+        entry = NodeLib.get_index().get(cls.bl_idname)
+        if entry is not None and entry.tree_hash and \
+                hash_node_tree(canonical, memo) == entry.tree_hash:
+            return
     fresh = _build_fresh(cls)
     if fresh is None:
         return
@@ -95,49 +112,55 @@ def _reconcile_key(key: str, cls) -> None:
         if fresh.name != key:
             fresh.name = key
         return
-    if hash_node_tree(canonical) == hash_node_tree(fresh):
+    if hash_node_tree(canonical, memo) == hash_node_tree(fresh, memo):
         # Already current — discard the throwaway rebuild, touch nothing.
+        drop_from_memo(memo, fresh)
         ng.remove(fresh)
         return
     # Stale: redirect every user (instances + parent groups) to the rebuild,
-    # drop the old datablock, and reclaim the canonical name.
+    # drop the old datablock, and reclaim the canonical name. Every memoized
+    # parent of the old tree is now wrong.
+    memo.clear()
     canonical.user_remap(fresh)
+    index.discard_tree(canonical)
     ng.remove(canonical)
     fresh.name = key
     logger.info(f"reconcile: refreshed stale node tree '{key}'")
 
 
-def _reconcile_instances() -> None:
+def _reconcile_instances(memo: dict, index: ShaderTreeIndex) -> None:
     """
     Re-point any instance still bound to a stale or drifted tree.
 
     Covers what the datablock pass cannot: instances whose saved tree was named
     under an OLDER scheme (so user_remap of the canonical never reached them),
     and per-instance image copies ('<key>.001') that valuesUpdate forked from a
-    now-outdated base. An already up-to-date fork is left alone to avoid churn.
+    now-outdated base. An already up-to-date fork is left alone to avoid churn;
+    identical forks are folded together on save (dedup_instance_forks).
     """
     ng = bpy.data.node_groups
     ctx = bpy.context
-    for tree in _iter_shader_trees():
-        for node in list(tree.nodes):
-            cls = get_node_class_by_idname(node.bl_idname)
-            if cls is None:
-                continue
-            key = cls._PREFIX + cls.bl_label
-            target = ng.get(key)
-            if target is None:
-                continue
+    for idname, entries in index.by_idname.items():
+        cls = get_node_class_by_idname(idname)
+        if cls is None:
+            continue
+        key = cls._PREFIX + cls.bl_label
+        target = ng.get(key)
+        if target is None:
+            continue
+        for _tree, node in entries:
             cur = getattr(node, "node_tree", None)
             if cur is target:
                 continue
             # Leave an up-to-date per-instance fork ('<key>.001') in place.
             if cur is not None and _base_name(cur.name) == key:
                 try:
-                    if hash_node_tree(cur) == hash_node_tree(target):
+                    if hash_node_tree(cur, memo) == hash_node_tree(target, memo):
                         continue
                 except Exception:
                     pass
             try:
+                memo.clear()
                 node.node_tree = target
                 if hasattr(node, "valuesUpdate"):
                     node.valuesUpdate(ctx)
@@ -158,37 +181,315 @@ def _purge_orphans(keys: set) -> None:
                 pass
 
 
-def reconcile_shader_nodes() -> None:
-    """Refresh every in-file shader node tree to the current definition."""
+# ---------------------------------------------------------------------------
+# Reconcile stamp
+#
+# A reconciled file is stamped with what it was reconciled against:
+#
+#   version  add-on version (blender_manifest.toml)
+#   library  NodeLib.get_library_fingerprint() — content of the compiled library
+#   idnames  digest of the registered bl_idnames (starter-pack selection)
+#   groups   digest of the file's node-group names, with the datablocks of one
+#            registered key (canonical tree and per-instance forks) counted
+#            once under the key, so forks coming and going do not move it
+#   keys     stable key → class fingerprint (tree hash, else module sha1)
+#
+# All of it is cheap to recompute: none of it reads a tree. A re-open with an
+# identical stamp skips every load pass outright. When only the library moved
+# (same groups, same idnames) just the keys whose class fingerprint changed
+# are reconciled. Anything else — appended, renamed or removed groups, a
+# different starter selection — runs the full pass, which stamps the file
+# again. Without a manifest there is no library fingerprint, so nothing is
+# stamped, and a file that uses nothing from the library is never stamped.
+#
+# Edits inside the trees are caught on save instead (stamp_on_save, from the
+# save_pre handler), so the stamp always describes what was written: a
+# canonical tree that no longer matches its compile-time tree hash, or a
+# managed datablock that appeared this session and differs from its canonical
+# tree, drops the stamp and the next open runs the full pass. Disabling the
+# add-on drops the open file's stamp too, so a file saved without it gets its
+# NodeUndefined nodes restored on the next open.
+#
+# The stamp is a JSON string ID property on the file's first scene: every file
+# has one, ID properties are saved with the .blend, and unlike a Text datablock
+# it does not show up in the user's editors. Writing it marks the file as
+# modified, so it is only written when its value changes.
+# ---------------------------------------------------------------------------
+
+_STAMP_PROP = "lspotato_reconcile"
+
+_BLENDER_MANIFEST = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "blender_manifest.toml"
+)
+
+# Names of the managed datablocks once the open file was reconciled (or its
+# stamp matched); None until then. stamp_on_save() checks anything newer.
+_RECONCILED_BLOCKS: set | None = None
+
+
+@functools.lru_cache(maxsize=1)
+def _addon_version() -> str:
+    try:
+        import tomllib
+        with open(_BLENDER_MANIFEST, "rb") as fh:
+            return str(tomllib.load(fh).get("version", ""))
+    except Exception:
+        return ""
+
+
+def _digest(items) -> str:
+    h = hashlib.sha1()
+    for item in sorted(items):
+        h.update(item.encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def _groups_digest(keys) -> str:
+    """Every node-group name, with the datablocks of each of *keys* counted once."""
+    items = set()
+    for block in bpy.data.node_groups:
+        base = _base_name(block.name)
+        items.add(f"key:{base}" if base in keys else block.name)
+    return _digest(items)
+
+
+def _managed_blocks(keys) -> set:
+    return {block.name for block in bpy.data.node_groups if _base_name(block.name) in keys}
+
+
+def _make_stamp(classes_by_key: dict) -> dict | None:
+    """The stamp describing the current library and file, or None if unstampable."""
+    library = NodeLib.get_library_fingerprint()
+    if not library:
+        return None
+    index = NodeLib.get_index()
+    keys = {}
+    for key, cls in classes_by_key.items():
+        entry = index.get(cls.bl_idname)
+        keys[key] = (entry.tree_hash or entry.sha1) if entry is not None else ""
+    return {
+        "version": _addon_version(),
+        "library": library,
+        "idnames": _digest(cls.bl_idname for cls in classes_by_key.values()),
+        "groups":  _groups_digest(classes_by_key),
+        "keys":    keys,
+    }
+
+
+def _stamp_scene():
+    scenes = bpy.data.scenes
+    return scenes[0] if len(scenes) else None
+
+
+def _read_stamp() -> dict | None:
+    scene = _stamp_scene()
+    raw = scene.get(_STAMP_PROP) if scene is not None else None
+    if not isinstance(raw, str):
+        return None
+    try:
+        stamp = json.loads(raw)
+    except ValueError:
+        return None
+    return stamp if isinstance(stamp, dict) else None
+
+
+def _write_stamp(stamp: dict) -> None:
+    scene = _stamp_scene()
+    if scene is None:
+        return
+    raw = json.dumps(stamp, sort_keys=True)
+    if scene.get(_STAMP_PROP) != raw:
+        scene[_STAMP_PROP] = raw
+
+
+def _drop_stamp() -> None:
+    scene = _stamp_scene()
+    if scene is not None and _STAMP_PROP in scene:
+        del scene[_STAMP_PROP]
+
+
+def _trees_unchanged(classes_by_key: dict, memo: dict) -> bool:
+    """
+    True if the managed trees still look as reconciled: every canonical tree
+    matches its compile-time tree hash, and every managed datablock that
+    appeared since the load matches its canonical tree.
+    """
+    index = NodeLib.get_index()
+    ng = bpy.data.node_groups
+    known = _RECONCILED_BLOCKS or set()
+    for block in ng:
+        if block.library is not None:
+            continue
+        base = _base_name(block.name)
+        cls = classes_by_key.get(base)
+        if cls is None:
+            continue
+        if block.name == base:
+            entry = index.get(cls.bl_idname)
+            if entry is None or not entry.tree_hash \
+                    or hash_node_tree(block, memo) != entry.tree_hash:
+                return False
+        elif block.name not in known:
+            canonical = ng.get(base)
+            if canonical is None or hash_node_tree(block, memo) != hash_node_tree(canonical, memo):
+                return False
+    return True
+
+
+def stamp_on_save(memo: dict | None = None) -> None:
+    """
+    Re-stamp the file about to be saved if its trees still deserve it, else
+    drop the stamp. *memo* is the save pass's hash memo, if it has one.
+    """
+    registry = iter_registered_node_classes()
+    if not registry or _RECONCILED_BLOCKS is None:
+        return
+    classes_by_key = dict(registry)
+    stamp = _make_stamp(classes_by_key)
+    if stamp is None:
+        return
+    if not _trees_unchanged(classes_by_key, {} if memo is None else memo):
+        _drop_stamp()
+        return
+    if _read_stamp() is not None or _managed_blocks(classes_by_key):
+        _write_stamp(stamp)
+
+
+def reconcile_shader_nodes(index: ShaderTreeIndex | None = None) -> None:
+    """
+    Run every load-time shader pass, in order, over one shared tree index:
+
+      1. restore NodeUndefined nodes of compiled types (node_info),
+      2. refresh stale canonical trees (_reconcile_key),
+      3. re-point drifted instances (_reconcile_instances),
+
+    then purge orphans and stamp the file. A file whose stamp matches skips
+    all of it before any tree is read. *index* is built here unless one is
+    passed in.
+    """
+    global _RECONCILED_BLOCKS
+    _RECONCILED_BLOCKS = None
     registry = iter_registered_node_classes()
     if not registry:
         return
     classes_by_key = dict(registry)
 
+    stamp = _make_stamp(classes_by_key)
+    saved = _read_stamp()
+    if stamp is not None and saved == stamp:
+        _RECONCILED_BLOCKS = _managed_blocks(classes_by_key)
+        logger.debug("reconcile: file already reconciled against this library — skipped")
+        return
+
+    if index is None:
+        index = ShaderTreeIndex.build()
+    restore_undefined_nodes(index)
+
     # Which canonical keys does this file actually use? Collect from live
     # instances (resolved by class) and from any datablock whose base name
     # matches a registered key — both bound the work to what is in the file.
     needed: set = set()
-    for tree in _iter_shader_trees():
-        for node in tree.nodes:
-            cls = get_node_class_by_idname(node.bl_idname)
-            if cls is not None:
-                needed.add(cls._PREFIX + cls.bl_label)
+    for idname in index.by_idname:
+        cls = get_node_class_by_idname(idname)
+        if cls is not None:
+            needed.add(cls._PREFIX + cls.bl_label)
     for block in bpy.data.node_groups:
         base = _base_name(block.name)
         if base in classes_by_key:
             needed.add(base)
-
-    # Order is irrelevant: user_remap on each datablock redirects every parent
-    # that embeds it, so a refreshed child reaches even unchanged parents.
+    uses_library = bool(needed)
+
+    if (stamp is not None and saved is not None
+            and saved.get("groups") == stamp["groups"]
+            and saved.get("idnames") == stamp["idnames"]):
+        # Nothing in the file moved since the last pass — only classes whose
+        # definition changed can be stale.
+        old_keys = saved.get("keys") or {}
+        needed = {k for k in needed if old_keys.get(k) != stamp["keys"].get(k)}
+
+    # One hash memo spans the pass so a child shared by many parents is
+    # serialised once. Order is irrelevant: user_remap on each datablock
+    # redirects every parent that embeds it, so a refreshed child reaches
+    # even unchanged parents.
+    memo: dict = {}
     for key in needed:
         cls = classes_by_key.get(key)
         if cls is not None:
-            _reconcile_key(key, cls)
+            _reconcile_key(key, cls, memo, index)
 
-    _reconcile_instances()
+    _reconcile_instances(memo, index)
     _purge_orphans(set(classes_by_key.keys()))
 
+    _RECONCILED_BLOCKS = _managed_blocks(classes_by_key)
+    if stamp is not None and (uses_library or saved is not None):
+        # Re-digest the groups: the pass itself renames, rebuilds and removes
+        # datablocks.
+        stamp["groups"] = _groups_digest(classes_by_key)
+        _write_stamp(stamp)
+
+
+# ---------------------------------------------------------------------------
+# Fork dedup
+#
+# valuesUpdate forks a shared tree to '<key>.001', '.002', ... the first time
+# an instance sets its own image or UV map, and nothing ever joins the forks
+# again: two materials that end up with the same textures keep two copies.
+# Before each save, forks of one key are grouped by the images and UV maps
+# their nodes hold and, only where that collides, by tree hash (see
+# fork_dedup.py); every group is merged onto one survivor with user_remap. The
+# canonical datablock survives when it is in the group, so a fork whose images
+# were cleared again rejoins the shared tree.
+# ---------------------------------------------------------------------------
+
+
+def dedup_instance_forks(memo: dict | None = None) -> tuple[int, int]:
+    """
+    Merge identical per-instance forks of every registered key.
+
+    Returns ``(datablocks removed, nodes freed)``. Linked and fake-user
+    datablocks are never merged away. *memo* is a hash memo to share with
+    the rest of the save pass.
+    """
+    registry = iter_registered_node_classes()
+    if not registry:
+        return 0, 0
+    keys = set(dict(registry))
+    ng = bpy.data.node_groups
+
+    by_key: dict[str, list] = {}
+    for block in ng:
+        base = _base_name(block.name)
+        if base in keys and block.library is None:
+            by_key.setdefault(base, []).append(block)
+
+    if memo is None:
+        memo = {}
+    hash_tree = functools.partial(hash_node_tree, memo=memo)
+    removed = freed = 0
+    for key, blocks in by_key.items():
+        if len(blocks) < 2:
+            continue
+        merges, failed = plan_fork_merges(key, blocks, hash_tree)
+        for block in failed:
+            logger.error(f"dedup: could not read '{block.name}'")
+        for block, keep in merges:
+            n_nodes = len(block.nodes)
+            try:
+                block.user_remap(keep)
+                drop_from_memo(memo, block)
+                ng.remove(block)
+            except Exception as e:
+                logger.error(f"dedup: could not merge '{block.name}': {e}")
+                continue
+            removed += 1
+            freed += n_nodes
+
+    if removed:
+        logger.info(f"dedup: merged {removed} identical per-instance fork(s), "
+                    f"freeing {freed} node(s)")
+    return removed, freed
+
 
 # ---------------------------------------------------------------------------
 # Automatic trigger — mirrors geometry/loader.py: run on every file open, plus
@@ -198,13 +499,29 @@ def reconcile_shader_nodes() -> None:
 
 @persistent
 def shader_reconcile_load_post(dummy=None):
-    """load_post handler — refresh stale shader node trees on file open."""
+    """load_post handler — the single entry point for every shader load pass."""
+    clear_instance_cache()
+    reset_packaged_images()
     try:
         reconcile_shader_nodes()
     except Exception as exc:  # noqa: BLE001 — a handler must never raise
         logger.error(f"shader_reconcile_load_post failed: {exc}")
 
 
+@persistent
+def shader_dedup_save_pre(dummy=None):
+    """save_pre handler — fold identical per-instance forks, then re-stamp."""
+    memo: dict = {}
+    try:
+        dedup_instance_forks(memo)
+    except Exception as exc:  # noqa: BLE001 — a handler must never raise
+        logger.error(f"shader_dedup_save_pre failed: {exc}")
+    try:
+        stamp_on_save(memo)
+    except Exception as exc:  # noqa: BLE001
+        logger.error(f"shader_dedup_save_pre: stamp failed: {exc}")
+
+
 def _deferred_init():
     """One-shot timer: cover the file already open at addon register."""
     try:
@@ -215,9 +532,17 @@ def _deferred_init():
 
 
 def register_reconcile_handler():
-    """Install the load_post handler and a one-shot init for the open file."""
+    """
+    Install the load_post handler, the fork-dedup save_pre handler and a
+    one-shot init for the open file.
+
+    This one handler also performs the NodeUndefined restore (step 1 of
+    reconcile_shader_nodes), so restore always runs before reconcile.
+    """
     if shader_reconcile_load_post not in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.append(shader_reconcile_load_post)
+    if shader_dedup_save_pre not in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.append(shader_dedup_save_pre)
     try:
         if not bpy.app.timers.is_registered(_deferred_init):
             bpy.app.timers.register(_deferred_init, first_interval=0.6)
@@ -226,9 +551,20 @@ def register_reconcile_handler():
 
 
 def unregister_reconcile_handler():
-    """Remove the load_post handler (and the deferred timer if pending)."""
+    """
+    Remove both handlers (and the deferred timer if pending), and drop the
+    open file's stamp: saved from here on, it would not be reconciled.
+    """
+    global _RECONCILED_BLOCKS
+    _RECONCILED_BLOCKS = None
+    try:
+        _drop_stamp()
+    except Exception:
+        pass
     if shader_reconcile_load_post in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.remove(shader_reconcile_load_post)
+    if shader_dedup_save_pre in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.remove(shader_dedup_save_pre)
     try:
         if bpy.app.timers.is_registered(_deferred_init):
             bpy.app.timers.unregister(_deferred_init)
@@ -0,0 +1,74 @@
+"""
+Load-time shader tree index.
+
+The file-open passes (NodeUndefined restore in node_info.py, the canonical
+reconcile and the instance rebind in refresh.py) all need "every node in every
+shader tree". Walking materials / worlds / lights / node groups once per pass
+multiplies the cost on large scenes, so the load_post handler builds ONE index
+and hands it to each pass in turn.
+
+The index holds live bpy references. Passes that replace nodes or remove trees
+must keep it in step (add() for new nodes, discard_tree() BEFORE removing a
+tree) so later passes never touch a freed datablock.
+"""
+
+from __future__ import annotations
+
+import bpy  # type: ignore
+
+UNDEFINED_IDNAME = "NodeUndefined"
+
+
+def iter_shader_trees() -> list:
+    """Snapshot of every shader tree a custom node could live in."""
+    trees: list = []
+    for mat in bpy.data.materials:
+        if mat.use_nodes and mat.node_tree:
+            trees.append(mat.node_tree)
+    for world in bpy.data.worlds:
+        if world.use_nodes and world.node_tree:
+            trees.append(world.node_tree)
+    for light in bpy.data.lights:
+        if light.use_nodes and light.node_tree:
+            trees.append(light.node_tree)
+    for ng in bpy.data.node_groups:
+        trees.append(ng)
+    return trees
+
+
+class ShaderTreeIndex:
+    """Every shader node in the file, grouped by bl_idname, from a single walk."""
+
+    def __init__(self):
+        self.trees: list = []
+        # bl_idname → [(tree, node), ...]; NodeUndefined entries live apart.
+        self.by_idname: dict[str, list] = {}
+        self.undefined: list = []
+
+    @classmethod
+    def build(cls) -> "ShaderTreeIndex":
+        index = cls()
+        for tree in iter_shader_trees():
+            index.trees.append(tree)
+            for node in tree.nodes:
+                index.add(tree, node)
+        return index
+
+    def add(self, tree, node) -> None:
+        """Record *node* (of *tree*) — also used for nodes a pass creates."""
+        if node.bl_idname == UNDEFINED_IDNAME:
+            self.undefined.append((tree, node))
+        else:
+            self.by_idname.setdefault(node.bl_idname, []).append((tree, node))
+
+    def discard_tree(self, tree) -> None:
+        """Forget *tree* and its nodes; call before the datablock is removed."""
+        ptr = tree.as_pointer()
+        self.trees = [t for t in self.trees if t.as_pointer() != ptr]
+        self.undefined = [(t, n) for t, n in self.undefined if t.as_pointer() != ptr]
+        for idname, entries in list(self.by_idname.items()):
+            kept = [(t, n) for t, n in entries if t.as_pointer() != ptr]
+            if kept:
+                self.by_idname[idname] = kept
+            else:
+                del self.by_idname[idname]
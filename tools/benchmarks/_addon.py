@@ -0,0 +1,41 @@
+"""Shared helper for the benchmark scripts: import src/ as the add-on package.
+
+The scripts run inside `blender --background`, where bpy exists but the add-on
+may not be installed. Loading src/__init__.py under the package name "LSPotato"
+gives the generated modules' relative imports (`from .....node import ...`) the
+same parent package they have in a real install. register() is NOT called —
+the scripts only need NodeLib and the node registry.
+"""
+import importlib.util
+import os
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+PACKAGE = "LSPotato"
+
+
+def import_addon():
+    if PACKAGE in sys.modules:
+        return sys.modules[PACKAGE]
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE, os.path.join(SRC_DIR, "__init__.py"),
+        submodule_search_locations=[SRC_DIR],
+    )
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def script_args() -> list[str]:
+    """Arguments after Blender's `--` separator."""
+    argv = sys.argv
+    return argv[argv.index("--") + 1:] if "--" in argv else []
+
+
+def pack_of(entry) -> str:
+    """Group a manifest entry by starter pack, else by its shader/ folder."""
+    low = entry.bl_label.lower()
+    if low.startswith("lscherry.starters."):
+        return "starters/" + low[len("lscherry.starters."):].split(".", 1)[0]
+    return entry.module.rsplit("/", 1)[0]
@@ -0,0 +1,149 @@
+"""Dev tool: check the NodeCompiler's constant folder against Blender's own math.
+
+Run headless from the repo root:
+
+    blender --background --factory-startup --python tools/benchmarks/constant_fold_check.py -- fold_check.json
+
+Math, Vector Math and Mix are shared with Geometry Nodes, where they run on the
+CPU and can be read back. For every operation the folder supports, a few input
+cases (including the "safe" edge cases: division by zero, negative roots and
+logs, clamping) are built as one node each in a geometry node group. Each
+result is stored as a point attribute on a one-vertex mesh. The group is then
+analyzed with the compiler's analyzer and the same nodes evaluated with
+const_fold.evaluate_constants(); every case whose values differ beyond float32
+noise is listed.
+"""
+import importlib
+import json
+import math
+import os
+import sys
+
+import bpy  # type: ignore
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _addon import import_addon, script_args  # noqa: E402
+
+_FLOATS = [(2.0, 3.0, 0.5), (-2.5, 0.5, 0.25), (0.0, 0.0, 0.0), (7.3, -2.0, 1.5), (0.3, 0.3, 1e-9)]
+_VECTORS = [
+    ((1.0, -2.0, 3.5), (0.5, 0.0, -4.0), (2.0, 2.0, 2.0), 1.5),
+    ((0.0, 0.0, 0.0), (-1.25, 3.0, 0.1), (0.0, 1.0, 0.0), -2.0),
+]
+_COLORS = [((0.2, 0.5, 0.9, 0.75), (0.8, 0.1, 0.4, 1.0))]
+_ATTR_TYPES = {0: "FLOAT", 1: "FLOAT_VECTOR", 2: "FLOAT_COLOR"}
+
+
+def _cases(const_fold):
+    """(label, bl_idname, attributes, {input index: value}, output index)"""
+    for op in const_fold._MATH_OPS:
+        for a, b, c in _FLOATS:
+            yield f"math {op} {a},{b},{c}", "ShaderNodeMath", {"operation": op}, {0: a, 1: b, 2: c}, 0
+        yield f"math {op} clamp", "ShaderNodeMath", {"operation": op, "use_clamp": True}, \
+            {0: 1.7, 1: -0.4, 2: 0.5}, 0
+    for op, (_n, _s, out, _f) in const_fold._VECTOR_OPS.items():
+        for a, b, c, s in _VECTORS:
+            yield f"vector {op} {a}", "ShaderNodeVectorMath", {"operation": op}, \
+                {0: a, 1: b, 2: c, 3: s}, out
+    for fac in (0.3, 1.4, -0.2):
+        yield f"mix float {fac}", "ShaderNodeMix", {"data_type": "FLOAT"}, {0: fac, 2: 2.0, 3: -1.0}, 0
+        yield f"mix vector {fac}", "ShaderNodeMix", {"data_type": "VECTOR"}, \
+            {0: fac, 4: _VECTORS[0][0], 5: _VECTORS[0][1]}, 1
+        for blend in const_fold._BLEND_OPS:
+            for clamp_result in (False, True):
+                a, b = _COLORS[0]
+                yield f"mix {blend} {fac} clamp={clamp_result}", "ShaderNodeMix", \
+                    {"data_type": "RGBA", "blend_type": blend, "clamp_result": clamp_result}, \
+                    {0: fac, 6: a, 7: b}, 2
+    yield "mix vector non-uniform", "ShaderNodeMix", \
+        {"data_type": "VECTOR", "factor_mode": "NON_UNIFORM"}, \
+        {1: (0.2, 1.5, -0.5), 4: _VECTORS[0][0], 5: _VECTORS[0][1]}, 1
+
+
+def _build(cases):
+    """One geometry node group storing every case as attribute f<i> on one vertex."""
+    ng = bpy.data.node_groups.new("ConstFoldCheck", "GeometryNodeTree")
+    ng.interface.new_socket(name="Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry")
+    line = ng.nodes.new("GeometryNodeMeshLine")
+    line.inputs["Count"].default_value = 1
+    geometry = line.outputs["Mesh"]
+    for i, (_label, idname, attrs, inputs, out) in enumerate(cases):
+        node = ng.nodes.new(idname)
+        node.name = f"Case {i}"
+        for attr, val in attrs.items():
+            setattr(node, attr, val)
+        for idx, val in inputs.items():
+            node.inputs[idx].default_value = val
+        store = ng.nodes.new("GeometryNodeStoreNamedAttribute")
+        store.data_type = _ATTR_TYPES[out]
+        store.inputs["Name"].default_value = f"f{i}"
+        ng.links.new(geometry, store.inputs["Geometry"])
+        ng.links.new(node.outputs[out], store.inputs["Value"])
+        geometry = store.outputs["Geometry"]
+    group_out = ng.nodes.new("NodeGroupOutput")
+    ng.links.new(geometry, group_out.inputs[0])
+    return ng
+
+
+def _blender_values(ng, count):
+    mesh = bpy.data.meshes.new("ConstFoldCheck")
+    obj = bpy.data.objects.new("ConstFoldCheck", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    obj.modifiers.new("Check", "NODES").node_group = ng
+    evaluated = obj.evaluated_get(bpy.context.evaluated_depsgraph_get()).data
+    values = []
+    for i in range(count):
+        item = evaluated.attributes[f"f{i}"].data[0]
+        for field in ("value", "vector", "color"):
+            if hasattr(item, field):
+                v = getattr(item, field)
+                values.append(float(v) if field == "value" else tuple(v))
+                break
+    return values
+
+
+def _close(a, b):
+    if isinstance(a, tuple):
+        return len(a) == len(b) and all(_close(x, y) for x, y in zip(a, b))
+    return math.isclose(a, b, rel_tol=1e-5, abs_tol=1e-5)
+
+
+def main():
+    addon = import_addon()
+    compiler = addon.__name__ + ".features.node_compiler.compiler"
+    analyzer = importlib.import_module(compiler + ".analyzer")
+    const_fold = importlib.import_module(compiler + ".const_fold")
+
+    args = script_args()
+    out_path = args[0] if args else None
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    cases = list(_cases(const_fold))
+    ng = _build(cases)
+    blender = _blender_values(ng, len(cases))
+    info = analyzer.analyze_node_group(ng)
+    folded, _order = const_fold.evaluate_constants(info)
+    var_of = {n["name"]: n["var_name"] for n in info["nodes"]}
+
+    report = []
+    for i, (label, _idname, _attrs, _inputs, out) in enumerate(cases):
+        ours = folded.get(var_of[f"Case {i}"], {}).get(out)
+        theirs = blender[i]
+        if ours is not None and isinstance(theirs, tuple) and len(theirs) > len(ours):
+            theirs = theirs[:len(ours)]
+        ok = ours is not None and _close(ours, theirs)
+        report.append({"case": label, "blender": theirs, "folded": ours, "ok": ok})
+
+    bad = [r for r in report if not r["ok"]]
+    for r in bad:
+        print(f"MISMATCH {r['case']}: blender={r['blender']} folded={r['folded']}")
+    print(f"{len(report)} cases, {len(report) - len(bad)} match, {len(bad)} mismatch(es)")
+
+    if out_path:
+        payload = {"blender": bpy.app.version_string, "cases": report}
+        with open(out_path, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=2, sort_keys=True)
+        print(f"Wrote {out_path}")
+
+
+if __name__ == "__main__":
+    main()
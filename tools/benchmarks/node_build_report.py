@@ -0,0 +1,111 @@
+"""Dev tool: time the detached tree build of every compiled shader node.
+
+Run headless from the repo root:
+
+    blender --background --factory-startup --python tools/benchmarks/node_build_report.py -- build.json [filter]
+
+Every class is built from a clean, empty file through cls.create_node_group()
+— the SimpleNamespace proxy path Node.getNodetree() takes on first add — so the
+time includes every nested child the tree pulls in through ensure_node_group.
+Classes are recorded in the node registry only (register_node_class); nothing
+is registered with Blender, which the proxy path does not need.
+
+Per stable key the JSON records:
+
+    ms           wall time of create_node_group()
+    nodes/links  in the class's own tree
+    nodes_total / links_total   summed over every tree the build created
+    groups_built node-group datablocks created (the tree itself + nested children)
+    group_refs   GROUP nodes across those trees (one ensure_node_group call each)
+    depth        deepest nesting of GROUP nodes below the class's tree
+
+An optional second argument keeps only keys containing that substring. Diff
+two runs (e.g. before / after a recompile) to catch build regressions.
+"""
+import json
+import os
+import sys
+import time
+
+import bpy  # type: ignore
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _addon import import_addon, script_args  # noqa: E402
+
+
+def _depth(tree, seen=()):
+    """Deepest chain of GROUP nodes below *tree* (0 for a flat tree)."""
+    best = 0
+    for node in tree.nodes:
+        child = getattr(node, "node_tree", None) if node.type == "GROUP" else None
+        if child is not None and child.as_pointer() not in seen:
+            best = max(best, 1 + _depth(child, seen + (tree.as_pointer(),)))
+    return best
+
+
+def _measure(cls):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    before = {ng.as_pointer() for ng in bpy.data.node_groups}
+
+    start = time.perf_counter()
+    tree = cls.create_node_group()
+    elapsed = time.perf_counter() - start
+
+    built = [ng for ng in bpy.data.node_groups if ng.as_pointer() not in before]
+    if tree is None:
+        return {"ms": round(elapsed * 1000, 3), "error": "create_node_group returned None"}
+    return {
+        "ms":           round(elapsed * 1000, 3),
+        "nodes":        len(tree.nodes),
+        "links":        len(tree.links),
+        "nodes_total":  sum(len(ng.nodes) for ng in built),
+        "links_total":  sum(len(ng.links) for ng in built),
+        "groups_built": len(built),
+        "group_refs":   sum(1 for ng in built for n in ng.nodes if n.type == "GROUP"),
+        "depth":        _depth(tree),
+    }
+
+
+def main():
+    addon = import_addon()
+    NodeLib = sys.modules[addon.__name__ + ".nodes.node_impl"].NodeLib
+    node = sys.modules[addon.__name__ + ".nodes.node"]
+
+    args = script_args()
+    out_path = args[0] if args else None
+    needle = args[1] if len(args) > 1 else ""
+
+    classes = NodeLib.get_node_classes()
+    for cls in classes:
+        node.register_node_class(cls)
+
+    report = {}
+    for key, cls in sorted(node.iter_registered_node_classes()):
+        if needle and needle not in key:
+            continue
+        try:
+            report[key] = _measure(cls)
+        except Exception as e:
+            report[key] = {"error": f"{type(e).__name__}: {e}"}
+
+    timed = [(k, r) for k, r in report.items() if "nodes" in r]
+    print(f"{'key':60} {'ms':>9} {'nodes':>6} {'total':>6} {'groups':>6} {'depth':>5}")
+    for key, r in sorted(timed, key=lambda kr: -kr[1]["ms"])[:25]:
+        print(f"{key[:60]:60} {r['ms']:>9} {r['nodes']:>6} {r['nodes_total']:>6} "
+              f"{r['groups_built']:>6} {r['depth']:>5}")
+    failed = [k for k, r in report.items() if "error" in r]
+    print(f"{len(timed)} built, {len(failed)} failed, "
+          f"{sum(r['ms'] for _, r in timed):.0f} ms total")
+
+    if out_path:
+        payload = {
+            "blender": bpy.app.version_string,
+            "classes": report,
+        }
+        with open(out_path, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=2, sort_keys=True)
+        print(f"Wrote {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Dev tool: per-pack import time and memory of the compiled node library,
+eager (execute every module) versus lazy (register stubs only).
+
+Run headless from the repo root:
+
+    blender --background --factory-startup --python tools/benchmarks/node_import_report.py -- [out.json]
+
+Prints one row per pack and, when a path is given, writes the same numbers as
+JSON. Lazy numbers only mean something with a current shader/node_manifest.json
+(without it NodeLib has no entries to stub from and the script says so).
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _addon import import_addon, pack_of, script_args  # noqa: E402
+
+
+def _measure(fn, items):
+    """Run fn over items; return (seconds, bytes still allocated, results)."""
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    kept = [fn(it) for it in items]   # keep results alive while measuring
+    elapsed = time.perf_counter() - start
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, current - base, kept
+
+
+def main():
+    addon = import_addon()
+    NodeLib = sys.modules[addon.__name__ + ".nodes.node_impl"].NodeLib
+
+    if NodeLib._manifest_entries() is None:
+        print("No current node manifest — recompile first; lazy mode would fall back to eager.")
+        return
+    entries = NodeLib.get_node_entries()
+
+    packs: dict[str, list] = {}
+    for e in entries:
+        packs.setdefault(pack_of(e), []).append(e)
+
+    rows = []
+    for pack, items in sorted(packs.items()):
+        eager_s, eager_b, _ = _measure(NodeLib.load_class, items)
+        lazy_s, lazy_b, _ = _measure(NodeLib.make_lazy_class, items)
+        rows.append({
+            "pack": pack,
+            "classes": len(items),
+            "source_bytes": sum(e.size for e in items),
+            "eager_ms": round(eager_s * 1000, 2),
+            "eager_kb": round(eager_b / 1024, 1),
+            "lazy_ms": round(lazy_s * 1000, 2),
+            "lazy_kb": round(lazy_b / 1024, 1),
+            "saved_ms": round((eager_s - lazy_s) * 1000, 2),
+            "saved_kb": round((eager_b - lazy_b) / 1024, 1),
+        })
+
+    print(f"{'pack':45} {'n':>4} {'eager ms':>9} {'eager KB':>9} {'lazy ms':>8} {'lazy KB':>8} {'saved KB':>9}")
+    for r in rows:
+        print(f"{r['pack']:45} {r['classes']:>4} {r['eager_ms']:>9} {r['eager_kb']:>9} "
+              f"{r['lazy_ms']:>8} {r['lazy_kb']:>8} {r['saved_kb']:>9}")
+
+    args = script_args()
+    if args:
+        with open(args[0], "w", encoding="utf-8") as fh:
+            json.dump(rows, fh, indent=2)
+        print(f"Wrote {args[0]}")
+
+
+if __name__ == "__main__":
+    main()
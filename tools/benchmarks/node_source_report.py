@@ -0,0 +1,82 @@
+"""Dev tool: per-pack compile time and code-object memory of the compiled node
+library — the part of the eager import cost that needs no Blender.
+
+Run with system Python from the repo root:
+
+    python tools/benchmarks/node_source_report.py [out.json]
+
+Lazy Node Loading defers, per class, compiling the module source to a code
+object (skipped on a warm code cache) and executing it. Executing needs bpy
+and is measured in Blender by node_import_report.py; this script measures the
+first half for every pack: compile time and the memory the code objects keep
+alive (tracemalloc), next to the source and marshalled sizes.
+"""
+import importlib.util
+import json
+import marshal
+import os
+import sys
+import time
+import tracemalloc
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+SHADER_DIR = os.path.join(SRC_DIR, "nodes", "shader")
+
+
+def _load_manifest_module():
+    spec = importlib.util.spec_from_file_location(
+        "manifest", os.path.join(SRC_DIR, "nodes", "manifest.py"))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def main():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from _addon import pack_of  # noqa: E402 — bpy-free helper
+
+    manifest = _load_manifest_module()
+    packs: dict[str, dict] = {}
+    for entry in manifest.scan_sources(SHADER_DIR):
+        packs.setdefault(pack_of(entry), {})[entry.module] = entry
+
+    rows = []
+    for pack, modules in sorted(packs.items()):
+        sources = []
+        for module in modules:
+            path = os.path.join(SHADER_DIR, *module.split("/"))
+            with open(path, "rb") as fh:
+                sources.append((path, fh.read()))
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        codes = [compile(src, path, "exec", dont_inherit=True) for path, src in sources]
+        elapsed = time.perf_counter() - start
+        retained = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+        rows.append({
+            "pack": pack,
+            "modules": len(modules),
+            "source_kb": round(sum(len(src) for _p, src in sources) / 1024, 1),
+            "marshal_kb": round(sum(len(marshal.dumps(c)) for c in codes) / 1024, 1),
+            "compile_ms": round(elapsed * 1000, 2),
+            "code_kb": round(retained / 1024, 1),
+        })
+
+    print(f"{'pack':45} {'n':>4} {'source KB':>10} {'marshal KB':>11} {'compile ms':>11} {'code KB':>8}")
+    for r in rows:
+        print(f"{r['pack']:45} {r['modules']:>4} {r['source_kb']:>10} {r['marshal_kb']:>11} "
+              f"{r['compile_ms']:>11} {r['code_kb']:>8}")
+    total = {k: round(sum(r[k] for r in rows), 1)
+             for k in ("modules", "source_kb", "marshal_kb", "compile_ms", "code_kb")}
+    print(f"{'total':45} {total['modules']:>4} {total['source_kb']:>10} {total['marshal_kb']:>11} "
+          f"{total['compile_ms']:>11} {total['code_kb']:>8}")
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "w", encoding="utf-8") as fh:
+            json.dump(rows, fh, indent=2)
+        print(f"Wrote {sys.argv[1]}")
+
+
+if __name__ == "__main__":
+    main()
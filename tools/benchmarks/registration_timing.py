@@ -0,0 +1,66 @@
+"""Dev tool: cold vs. warm compiled-node registration with the code cache.
+
+Run headless from the repo root:
+
+    blender --background --factory-startup --python tools/benchmarks/registration_timing.py -- [out.json]
+
+"cold" empties the code cache first, so every generated module is compiled from
+source; "warm" runs again from the cache it just filled. Both start from an
+empty NodeLib session, so the modules really execute each time. Classes are
+only loaded — nothing is registered with Blender.
+
+When src/ is not installed as an extension (the usual dev checkout) there is no
+add-on user directory, so a temporary directory stands in for it.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _addon import import_addon, script_args  # noqa: E402
+
+
+def _run(NodeLib):
+    NodeLib.invalidate()
+    start = time.perf_counter()
+    classes = NodeLib.get_node_classes()
+    elapsed = time.perf_counter() - start
+    cache = NodeLib._session()["code"]
+    return {
+        "classes": len(classes),
+        "ms": round(elapsed * 1000, 2),
+        "cache_hits": cache.hits,
+        "compiled": cache.misses,
+    }
+
+
+def main():
+    addon = import_addon()
+    node_impl = sys.modules[addon.__name__ + ".nodes.node_impl"]
+    NodeLib = node_impl.NodeLib
+
+    tmp = None
+    if NodeLib._open_code_cache() is None:
+        tmp = tempfile.TemporaryDirectory()
+        NodeLib._open_code_cache = staticmethod(lambda: node_impl.CodeCache(tmp.name))
+
+    NodeLib._open_code_cache().prune(set())
+    rows = {"cold": _run(NodeLib), "warm": _run(NodeLib)}
+
+    for label, r in rows.items():
+        print(f"{label:5} {r['classes']:>4} classes  {r['ms']:>9} ms  "
+              f"{r['cache_hits']:>4} cache hit(s)  {r['compiled']:>4} compiled")
+
+    args = script_args()
+    if args:
+        with open(args[0], "w", encoding="utf-8") as fh:
+            json.dump(rows, fh, indent=2)
+        print(f"Wrote {args[0]}")
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Dev tool: compare the NodeCompiler's Python and JSON tree formats.
+
+Run headless from the repo root:
+
+    blender --background --factory-startup --python tools/benchmarks/tree_format_report.py -- tree_format.json [filter]
+
+The filter keeps stable keys containing that substring (default
+"starters.strinova"). For every matching class:
+
+  python  the shipped module: file size (raw and deflated, as in the add-on
+          zip), time to compile + execute it from source, and
+          create_node_group() time from an empty file.
+  json    the same class re-emitted in the JSON tree format: the tree it just
+          built — and every compiled child it pulled in — is analyzed back with
+          the compiler's analyzer and written as stub + .tree.json into a temp
+          folder mirroring shader/. Same three measurements, with the stub
+          execution and the description parse reported separately.
+
+Both builds are hashed with hash_node_tree(); "same" must be True for every row,
+otherwise the JSON builder does not reproduce the tree the module builds.
+"""
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+import zlib
+
+import bpy  # type: ignore
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _addon import import_addon, script_args  # noqa: E402
+
+
+def _exec_module(path, module_name, package):
+    """Compile + execute *path* as *module_name* (no code cache); returns the module."""
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    mod = importlib.util.module_from_spec(spec)
+    mod.__package__ = package
+    sys.modules[module_name] = mod
+    try:
+        spec.loader.exec_module(mod)
+    finally:
+        sys.modules.pop(module_name, None)
+    return mod
+
+
+def _sizes(paths):
+    raw = packed = 0
+    for path in paths:
+        with open(path, "rb") as fh:
+            data = fh.read()
+        raw += len(data)
+        packed += len(zlib.compress(data, 6))
+    return raw, packed
+
+
+def _build(cls, hash_node_tree):
+    """create_node_group() from an empty file: (ms, hash of the built tree)."""
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    start = time.perf_counter()
+    tree = cls.create_node_group()
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000, hash_node_tree(tree, {}) if tree is not None else None
+
+
+def main():
+    addon = import_addon()
+    pkg = addon.__name__
+    node_impl = sys.modules[pkg + ".nodes.node_impl"]
+    node = sys.modules[pkg + ".nodes.node"]
+    compiler = pkg + ".features.node_compiler.compiler"
+    analyzer = importlib.import_module(compiler + ".analyzer")
+    code_gen = importlib.import_module(compiler + ".code_gen")
+    router = importlib.import_module(compiler + ".router")
+    hash_node_tree = importlib.import_module(pkg + ".nodes.geometry.hashing").hash_node_tree
+    NodeLib = node_impl.NodeLib
+    shader_dir = str(node_impl._shader_DIR)
+
+    args = script_args()
+    out_path = args[0] if args else None
+    needle = args[1] if len(args) > 1 else "starters.strinova"
+
+    entries = {}
+    for entry in NodeLib.get_node_entries():
+        cls = NodeLib.load_class(entry)
+        if cls is not None:
+            node.register_node_class(cls)
+            entries[cls._PREFIX + cls.bl_label] = (entry, cls)
+    selected = sorted(key for key in entries if needle in key)
+    if not selected:
+        print(f"No compiled class matches '{needle}'.")
+        return
+
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # ── Python format, converting every tree the builds produce ─────────
+        converted = {}     # stable key → (stub path, tree path, subpath, class name)
+        for key in selected:
+            entry, cls = entries[key]
+            path = os.path.join(shader_dir, *entry.module.split("/"))
+            subpath = os.path.dirname(entry.module)
+            package = node.__package__ + ".shader." + subpath.replace("/", ".")
+            start = time.perf_counter()
+            _exec_module(path, package + "._bench", package)
+            import_ms = (time.perf_counter() - start) * 1000
+            build_ms, tree_hash = _build(cls, hash_node_tree)
+            raw, packed = _sizes([path])
+            report[key] = {"python": {
+                "bytes": raw, "deflated": packed,
+                "import_ms": round(import_ms, 2), "build_ms": round(build_ms, 2),
+            }, "_hash": tree_hash}
+
+            for ng in bpy.data.node_groups:
+                if ng.name in converted or ng.name not in entries:
+                    continue
+                c_entry, c_cls = entries[ng.name]
+                info = analyzer.analyze_node_group(ng)
+                info["bl_label"] = c_cls.bl_label
+                compiled_nodes = {
+                    n.node_tree.name: (entries[n.node_tree.name][1].__name__, n.node_tree.name)
+                    for n in ng.nodes
+                    if n.type == "GROUP" and n.node_tree and n.node_tree.name in entries
+                }
+                c_subpath = os.path.dirname(c_entry.module)
+                stem = os.path.splitext(os.path.basename(c_entry.module))[0]
+                folder = os.path.join(tmp, *c_subpath.split("/"))
+                os.makedirs(folder, exist_ok=True)
+                stub_path = os.path.join(folder, stem + ".py")
+                tree_path = os.path.join(folder, stem + ".tree.json")
+                with open(tree_path, "w", encoding="utf-8") as fh:
+                    json.dump(code_gen.generate_tree_data(info, compiled_nodes), fh,
+                              separators=(",", ":"))
+                with open(stub_path, "w", encoding="utf-8") as fh:
+                    fh.write(code_gen.generate_class(
+                        info, c_cls.__name__, router.make_import_prefix(c_subpath),
+                        compiled_nodes, tree_file=stem + ".tree.json"))
+                converted[ng.name] = (stub_path, tree_path, c_subpath, c_cls.__name__)
+
+        # ── JSON format ──────────────────────────────────────────────────────
+        json_classes = {}
+        import_ms = {}
+        for key, (stub_path, _tree, subpath, class_name) in converted.items():
+            package = node.__package__ + ".shader." + subpath.replace("/", ".")
+            start = time.perf_counter()
+            mod = _exec_module(stub_path, package + "._bench", package)
+            import_ms[key] = (time.perf_counter() - start) * 1000
+            json_classes[key] = getattr(mod, class_name)
+
+        classes = [json_classes.get(key, cls) for key, (_e, cls) in entries.items()]
+        with node.node_registry_override(classes):
+            for key in selected:
+                if key not in json_classes:
+                    report[key]["json"] = {"error": "tree was not built"}
+                    continue
+                stub_path, tree_path = converted[key][:2]
+                start = time.perf_counter()
+                with open(tree_path, "r", encoding="utf-8") as fh:
+                    json.load(fh)
+                parse_ms = (time.perf_counter() - start) * 1000
+                build_ms, tree_hash = _build(json_classes[key], hash_node_tree)
+                raw, packed = _sizes([stub_path, tree_path])
+                report[key]["json"] = {
+                    "bytes": raw, "deflated": packed,
+                    "import_ms": round(import_ms[key], 2), "parse_ms": round(parse_ms, 2),
+                    "build_ms": round(build_ms, 2),
+                }
+                report[key]["same"] = tree_hash is not None and tree_hash == report[key]["_hash"]
+
+    for r in report.values():
+        r.pop("_hash", None)
+
+    rows = [(k, r) for k, r in report.items() if "bytes" in r.get("json", {})]
+    print(f"{'key':48} {'py KB':>7} {'js KB':>7} {'py zKB':>7} {'js zKB':>7} "
+          f"{'py imp':>7} {'js imp':>7} {'py bld':>7} {'js bld':>7} same")
+    for key, r in rows:
+        p, j = r["python"], r["json"]
+        print(f"{key[-48:]:48} {p['bytes'] / 1024:>7.1f} {j['bytes'] / 1024:>7.1f} "
+              f"{p['deflated'] / 1024:>7.1f} {j['deflated'] / 1024:>7.1f} "
+              f"{p['import_ms']:>7.1f} {j['import_ms'] + j['parse_ms']:>7.1f} "
+              f"{p['build_ms']:>7.1f} {j['build_ms']:>7.1f} {r['same']}")
+    totals = {
+        fmt: {field: round(sum(r[fmt][field] for _k, r in rows), 2)
+              for field in ("bytes", "deflated", "import_ms", "build_ms")}
+        for fmt in ("python", "json")
+    }
+    totals["json"]["parse_ms"] = round(sum(r["json"]["parse_ms"] for _k, r in rows), 2)
+    print(f"{len(rows)} classes; python {totals['python']}; json {totals['json']}; "
+          f"{sum(1 for _k, r in rows if not r['same'])} tree mismatch(es)")
+
+    if out_path:
+        payload = {
+            "blender": bpy.app.version_string,
+            "filter": needle,
+            "totals": totals,
+            "classes": report,
+        }
+        with open(out_path, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=2, sort_keys=True)
+        print(f"Wrote {out_path}")
+
+
+if __name__ == "__main__":
+    main()